@@ -1,22 +1,44 @@
+import hashlib
+import io
+from datetime import timedelta
 import pandas as pd
 import streamlit as st
+import matplotlib
 import matplotlib.pyplot as plt
 import seaborn as sns
 import altair as alt
+from src import binning, correlation, eda_utils, stats, time_index
+from src.downsample import plot_series
+
+matplotlib.use('Agg')
+
+# Upper bound on cached tables and figures; least recently used entries are evicted
+TABLE_CACHE_ENTRIES = 128
+FIGURE_CACHE_ENTRIES = 64
+# Datasets larger than this are previewed from a sample or hourly means
+PREVIEW_ROWS = 20_000
+
+
+# Function to identify an uploaded dataset by its content
+def dataset_key(upload_file):
+    """Hash of the uploaded file's bytes, used to key every cached result."""
+    return hashlib.sha1(upload_file.getvalue()).hexdigest()
+
+
 # Function to load data
-@st.cache_data
-def load_data(path: str):
+@st.cache_data(max_entries=8)
+def load_data(key, _path):
     try:
         # Determine file type
-        file_type = path.name.split('.')[-1]
+        file_type = _path.name.split('.')[-1]
 
         # Read the contents of the uploaded file
         if file_type == 'csv':
-            # For CSV files
-            return pd.read_csv(path)
+            # For CSV files, parsed with the station schema
+            return eda_utils.load_data(_path)
         elif file_type == 'xlsx':
             # For XLSX files
-            return pd.read_excel(path, engine='openpyxl')
+            return pd.read_excel(_path, engine='openpyxl')
         elif file_type == 'pdf':
             # For PDF files (if supported)
             st.error("PDF file format is not supported for direct loading.")
@@ -27,70 +49,71 @@ def load_data(path: str):
     except Exception as e:
         st.error(f"An error occurred while loading the data: {str(e)}")
         return None
+# Function to index the dataset by time once, so moving the date range does not rescan it
+@st.cache_resource(max_entries=8)
+def dataset_index(key, _data):
+    """Cached time_index.TimeIndex of the dataset."""
+    return time_index.build_index(_data)
+# Function to profile the data once for the description, negative and missing tables
+@st.cache_data(max_entries=TABLE_CACHE_ENTRIES)
+def data_profile(key, _data):
+    """Cached eda_utils.profile_data of the dataset."""
+    return eda_utils.profile_data(_data)
 # Function to calculate summary statistics
-def calculate_summary_stats(data, selected_column):
+@st.cache_data(max_entries=TABLE_CACHE_ENTRIES)
+def summary_stats_table(key, _data, selected_column):
+    """Summary statistics table for one numeric column, cached per dataset and column."""
+    column_data = _data[selected_column]
+    summary_stats = column_data.describe()
+    # Calculate median, standard deviation, skewness, and kurtosis
+    median = column_data.median()
+    std = column_data.std()
+    skew = column_data.skew()
+    kurtosis = column_data.kurt()
+    stats_data = {
+        "Statistic": ["Count", "Mean", "Median", "Standard Deviation", "Skewness", "Kurtosis"],
+        "Value": [summary_stats['count'], summary_stats['mean'], median, std, skew, kurtosis]
+    }
+    return pd.DataFrame(stats_data)
+def calculate_summary_stats(key, data, selected_column):
     """Calculate summary statistics for the selected column."""
     if selected_column == "Select a column":
         return
     if selected_column in data.columns:
-        column_data = data[selected_column]
-        if pd.api.types.is_numeric_dtype(column_data):
+        if pd.api.types.is_numeric_dtype(data[selected_column]):
             # For numeric columns
-            summary_stats = column_data.describe()
-            # Calculate median, standard deviation, skewness, and kurtosis
-            median = column_data.median()
-            std = column_data.std()
-            skew = column_data.skew()
-            kurtosis = column_data.kurt()
-            stats_data = {
-                "Statistic": ["Count", "Mean", "Median", "Standard Deviation", "Skewness", "Kurtosis"],
-                "Value": [summary_stats['count'], summary_stats['mean'], median, std, skew, kurtosis]
-            }
-            stats_df = pd.DataFrame(stats_data)
-            st.write(stats_df)
+            st.write(summary_stats_table(key, data, selected_column))
         else:
             st.error("Unsupported column type. Please select a numerical column.")
     else:
         st.error(f"Column '{selected_column}' not found in the data.")
-# Function to count negative values
-def count_negative_values(data):
-    """Count negative values for each column."""
-    # Convert non-numeric values to NaN
-    data_numeric = data.apply(pd.to_numeric, errors='coerce')
-    # Count negative values for each column
-    negative_counts = (data_numeric < 0).sum()
-    return negative_counts
-# Function to count missing values
-def missing_values(data):
-    """Count missing values for each column."""
-    missing_values = data.isnull().sum()
-    missing_percentage = (missing_values / len(data)) * 100
-    missing_data = pd.DataFrame({'Missing Count': missing_values, 'Missing Percentage': missing_percentage})
-    return missing_data
+# Function to compute boxplot statistics without plotting
+@st.cache_data(max_entries=TABLE_CACHE_ENTRIES)
+def outlier_stats(key, _data):
+    """Quartiles, whiskers and outlier counts of the irradiance and temperature columns."""
+    columns = [col for col in ['GHI', 'DNI', 'DHI', 'Tamb', 'TModA', 'TModB'] if col in _data.columns]
+    return stats.boxplot_stats(_data, columns)
 # Function to plot time series
 def plot_time_series(cleaned_df):
     """Plot time series for specified columns."""
     # Check if 'Timestamp' column is present in the DataFrame
     if 'Timestamp' not in cleaned_df.columns:
-        st.error("Error: 'Timestamp' column not found in the DataFrame.")
-        return
+        raise ValueError("Error: 'Timestamp' column not found in the DataFrame.")
     # Define columns to plot
     columns_to_plot = ['GHI', 'DNI', 'DHI']
     # Check if the columns exist in the DataFrame
     for col in columns_to_plot:
         if col not in cleaned_df.columns:
-            st.error(f"Error: Column '{col}' not found in the DataFrame.")
-            return
-    # Convert 'Timestamp' column to datetime format
-    cleaned_df['Timestamp'] = pd.to_datetime(cleaned_df['Timestamp'])
-    # Set 'Timestamp' column as index
-    cleaned_df.set_index('Timestamp', inplace=True)
+            raise ValueError(f"Error: Column '{col}' not found in the DataFrame.")
+    # Timestamps parsed at load are used as they are; the input is not modified
+    timestamps = eda_utils.row_timestamps(cleaned_df)
     # Define colors
     colors = sns.color_palette("husl", len(columns_to_plot))
     # Plot time series
     fig, ax = plt.subplots(figsize=(12, 6))
     for i, col in enumerate(columns_to_plot):  # Specify columns to plot
-        sns.lineplot(data=cleaned_df, x=cleaned_df.index, y=col, label=col, color=colors[i], linewidth=2, alpha=0.8, ax=ax)
+        # Min/max downsampling keeps every peak, so full resolution stays fast on every row
+        plot_series(ax, timestamps, cleaned_df[col], label=col, color=colors[i], linewidth=2, alpha=0.8)
     ax.set_xlabel('Time', fontsize=12)
     ax.set_ylabel('Value', fontsize=12)
     ax.set_title('Time Series Analysis for GHI, DNI, DHI', fontsize=16)
@@ -98,47 +121,41 @@ def plot_time_series(cleaned_df):
     ax.grid(True, linestyle='--', alpha=0.5)
     ax.tick_params(axis='both', labelsize=10)
     plt.tight_layout()
-    # Display the plot
-    st.pyplot(fig)
+    return fig
 # Function to plot time series for 'Tamb' column
 def plot_time_series_tamb(cleaned_df):
     """Plot time series for 'Tamb' column."""
     # Check if 'Tamb' column is present in the DataFrame
     if 'Tamb' not in cleaned_df.columns:
-        st.error("Error: 'Tamb' column not found in the DataFrame.")
-        return
+        raise ValueError("Error: 'Tamb' column not found in the DataFrame.")
     if 'Timestamp' not in cleaned_df.columns:
         # If 'Timestamp' column is not present, use index as x-axis
         x_axis = cleaned_df.index
     else:
-        # Convert 'Timestamp' column to datetime format
-        cleaned_df['Timestamp'] = pd.to_datetime(cleaned_df['Timestamp'])
-        x_axis = 'Timestamp'
+        # Timestamps parsed at load are used as they are
+        x_axis = eda_utils.row_timestamps(cleaned_df)
     # Plot time series
     fig, ax = plt.subplots(figsize=(12, 6))
-    sns.lineplot(data=cleaned_df, x=x_axis, y='Tamb', ax=ax)
+    plot_series(ax, x_axis, cleaned_df['Tamb'])
     ax.set_xlabel('Time', fontsize=12)
     ax.set_ylabel('Tamb', fontsize=12)
     ax.set_title('Time Series Analysis for Tamb', fontsize=16)
     ax.grid(True, linestyle='--', alpha=0.5)
     ax.tick_params(axis='both', labelsize=10)
     plt.tight_layout()
-    # Display the plot
-    st.pyplot(fig)
+    return fig
 # Function for correlation analysis
 def correlation_analysis(data):
     # Select relevant columns for correlation analysis
     relevant_columns = ['GHI', 'DNI', 'DHI', 'TModA', 'TModB']
-    relevant_data = data[relevant_columns]
-    # Calculate correlation matrix
-    correlation_matrix = relevant_data.corr()
+    # Calculate correlation matrix from streamed co-moments
+    correlation_matrix = correlation.correlation_matrix(data, relevant_columns)
     # Plot heatmap
     fig, ax = plt.subplots(figsize=(10, 6))
-    sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', fmt=".2f", linewidths=0.5, ax=ax)
-    ax.set_title('Correlation Heatmap')
+    correlation.plot_correlation_heatmap(correlation_matrix, 'Correlation Heatmap', ax=ax)
     ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
     ax.set_yticklabels(ax.get_yticklabels(), rotation=0)
-    st.pyplot(fig)
+    return fig
 # Function to plot boxplot with outliers for solar radiation and temperature data
 def plot_boxplot_outliers(data):
     # Select relevant columns
@@ -147,69 +164,154 @@ def plot_boxplot_outliers(data):
     # Create subplots for solar radiation and temperature
     fig, axes = plt.subplots(nrows=2, ncols=1, figsize=(10, 8))
     # Plot box plots for solar radiation
-    sns.boxplot(data=data[solar_columns], ax=axes[0])
+    eda_utils.draw_boxplots(axes[0], stats.boxplot_summaries(data, solar_columns))
     axes[0].set_title('Solar Radiation (W/m²)')
     axes[0].set_ylabel('Radiation (W/m²)')
     # Plot box plots for temperature
-    sns.boxplot(data=data[temp_columns], ax=axes[1])
+    eda_utils.draw_boxplots(axes[1], stats.boxplot_summaries(data, temp_columns))
     axes[1].set_title('Temperature (°C)')
     axes[1].set_ylabel('Temperature (°C)')
     # Adjust layout
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 # Function for scatter plots
 def plot_scatter_plots(data):
     # Define pairs of variables for scatter plots
     variable_pairs = [('GHI', 'Tamb'), ('WS', 'WSgust')]
-    module_pairs = [('TModA', 'Tamb'), ('TModB', 'Tamb')]
     # Plot scatter plots for GHI vs Tamb and WS vs WSgust
     fig, axes = plt.subplots(nrows=1, ncols=len(variable_pairs), figsize=(15, 5))
     for i, pair in enumerate(variable_pairs):
-        sns.scatterplot(data=data, x=pair[0], y=pair[1], ax=axes[i])
+        # Binned density with a stratified sample on top, bounded whatever the row count
+        sample = binning.stratified_sample(data, pair[0], pair[1])
+        binning.plot_density(binning.density(data, pair[0], pair[1]), ax=axes[i], sample=sample)
         axes[i].set_title(f'{pair[0]} vs {pair[1]}')
         axes[i].set_xlabel(pair[0])
         axes[i].set_ylabel(pair[1])
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
+# Function for the module temperature scatter plot
+def plot_module_scatter(data):
     # Plot scatter plot for (TModA, TModB) with ambient temperature (Tamb)
     fig, ax = plt.subplots(figsize=(8, 6))
-    sns.scatterplot(data=data, x='TModA', y='TModB', hue='Tamb', palette='coolwarm', ax=ax)
+    # Colour each cell by its mean Tamb instead of a legend entry per value
+    binning.plot_density(binning.density(data, 'TModA', 'TModB', value='Tamb'), ax=ax, cmap='coolwarm')
     ax.set_title('(TModA, TModB) with Ambient Temperature (Tamb)')
     ax.set_xlabel('TModA')
     ax.set_ylabel('TModB')
-    ax.legend(title='Tamb')
-    st.pyplot(fig)
-# Function to plot histograms
-# Function to plot histograms
-# Function to plot histograms
+    return fig
 # Function to plot histograms
 def plot_histograms(data):
-    print("Plotting histograms...")
     # Select variables for histograms
     variables = ['GHI', 'DNI', 'DHI', 'WS', 'Tamb']
-    
+
     num_variables = len(variables)
     num_rows = (num_variables - 1) // 3 + 1  # Calculate the number of rows needed
-    
+
+    # Precompute the counts and KDE curves of every variable
+    histograms = binning.histograms(data, variables, bins=30)
+
     # Create a figure
     fig, axes = plt.subplots(nrows=num_rows, ncols=3, figsize=(14, num_rows * 4))
-    
+
     for i, var in enumerate(variables, 1):
         row = (i - 1) // 3
         col = (i - 1) % 3
-        sns.histplot(data[var], kde=True, color='skyblue', bins=30, ax=axes[row, col])
+        binning.plot_histogram(histograms, var, ax=axes[row, col], color='skyblue')
         axes[row, col].set_title(f'{var} Histogram')
         axes[row, col].set_xlabel(var)
         axes[row, col].set_ylabel('Frequency')
-    
+
     # Hide any unused subplots
     for j in range(num_variables, num_rows * 3):
         fig.delaxes(axes.flatten()[j])
 
     plt.tight_layout()
-    
-    # Display the plot
-    st.pyplot(fig)
+    return fig
+
+
+# Figures the dashboard can render, by name
+PLOTS = {
+    'time_series': plot_time_series,
+    'time_series_tamb': plot_time_series_tamb,
+    'correlation': correlation_analysis,
+    'boxplot': plot_boxplot_outliers,
+    'scatter': plot_scatter_plots,
+    'module_scatter': plot_module_scatter,
+    'histograms': plot_histograms,
+}
+# Dashboard sections and the figures they show
+SECTIONS = {
+    "Time Series Plot": ['time_series'],
+    "Time Series Plot for Tamb": ['time_series_tamb'],
+    "Correlation": ['correlation'],
+    "Outliers": ['boxplot'],
+    "Scatter": ['scatter', 'module_scatter'],
+    "Histograms": ['histograms'],
+}
+# Plots whose preview uses hourly means instead of a row sample
+TIME_SERIES_PLOTS = {'time_series', 'time_series_tamb'}
+
+
+# Function to build the reduced data behind a preview
+@st.cache_data(max_entries=TABLE_CACHE_ENTRIES)
+def preview_data(key, kind, _data):
+    """Hourly means ('hourly') or an ordered sample of PREVIEW_ROWS rows ('sample')."""
+    if kind == 'hourly':
+        hourly = eda_utils.resample_data(_data, 'hourly', columns=list(_data.select_dtypes(include='number').columns))
+        return eda_utils.aggregate_values(hourly, 'mean').reset_index()
+    return _data.sample(PREVIEW_ROWS, random_state=0).sort_index()
+# Function to render a figure once per dataset
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES)
+def render_figure(key, name, full, _data):
+    """Render one of PLOTS to PNG bytes, cached per dataset hash, figure name and resolution.
+
+    Unless `full` is set, large datasets are drawn from preview_data. Plots
+    do not modify their input, so they share the cached frame; the figure is
+    closed as soon as it is saved.
+    """
+    if not full and len(_data) > PREVIEW_ROWS:
+        kind = 'hourly' if name in TIME_SERIES_PLOTS and 'Timestamp' in _data.columns else 'sample'
+        _data = preview_data(key, kind, _data)
+    fig = PLOTS[name](_data)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight')
+    plt.close(fig)
+    return buffer.getvalue()
+# Function to display a cached figure
+def show_figure(key, name, data, full=True):
+    try:
+        st.image(render_figure(key, name, full, data), width='stretch')
+    except (KeyError, ValueError) as e:
+        st.error(str(e))
+# Function to display a section only once it is opened
+def show_section(key, title, data):
+    st.subheader(title)
+    if not st.toggle(f"Show {title}", key=f"show {title}"):
+        return
+    full = True
+    if len(data) > PREVIEW_ROWS:
+        full = st.checkbox("Full resolution", key=f"full {title}")
+        if not full:
+            st.caption(f"Preview of {len(data):,} rows (hourly means or a {PREVIEW_ROWS:,}-row sample).")
+    for name in SECTIONS[title]:
+        show_figure(key, name, data, full)
+
+
+# Function to restrict the plots to a date range
+def select_window(key, data):
+    """Rows inside the sidebar's date range, with the cache key of that window."""
+    if 'Timestamp' not in data.columns:
+        return key, data
+    index = dataset_index(key, data)
+    if pd.isna(index.start) or index.start == index.end:
+        return key, data
+    start, end = index.start.to_pydatetime(), index.end.to_pydatetime()
+    with st.sidebar:
+        window = st.slider("Date range", min_value=start, max_value=end, value=(start, end),
+                           step=timedelta(hours=1), format="YYYY-MM-DD HH:mm")
+    if tuple(window) == (start, end):
+        return key, data
+    return f"{key}|{window[0]}|{window[1]}", time_index.query(data, window[0], window[1], index=index)
 
 
 # Main function
@@ -222,46 +324,53 @@ def main():
             st.info("Upload a file through the sidebar", icon="ℹ️")
             st.stop()
 
-    Weather_Data = load_data(upload_file)
+    key = dataset_key(upload_file)
+    Weather_Data = load_data(key, upload_file)
+
+    if Weather_Data is None:
+        st.stop()
+
+    # Remove Timestamp column from the list of columns
+    columns_without_timestamp = [col for col in Weather_Data.columns if col != 'Timestamp']
 
-    if Weather_Data is not None:
-        # Remove Timestamp column from the list of columns
-        columns_without_timestamp = [col for col in Weather_Data.columns if col != 'Timestamp']
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1.expander("Weather Data"):
+        # Sending the whole frame to the browser is slow, so show the first rows
+        st.write(Weather_Data.head(PREVIEW_ROWS))
+        if len(Weather_Data) > PREVIEW_ROWS:
+            st.caption(f"First {PREVIEW_ROWS:,} of {len(Weather_Data):,} rows.")
 
-        col1, col2, col3 = st.columns([1, 1, 1])
-        with col1.expander("Weather Data"):
-            st.write(Weather_Data)
+    # Basic Information
+    with col2.expander("Description"):
+        st.write(eda_utils.basic_desc(Weather_Data, verbose=False, profile=data_profile(key, Weather_Data)))
 
-        # Basic Information
-        with col2.expander("Description"):
-            st.write(Weather_Data.describe())
+    # Summary Statistics
+    with col3.expander("Summary Statistics"):
+        selected_column = st.selectbox("Select a column for statistical analysis", columns_without_timestamp, index=0)
+        calculate_summary_stats(key, Weather_Data, selected_column)
 
-        # Summary Statistics
-        with col3.expander("Summary Statistics"):
-            selected_column = st.selectbox("Select a column for statistical analysis", columns_without_timestamp, index=0)
-            calculate_summary_stats(Weather_Data, selected_column)
+    # Display the count of negative values
+    with col1.expander("Negative Value Counts:"):
+        st.write(eda_utils.count_negative_values(Weather_Data, verbose=False, profile=data_profile(key, Weather_Data)))
+    with col2.expander("Missing Values count"):
+        missing = data_profile(key, Weather_Data).columns[['missing', 'missing_pct']]
+        st.write(missing.set_axis(['Missing Count', 'Missing Percentage'], axis=1))
+    with col3.expander("Outlier Statistics"):
+        st.write(outlier_stats(key, Weather_Data))
 
-        # Display the count of negative values
-        with col1.expander("Negative Value Counts:"):
-            st.write(count_negative_values(Weather_Data))
-        with col2.expander("Missing Values count"):
-            st.write(missing_values(Weather_Data))
-            
-        st.write("---")
-        st.subheader("Time Series Plot")
-        plot_time_series(Weather_Data)
-        st.subheader("Time Series Plot for Tamb")
-        plot_time_series_tamb(Weather_Data)
+    # Heavy sections are only computed once opened, for the selected date range
+    st.write("---")
+    window_key, window = select_window(key, Weather_Data)
+    if window is not Weather_Data:
+        st.caption(f"Plots show {len(window):,} of {len(Weather_Data):,} rows in the selected date range.")
+    show_section(window_key, "Time Series Plot", window)
+    show_section(window_key, "Time Series Plot for Tamb", window)
     col6,col7 = st.columns(2)
     with col6:
-        st.subheader("Correlation:")
-        correlation_analysis(Weather_Data)
+        show_section(window_key, "Correlation", window)
     with col7:
-        st.subheader("outlier")
-        plot_boxplot_outliers(Weather_Data)
-    st.subheader("Scatter")
-    plot_scatter_plots(Weather_Data)
-    st.subheader("Histograms")
-    plot_histograms(Weather_Data)
+        show_section(window_key, "Outliers", window)
+    show_section(window_key, "Scatter", window)
+    show_section(window_key, "Histograms", window)
 if __name__ == "__main__":
     main()
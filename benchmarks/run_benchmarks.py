@@ -0,0 +1,184 @@
+"""Benchmark the EDA pipeline on synthetic station data.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks --rows 10000 100000 1000000
+    python -m benchmarks.run_benchmarks --compare
+
+Each run writes benchmarks/results/<commit>.json with the best wall time and
+the tracemalloc peak of every benchmark at every size; --compare lines the
+stored runs up so regressions between commits stand out.
+"""
+import argparse
+import contextlib
+import datetime
+import glob
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import matplotlib
+import matplotlib.pyplot as plt
+import pandas as pd
+from src import column_store, eda_utils, export, synthetic, visualization
+
+# Synthetic station files, generated on first use
+DATA_DIR = os.path.join('benchmarks', 'data')
+# One JSON file of results per commit
+RESULTS_DIR = os.path.join('benchmarks', 'results')
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+# Slowdown against the previous run that --compare flags
+REGRESSION_RATIO = 1.2
+
+
+def _plot(function):
+    """Benchmark of a plot function: render its figures on the Agg canvas, then close them."""
+    def run(path, data):
+        _, figures = export.new_figures(function, data)
+        for fig in figures:
+            fig.canvas.draw()
+            plt.close(fig)
+    run.__name__ = function.__name__
+    return run
+
+
+# Benchmarks as name -> function(path, data); none of them modifies the data
+BENCHMARKS = {
+    'load_data': lambda path, data: eda_utils.load_data(path, cache=False),
+    'load_data_cached': lambda path, data: eda_utils.load_data(path),
+    'column_store': lambda path, data: column_store.open_store(path).to_frame(eda_utils.SOLAR_COLUMNS),
+    'calculate_summary_stats': lambda path, data: eda_utils.calculate_summary_stats(data),
+    'remove_negative_rows': lambda path, data: eda_utils.remove_negative_rows(data, eda_utils.SOLAR_COLUMNS),
+    'count_negative_values': lambda path, data: eda_utils.count_negative_values(data),
+    'correlation_analysis': _plot(eda_utils.correlation_analysis),
+    'plot_time_series': _plot(eda_utils.plot_time_series),
+    'plot_resampled': _plot(eda_utils.plot_resampled),
+    'plot_boxplot_outliers': _plot(eda_utils.plot_boxplot_outliers),
+    'wind_analysis': _plot(visualization.wind_analysis),
+    'temperature_analysis': _plot(visualization.temperature_analysis),
+    'plot_histograms': _plot(visualization.plot_histograms),
+    'plot_scatter_plots': _plot(visualization.plot_scatter_plots),
+}
+
+
+def dataset(rows):
+    """Path of the synthetic station file with `rows` rows, written if missing."""
+    path = os.path.join(DATA_DIR, f'station-{rows}.csv')
+    if not os.path.exists(path):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        synthetic.write_station(f'{path}.tmp', rows)
+        os.replace(f'{path}.tmp', path)
+    return path
+
+
+def measure(function, path, data, repeat=3):
+    """Best wall time over `repeat` calls, and the tracemalloc peak of one more call."""
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function(path, data)
+            times.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            function(path, data)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {'seconds': min(times), 'peak_mb': peak / 2 ** 20}
+
+
+def git_commit():
+    """Short hash of HEAD, marked '-dirty' with uncommitted changes."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{commit}-dirty' if status else commit
+
+
+def run_benchmarks(sizes=DEFAULT_ROWS, names=None, repeat=3):
+    """Run the benchmarks on synthetic files of each size and return the results."""
+    matplotlib.use('Agg')
+    results = {}
+    for rows in sizes:
+        path = dataset(rows)
+        # Warm the Arrow cache and column store so their benchmarks measure cached loads
+        data = eda_utils.load_data(path)
+        column_store.open_store(path)
+        results[str(rows)] = {}
+        for name, function in BENCHMARKS.items():
+            if names and name not in names:
+                continue
+            results[str(rows)][name] = measure(function, path, data, repeat)
+            print(f"{rows:>10,} rows  {name:<25} {results[str(rows)][name]['seconds']:8.3f} s "
+                  f"{results[str(rows)][name]['peak_mb']:9.1f} MB")
+    return {
+        'commit': git_commit(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+
+
+def save_results(report, results_dir=RESULTS_DIR):
+    """Write a run to <results_dir>/<commit>.json and return the path."""
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f"{report['commit']}.json")
+    with open(path, 'w') as file:
+        json.dump(report, file, indent=2)
+    return path
+
+
+def compare(results_dir=RESULTS_DIR, metric='seconds'):
+    """Table of a metric per (rows, benchmark) with one column per stored run, oldest first."""
+    reports = []
+    for path in glob.glob(os.path.join(results_dir, '*.json')):
+        with open(path) as file:
+            reports.append(json.load(file))
+    reports.sort(key=lambda report: report['date'])
+    table = pd.DataFrame({
+        report['commit']: {(int(rows), name): values[metric]
+                           for rows, benchmarks in report['results'].items()
+                           for name, values in benchmarks.items()}
+        for report in reports
+    })
+    table.index.names = ['rows', 'benchmark']
+    return table.sort_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the EDA pipeline on synthetic station data.")
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS,
+                        help="dataset sizes, from 10000 up to 50000000 (default: %(default)s)")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument('--repeat', type=int, default=3, help="timed calls per benchmark (default: 3)")
+    parser.add_argument('--compare', action='store_true', help="compare the stored runs instead of running")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        for metric in ('seconds', 'peak_mb'):
+            table = compare(metric=metric)
+            print(f"\n{metric}:")
+            print(table.to_string(float_format='{:.3f}'.format))
+            if table.shape[1] > 1:
+                ratio = table.iloc[:, -1] / table.iloc[:, -2]
+                regressions = ratio[ratio > REGRESSION_RATIO]
+                if len(regressions):
+                    print(f"\nSlower than {table.columns[-2]} by more than {REGRESSION_RATIO}x:")
+                    print(regressions.to_string(float_format='{:.2f}x'.format))
+        return
+    print("Results written to", save_results(run_benchmarks(args.rows, args.only, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
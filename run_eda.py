@@ -0,0 +1,222 @@
+import argparse
+import contextlib
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from src import comparison
+from src import data_cache
+from src import eda_utils
+from src import export
+from src import profiling
+from src import qc
+from src import solar_geometry
+from src import stats
+from src import visualization
+
+# Columns averaged in the cross-station comparison table
+COMPARISON_COLUMNS = ['GHI', 'DNI', 'DHI', 'Tamb', 'RH', 'WS', 'BP']
+# Columns whose boxplot statistics are written for outlier screening
+BOXPLOT_COLUMNS = ['GHI', 'DNI', 'DHI', 'Tamb', 'TModA', 'TModB']
+# Plot functions run for each station, in order
+PLOTS = [
+    eda_utils.plot_time_series,
+    eda_utils.plot_resampled,
+    eda_utils.correlation_analysis,
+    eda_utils.plot_boxplot_outliers,
+    visualization.wind_analysis,
+    visualization.temperature_analysis,
+    visualization.plot_histograms,
+    visualization.plot_scatter_plots,
+]
+
+
+def station_name(file_path):
+    """Name a station after its file, e.g. 'dataset/benin-malanville.csv' -> 'benin-malanville'."""
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def write_tables(file_path, output_dir, profile, summary_stats, quality, cleaned_df):
+    """Write the column, summary, data-quality, boxplot and aggregate tables of a station as CSV files."""
+    profile.columns.to_csv(os.path.join(output_dir, 'columns.csv'))
+    summary_table = pd.DataFrame({stat: value for stat, _, value in summary_stats})
+    summary_table.to_csv(os.path.join(output_dir, 'summary_stats.csv'))
+    quality.to_csv(os.path.join(output_dir, 'data_quality.csv'))
+    stats.boxplot_stats(cleaned_df, BOXPLOT_COLUMNS).to_csv(os.path.join(output_dir, 'boxplot_stats.csv'))
+    for freq in ('daily', 'monthly'):
+        aggregates = eda_utils.station_aggregates(cleaned_df, station_name(file_path), freq)
+        aggregates.to_csv(os.path.join(output_dir, f'{freq}_aggregates.csv'))
+
+
+def run_eda(file_path, output_dir=None, formats=('png',), workers=1, daytime_only=False):
+    """Run the EDA pipeline for one station file.
+
+    Without `output_dir` the figures are left open for plt.show(). Otherwise
+    the tables and printed output are written to `output_dir`, and the figures
+    are rendered headless by `workers` processes (see src.export) and saved in
+    each of `formats`. For a known station (see src.solar_geometry) the QC
+    closure and night rules use the solar zenith, and `daytime_only` keeps
+    only the rows taken while the sun was up for the statistics and plots.
+    Returns the station's row of the comparison table.
+    """
+    # Load data
+    data = eda_utils.load_data(file_path)
+    station = solar_geometry.find_station(station_name(file_path))
+    zenith = None
+    if station is not None:
+        # The year grids are cached next to the data, like the Arrow cache
+        zenith, _ = solar_geometry.station_position(data[eda_utils.TIMESTAMP_COLUMN], station,
+                                                    data_cache.default_cache_dir(file_path))
+    # Flag sensor problems on the raw rows without copying them
+    flags, checks = qc.quality_flags(data, zenith)
+    print("Quality Control:")
+    print(checks.report())
+    if daytime_only:
+        if station is None:
+            print(f"Unknown station location for {file_path}; keeping night-time rows.")
+        else:
+            data = data[zenith < solar_geometry.NIGHT_ZENITH]
+            print("Daytime rows:", len(data))
+    # Column counts and description, computed once and printed by each report
+    profile = eda_utils.profile_data(data)
+    eda_utils.basic_info(data, profile=profile)
+    eda_utils.basic_desc(data, profile=profile)
+    # Calculate summary statistics
+    summary_stats = eda_utils.calculate_summary_stats(data)
+    # Remove rows with negative irradiance and count data issues in the same pass
+    cleaned_df, quality = eda_utils.clean_data(data, eda_utils.SOLAR_COLUMNS)
+    print("Data Quality:")
+    print(quality)
+    cleaned_df = cleaned_df.drop(columns=['Comments'], errors='ignore')
+    print("Cleaned data shape:", cleaned_df.shape)
+    cleaned_df.info()
+
+    if output_dir is not None:
+        with profiling.stage('write_tables', len(cleaned_df)):
+            write_tables(file_path, output_dir, profile, summary_stats, quality, cleaned_df)
+            checks.report().to_csv(os.path.join(output_dir, 'qc_report.csv'))
+
+    if output_dir is None:
+        for plot in PLOTS:
+            plot(cleaned_df)
+    else:
+        with profiling.stage('export_plots', len(cleaned_df)):
+            export.export_plots(cleaned_df, PLOTS, output_dir, formats, workers)
+
+    means = profile.description.reindex(columns=COMPARISON_COLUMNS).loc['mean']
+    return {
+        'station': station_name(file_path),
+        'rows': len(data),
+        'clean_rows': len(cleaned_df),
+        'missing_values': int(quality['missing'].sum()),
+        'negative_values': int(quality.loc[eda_utils.SOLAR_COLUMNS, 'negative'].sum()),
+        'out_of_range_values': int(quality['out_of_range'].sum()),
+        'qc_flagged_rows': int(np.count_nonzero(flags)),
+        **{f'{col}_mean': means[col] for col in COMPARISON_COLUMNS},
+    }
+
+
+def run_station(file_path, output_dir, formats=('png',), workers=1, profile=False, cprofile_stage=None,
+                daytime_only=False):
+    """Run one station headless, writing its artifacts to <output_dir>/<station>/.
+
+    With `profile`, the time, CPU time, peak memory and rows of every stage
+    are appended to the log and written to profile.json (see src.profiling);
+    `cprofile_stage` also writes a cProfile report of that stage to
+    cprofile.txt.
+    """
+    export.use_headless_backend()
+    station_dir = os.path.join(output_dir, station_name(file_path))
+    os.makedirs(station_dir, exist_ok=True)
+    # Keep the printed report of each station in its own log file
+    with open(os.path.join(station_dir, 'eda.log'), 'w') as log, contextlib.redirect_stdout(log):
+        if not profile:
+            return run_eda(file_path, station_dir, formats, workers, daytime_only)
+        with profiling.profile(cprofile_stage=cprofile_stage) as profiler:
+            with profiling.stage('run_eda'):
+                row = run_eda(file_path, station_dir, formats, workers, daytime_only)
+        print("Profile:")
+        profiler.print_report()
+        profiler.to_json(os.path.join(station_dir, 'profile.json'))
+        if profiler.cprofile_output is not None:
+            with open(os.path.join(station_dir, 'cprofile.txt'), 'w') as file:
+                file.write(profiler.cprofile_output)
+        return row
+
+
+def expand_paths(patterns):
+    """Expand glob patterns (e.g. 'dataset/*.csv') into a sorted list of files."""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        paths.extend(matches if matches else [pattern])
+    return list(dict.fromkeys(paths))
+
+
+def run_stations(paths, output_dir, workers=None, formats=('png',), profile=False, cprofile_stage=None,
+                 daytime_only=False):
+    """Run the EDA pipeline for several stations in a process pool.
+
+    The `workers` processes (default: one per CPU) are shared between the
+    stations, and each station renders its figures with the workers left over.
+    Writes the per-station artifacts and <output_dir>/comparison.csv and
+    returns the comparison table.
+    """
+    if not paths:
+        raise ValueError("No station files to run.")
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    station_workers = min(workers, len(paths))
+    plot_workers = max(workers // station_workers, 1)
+    if station_workers == 1:
+        rows = [run_station(path, output_dir, formats, plot_workers, profile, cprofile_stage, daytime_only)
+                for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=station_workers) as executor:
+            rows = list(executor.map(run_station, paths, [output_dir] * len(paths),
+                                     [formats] * len(paths), [plot_workers] * len(paths),
+                                     [profile] * len(paths), [cprofile_stage] * len(paths),
+                                     [daytime_only] * len(paths)))
+    table = pd.DataFrame(rows).set_index('station')
+    table.to_csv(os.path.join(output_dir, 'comparison.csv'))
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the solar station EDA for one or more station files.")
+    parser.add_argument('files', nargs='+', help="station CSV files or glob patterns, e.g. 'dataset/*.csv'")
+    parser.add_argument('-o', '--output', default='reports', help="output directory (default: reports)")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="number of worker processes (default: one per CPU)")
+    parser.add_argument('-f', '--format', dest='formats', nargs='+', choices=export.FORMATS, default=['png'],
+                        help="figure file formats (default: png)")
+    parser.add_argument('--profile', action='store_true',
+                        help="record time, CPU time, peak memory and rows per stage in <station>/profile.json")
+    parser.add_argument('--cprofile', metavar='STAGE',
+                        help="also write a cProfile report of one stage (e.g. plot_histograms) to <station>/cprofile.txt")
+    parser.add_argument('--daytime-only', action='store_true',
+                        help="drop rows taken while the sun was down before the statistics and plots")
+    parser.add_argument('--compare', action='store_true',
+                        help="also write grouped cross-station tables and side-by-side plots to <output>/comparison")
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.files)
+    # A pattern matching nothing is kept as is, so it shows up here as a missing file
+    missing = [path for path in paths if not os.path.isfile(path)]
+    if missing:
+        parser.error(f"no such station file: {', '.join(missing)}")
+    summary = run_stations(paths, args.output, args.workers, args.formats,
+                           args.profile or args.cprofile is not None, args.cprofile, args.daytime_only)
+    print(summary.to_string())
+    if args.compare:
+        comparison.write_comparison(paths, os.path.join(args.output, 'comparison'), args.formats)
+    if args.profile or args.cprofile is not None:
+        for path in paths:
+            print(f"\nProfile of {station_name(path)}:")
+            profiling.Profiler.from_json(os.path.join(args.output, station_name(path), 'profile.json')).print_report()
+
+
+if __name__ == "__main__":
+    main()
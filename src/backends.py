@@ -0,0 +1,176 @@
+import os
+import numpy as np
+import pandas as pd
+from src import eda_utils, stats
+
+try:
+    import polars as pl
+except ImportError:  # pragma: no cover - the polars backend is optional
+    pl = None
+
+# Backends load_data can return: pandas DataFrames, or lazy Polars query plans
+BACKENDS = ('pandas', 'polars')
+# Polars engine that runs the plans multithreaded and out-of-core
+POLARS_ENGINE = 'streaming'
+# Polars duration units of the pandas offset aliases resample_data accepts on the lazy path
+POLARS_UNITS = {'s': 's', 'min': 'm', 'h': 'h', 'D': 'd', 'MS': 'mo', 'QS-JAN': 'q', 'YS-JAN': 'y'}
+
+
+def is_available():
+    """Return True when polars is installed and the lazy backend can be used."""
+    return pl is not None
+
+
+def is_lazy(data):
+    """True for a Polars LazyFrame, which the eda_utils functions run as a query plan."""
+    return pl is not None and isinstance(data, pl.LazyFrame)
+
+
+def _require():
+    if pl is None:
+        raise ImportError("The 'polars' backend needs the polars package (pip install polars).")
+
+
+def scan(file_path, columns=None, comments='category'):
+    """Lazy Polars scan of a station CSV or Parquet file with the eda_utils schema.
+
+    Nothing is read until the plan is collected; the columns and filters of
+    the later operations are pushed down into the scan.
+    """
+    _require()
+    if os.fspath(file_path).endswith('.parquet'):
+        frame = pl.scan_parquet(file_path)
+    else:
+        frame = pl.scan_csv(file_path, schema_overrides={
+            **{col: pl.Float32 for col in eda_utils.SENSOR_COLUMNS},
+            eda_utils.COMMENTS_COLUMN: pl.String,
+        })
+    names = frame.collect_schema().names()
+    if eda_utils.TIMESTAMP_COLUMN in names and frame.collect_schema()[eda_utils.TIMESTAMP_COLUMN] == pl.String:
+        frame = frame.with_columns(pl.col(eda_utils.TIMESTAMP_COLUMN).str.strptime(
+            pl.Datetime, eda_utils.TIMESTAMP_FORMAT, strict=False))
+    if comments == 'category' and eda_utils.COMMENTS_COLUMN in names:
+        frame = frame.with_columns(pl.col(eda_utils.COMMENTS_COLUMN).cast(pl.Categorical))
+    if comments == 'drop':
+        names = [col for col in names if col != eda_utils.COMMENTS_COLUMN]
+    if columns is not None:
+        names = [col for col in names if col in columns]
+    return frame.select(names)
+
+
+def collect(frame):
+    """Run a lazy plan with the streaming engine and return a Polars DataFrame."""
+    return frame.collect(engine=POLARS_ENGINE)
+
+
+def _numeric_columns(frame):
+    return [name for name, dtype in frame.collect_schema().items() if dtype.is_numeric()]
+
+
+def _series(row, columns, dtype=np.float64):
+    """One-row Polars result as a pandas Series indexed by column."""
+    return pd.Series([row[col][0] for col in columns], index=columns, dtype=dtype)
+
+
+def remove_negative_rows(frame, columns):
+    """Plan that keeps the rows where all `columns` are non-negative (nulls count as invalid)."""
+    return frame.filter(pl.all_horizontal([pl.col(col) >= 0 for col in columns]).fill_null(False))
+
+
+def missing_values(frame):
+    """Missing values per column."""
+    row = collect(frame.select(pl.all().null_count()))
+    return _series(row, row.columns, 'int64')
+
+
+def count_negative_values(frame):
+    """Negative values per numeric column."""
+    columns = _numeric_columns(frame)
+    row = collect(frame.select([(pl.col(col) < 0).sum() for col in columns]))
+    return _series(row, columns, 'int64')
+
+
+def _constant_zero(col, expression):
+    """0 for a constant column, like pandas, instead of Polars' NaN."""
+    return pl.when(pl.col(col).std() == 0).then(0.0).otherwise(expression)
+
+
+def summary_stats(frame):
+    """Summary statistics as (stat, description, value) tuples, like eda_utils.calculate_summary_stats.
+
+    Every statistic of every numeric column comes from one query, so the
+    file is scanned once. The median is exact.
+    """
+    columns = _numeric_columns(frame)
+    expressions = {
+        'count': lambda col: pl.col(col).count().cast(pl.Float64),
+        'mean': lambda col: pl.col(col).mean(),
+        'median': lambda col: pl.col(col).median(),
+        'standard deviation': lambda col: pl.col(col).std(),
+        'skewness': lambda col: _constant_zero(col, pl.col(col).skew(bias=False)),
+        'kurtosis': lambda col: _constant_zero(col, pl.col(col).kurtosis(bias=False)),
+    }
+    row = collect(frame.select([expression(col).alias(f'{stat}|{col}')
+                                for stat, expression in expressions.items() for col in columns]))
+    return [(stat, description, pd.Series([row[f'{stat}|{col}'][0] for col in columns], index=columns,
+                                          dtype=np.float64))
+            for stat, description in stats.SUMMARY_DESCRIPTIONS.items()]
+
+
+def correlation_matrix(frame, columns=None):
+    """Pairwise correlation matrix of `columns` (default: all numeric) from one query."""
+    columns = list(columns) if columns is not None else _numeric_columns(frame)
+    pairs = [(a, b) for i, a in enumerate(columns) for b in columns[i + 1:]]
+    row = collect(frame.select([pl.corr(a, b).alias(f'{a}|{b}') for a, b in pairs] or [pl.len()]))
+    matrix = pd.DataFrame(np.eye(len(columns)), index=columns, columns=columns)
+    for a, b in pairs:
+        matrix.loc[a, b] = matrix.loc[b, a] = row[f'{a}|{b}'][0]
+    return matrix
+
+
+def polars_every(freq):
+    """(Polars duration, pandas alias) of a resample_data frequency, e.g. 'hourly' -> ('1h', 'h').
+
+    Raises ValueError for aliases without a Polars equivalent (such as
+    week- or month-end anchored offsets).
+    """
+    rule = eda_utils.FREQUENCIES.get(freq, freq)
+    try:
+        offset = pd.tseries.frequencies.to_offset(rule)
+    except ValueError:
+        raise ValueError(f"Unknown frequency {freq!r}.") from None
+    if offset.name not in POLARS_UNITS:
+        raise ValueError(f"Frequency {freq!r} is not supported by the polars backend. "
+                         f"Use {list(eda_utils.FREQUENCIES)} or a multiple of {list(POLARS_UNITS)}.")
+    return f"{offset.n}{POLARS_UNITS[offset.name]}", rule
+
+
+def resample_data(frame, freq='daily', columns=None):
+    """Aggregates at any polars_every frequency in the eda_utils.resample_data layout, from one grouped query."""
+    every, rule = polars_every(freq)
+    names = frame.collect_schema().names()
+    columns = [col for col in (columns or eda_utils.AGGREGATE_COLUMNS) if col in names]
+    timestamp = eda_utils.TIMESTAMP_COLUMN
+    step = collect(frame.select(pl.col(timestamp).diff().filter(pl.col(timestamp).diff() > pl.duration())
+                                .median()))[0, 0]
+    hours = step.total_seconds() / 3600 if step is not None else 1 / 60
+    aggregations = []
+    for col in columns:
+        aggregations += [pl.col(col).sum().alias(f'{col}|sum'), pl.col(col).count().alias(f'{col}|count'),
+                         pl.col(col).max().alias(f'{col}|max')]
+    grouped = collect(frame.select([timestamp] + columns).sort(timestamp)
+                      .group_by_dynamic(timestamp, every=every).agg(aggregations)).to_pandas()
+    index = pd.DatetimeIndex(grouped[timestamp], name=timestamp)
+    # Empty buckets appear in the pandas layout too, with zero counts
+    full = pd.date_range(index.min(), index.max(), freq=rule, name=timestamp) if len(index) else index
+    tables = {}
+    for col in columns:
+        sums = pd.Series(grouped[f'{col}|sum'].to_numpy(np.float64), index=index).reindex(full, fill_value=0.0)
+        counts = pd.Series(grouped[f'{col}|count'].to_numpy(np.int64), index=index).reindex(full, fill_value=0)
+        tables[(col, 'mean')] = sums / counts.where(counts > 0)
+        tables[(col, 'max')] = pd.Series(grouped[f'{col}|max'].to_numpy(np.float64), index=index).reindex(full)
+        tables[(col, 'sum')] = sums
+        tables[(col, 'count')] = counts
+        if col in eda_utils.SOLAR_COLUMNS:
+            tables[(col, 'energy')] = sums * hours
+    return pd.DataFrame(tables, index=full)
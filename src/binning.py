@@ -0,0 +1,295 @@
+import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
+import numpy as np
+import pandas as pd
+from src.eda_utils import SENSOR_LIMITS
+
+# Each displayed bin is split into this many fine bins, which the KDE is computed on
+FINE_BINS_PER_BIN = 16
+
+
+class HistogramAccumulator:
+    """Mergeable fixed-edge histograms, one per column.
+
+    Every column gets `bins * FINE_BINS_PER_BIN` equal-width bins over its
+    (low, high) range; values outside the range are counted separately.
+    Chunks are added with `update` and partial results combined with `merge`.
+    """
+
+    def __init__(self, ranges, bins=30):
+        self.bins = bins
+        self.ranges = {col: (float(low), float(high)) for col, (low, high) in ranges.items()}
+        self.counts = {col: np.zeros(bins * FINE_BINS_PER_BIN, dtype=np.int64) for col in self.ranges}
+        self.below = dict.fromkeys(self.ranges, 0)
+        self.above = dict.fromkeys(self.ranges, 0)
+
+    @property
+    def columns(self):
+        return list(self.ranges)
+
+    def edges(self, col, fine=False):
+        """Bin edges of a column, at display or fine resolution."""
+        low, high = self.ranges[col]
+        bins = len(self.counts[col]) if fine else self.bins
+        return np.linspace(low, high, bins + 1)
+
+    def update(self, data):
+        """Add the values of a DataFrame chunk, ignoring NaNs."""
+        for col, (low, high) in self.ranges.items():
+            values = data[col].to_numpy(dtype=np.float64)
+            values = values[~np.isnan(values)]
+            # The (bins, range) form of np.histogram takes the fast uniform path
+            counts, _ = np.histogram(values, bins=len(self.counts[col]), range=(low, high))
+            self.counts[col] += counts
+            self.below[col] += int(np.count_nonzero(values < low))
+            self.above[col] += int(np.count_nonzero(values > high))
+        return self
+
+    def merge(self, other):
+        """Combine another accumulator with the same ranges and bins."""
+        if other.ranges != self.ranges or other.bins != self.bins:
+            raise ValueError("Cannot merge histograms with different edges.")
+        for col in self.ranges:
+            self.counts[col] += other.counts[col]
+            self.below[col] += other.below[col]
+            self.above[col] += other.above[col]
+        return self
+
+    def histogram(self, col):
+        """Counts and edges of a column at display resolution."""
+        counts = self.counts[col].reshape(self.bins, -1).sum(axis=1)
+        return counts, self.edges(col)
+
+    def kde(self, col, bandwidth=None):
+        """Binned Gaussian KDE of a column on the fine grid, as (x, density)."""
+        edges = self.edges(col, fine=True)
+        return (edges[:-1] + edges[1:]) / 2, binned_kde(self.counts[col], edges, bandwidth)
+
+
+def binned_kde(counts, edges, bandwidth=None):
+    """Gaussian kernel density estimate from histogram counts, evaluated at the bin centres.
+
+    The counts are convolved with a sampled Gaussian through the FFT, so the
+    cost depends on the number of bins, not on the number of observations.
+    The bandwidth defaults to Scott's rule (std * n ** -0.2).
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum()
+    width = edges[1] - edges[0]
+    if total == 0:
+        return np.zeros_like(counts)
+    if bandwidth is None:
+        centers = (edges[:-1] + edges[1:]) / 2
+        mean = (counts * centers).sum() / total
+        std = np.sqrt((counts * (centers - mean) ** 2).sum() / total)
+        bandwidth = std * total ** -0.2
+    sigma = bandwidth / width
+    if sigma <= 0:
+        return counts / (total * width)
+    # Kernel sampled on the bin grid, truncated at 4 standard deviations
+    half = min(int(np.ceil(4 * sigma)), len(counts))
+    offsets = np.arange(-half, half + 1)
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+    kernel /= kernel.sum()
+    size = len(counts) + 2 * half
+    smoothed = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel, size), size)
+    return np.clip(smoothed[half:half + len(counts)], 0, None) / (total * width)
+
+
+class DensityAccumulator:
+    """Mergeable 2-D binned counts of a pair of columns, for density scatter plots.
+
+    With `value`, the per-cell sum of a third column is kept as well, so each
+    cell can be coloured by its mean value instead of drawing a legend entry
+    per point.
+    """
+
+    def __init__(self, x, y, x_range, y_range, bins=100, value=None):
+        self.x, self.y, self.value = x, y, value
+        self.x_range = (float(x_range[0]), float(x_range[1]))
+        self.y_range = (float(y_range[0]), float(y_range[1]))
+        self.bins = bins
+        self.counts = np.zeros((bins, bins), dtype=np.int64)
+        self.value_sums = np.zeros((bins, bins)) if value is not None else None
+        self.value_counts = np.zeros((bins, bins), dtype=np.int64) if value is not None else None
+
+    def cells(self, data):
+        """Flat cell index of each row, or -1 for rows with NaNs or outside the ranges."""
+        index = np.zeros(len(data), dtype=np.int64)
+        valid = np.ones(len(data), dtype=bool)
+        for col, (low, high) in ((self.x, self.x_range), (self.y, self.y_range)):
+            values = data[col].to_numpy(dtype=np.float64)
+            with np.errstate(invalid='ignore'):
+                valid &= (values >= low) & (values <= high)
+                position = np.floor((values - low) / (high - low) * self.bins)
+            position = np.clip(np.nan_to_num(position), 0, self.bins - 1).astype(np.int64)
+            index = index * self.bins + position
+        return np.where(valid, index, -1)
+
+    def update(self, data):
+        """Add the rows of a DataFrame chunk."""
+        cells = self.cells(data)
+        valid = cells >= 0
+        size = self.bins * self.bins
+        self.counts += np.bincount(cells[valid], minlength=size).reshape(self.bins, self.bins)
+        if self.value is not None:
+            values = data[self.value].to_numpy(dtype=np.float64)
+            present = valid & ~np.isnan(values)
+            self.value_sums += np.bincount(cells[present], weights=values[present],
+                                           minlength=size).reshape(self.bins, self.bins)
+            self.value_counts += np.bincount(cells[present], minlength=size).reshape(self.bins, self.bins)
+        return self
+
+    def merge(self, other):
+        """Combine another accumulator over the same pair, ranges and bins."""
+        if (other.x, other.y, other.value, other.x_range, other.y_range, other.bins) != \
+                (self.x, self.y, self.value, self.x_range, self.y_range, self.bins):
+            raise ValueError("Cannot merge density grids with different layouts.")
+        self.counts += other.counts
+        if self.value is not None:
+            self.value_sums += other.value_sums
+            self.value_counts += other.value_counts
+        return self
+
+    def edges(self):
+        """x and y cell edges."""
+        return (np.linspace(*self.x_range, self.bins + 1), np.linspace(*self.y_range, self.bins + 1))
+
+    def value_means(self):
+        """Mean of the value column per cell (NaN for empty cells)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.value_counts > 0, self.value_sums / self.value_counts, np.nan)
+
+
+def _chunks(data):
+    return [data] if isinstance(data, pd.DataFrame) else data
+
+
+def histograms(data, columns, bins=30, ranges=None):
+    """Accumulate histograms of `columns` over a DataFrame or an iterable of chunks.
+
+    Bin ranges come from `ranges`, else from the data itself for a DataFrame,
+    else from SENSOR_LIMITS (so chunked data needs no extra pass).
+    """
+    ranges = dict(ranges or {})
+    if isinstance(data, pd.DataFrame):
+        for col in columns:
+            if col not in ranges:
+                ranges[col] = _data_range(data, col)
+    for col in columns:
+        ranges.setdefault(col, SENSOR_LIMITS.get(col, (0.0, 1.0)))
+    accumulator = HistogramAccumulator({col: ranges[col] for col in columns}, bins)
+    for chunk in _chunks(data):
+        accumulator.update(chunk)
+    return accumulator
+
+
+def plot_histogram(accumulator, col, ax=None, kde=True, color='skyblue'):
+    """Draw a precomputed histogram, with its KDE scaled to the counts."""
+    if ax is None:
+        ax = plt.gca()
+    counts, edges = accumulator.histogram(col)
+    ax.stairs(counts, edges, fill=True, color=color, alpha=0.75, edgecolor='white')
+    if kde:
+        x, density = accumulator.kde(col)
+        ax.plot(x, density * counts.sum() * (edges[1] - edges[0]), color=color, linewidth=1.5)
+    return ax
+
+
+def _data_range(data, col):
+    """(min, max) of a column, widened if it is constant or empty."""
+    values = data[col].to_numpy(dtype=np.float64)
+    if not np.isfinite(values).any():
+        return (0.0, 1.0)
+    low, high = np.nanmin(values), np.nanmax(values)
+    return (low, high) if high > low else (low - 0.5, high + 0.5)
+
+
+def density(data, x, y, bins=100, ranges=None, value=None):
+    """Accumulate a DensityAccumulator of (x, y) over a DataFrame or chunks.
+
+    Ranges are resolved like in `histograms`.
+    """
+    ranges = dict(ranges or {})
+    for col in (x, y):
+        if col not in ranges:
+            ranges[col] = _data_range(data, col) if isinstance(data, pd.DataFrame) \
+                else SENSOR_LIMITS.get(col, (0.0, 1.0))
+    accumulator = DensityAccumulator(x, y, ranges[x], ranges[y], bins, value)
+    for chunk in _chunks(data):
+        accumulator.update(chunk)
+    return accumulator
+
+
+def stratified_sample(data, x, y, size=2000, bins=20, seed=0):
+    """Sample about `size` rows of a DataFrame spread evenly over a coarse (x, y) grid.
+
+    Every occupied cell contributes up to the same number of rows, so sparse
+    regions and outliers stay visible next to the dense core. Chunked data is
+    sampled by `pair_densities`.
+    """
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("stratified_sample needs a DataFrame; use pair_densities for chunks.")
+    if len(data) <= size:
+        return data
+    cells = density(data, x, y, bins=bins).cells(data)
+    rng = np.random.default_rng(seed)
+    # Shuffle, then group rows by cell while keeping the shuffled order inside each cell
+    order = rng.permutation(len(data))
+    order = order[np.argsort(cells[order], kind='stable')]
+    sorted_cells = cells[order]
+    starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+    lengths = np.diff(np.r_[starts, len(order)])
+    rank = np.arange(len(order)) - np.repeat(starts, lengths)
+    occupied = np.count_nonzero(np.unique(sorted_cells) >= 0)
+    per_cell = max(size // max(occupied, 1), 1)
+    keep = order[(rank < per_cell) & (sorted_cells >= 0)]
+    return data.iloc[np.sort(keep)]
+
+
+def pair_densities(data, pairs, bins=100, sample_size=2000, seed=0):
+    """DensityAccumulators and stratified samples of several (x, y) pairs, in one pass.
+
+    `data` is a DataFrame or an iterable of chunks, which is read once: each
+    chunk is sampled on its own and the chunk samples are sampled again at
+    the end. Returns {pair: (accumulator, sample)}, with no sample when
+    `sample_size` is 0.
+    """
+    if isinstance(data, pd.DataFrame):
+        return {pair: (density(data, *pair, bins),
+                       stratified_sample(data, *pair, sample_size, seed=seed) if sample_size else None)
+                for pair in pairs}
+    grids = {pair: density([], *pair, bins) for pair in pairs}
+    samples = {pair: [] for pair in pairs}
+    for chunk in data:
+        for pair in pairs:
+            grids[pair].update(chunk)
+            if sample_size:
+                samples[pair].append(stratified_sample(chunk, *pair, sample_size, seed=seed))
+    return {pair: (grids[pair], stratified_sample(pd.concat(samples[pair]), *pair, sample_size, seed=seed)
+                   if samples[pair] else None)
+            for pair in pairs}
+
+
+def plot_density(accumulator, ax=None, cmap='viridis', sample=None, colorbar=True):
+    """Draw binned counts (or the per-cell mean value) of a DensityAccumulator.
+
+    `sample` is an optional DataFrame of rows overlaid as small points.
+    """
+    if ax is None:
+        ax = plt.gca()
+    x_edges, y_edges = accumulator.edges()
+    if accumulator.value is not None:
+        grid = accumulator.value_means()
+        mesh = ax.pcolormesh(x_edges, y_edges, np.ma.masked_invalid(grid).T, cmap=cmap, shading='flat')
+        label = f'Mean {accumulator.value}'
+    else:
+        counts = np.ma.masked_equal(accumulator.counts, 0)
+        mesh = ax.pcolormesh(x_edges, y_edges, counts.T, cmap=cmap, shading='flat',
+                             norm=LogNorm(vmin=1, vmax=max(int(accumulator.counts.max()), 1)))
+        label = 'Count'
+    if sample is not None and len(sample):
+        ax.scatter(sample[accumulator.x], sample[accumulator.y], s=2, color='black', alpha=0.3, linewidths=0)
+    if colorbar:
+        ax.figure.colorbar(mesh, ax=ax, label=label)
+    return ax
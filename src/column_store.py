@@ -0,0 +1,174 @@
+import glob
+import json
+import os
+import shutil
+import struct
+import numpy as np
+import pandas as pd
+from src import data_cache, eda_utils
+
+# A store is a directory next to the Arrow cache, keyed the same way by path, size and mtime
+STORE_SUFFIX = '.columns'
+MANIFEST = 'manifest.json'
+# Bump when the layout changes, to rebuild older stores
+STORE_VERSION = 1
+# Bytes of every .npy header, so it can be rewritten in place once the row count is known
+HEADER_SIZE = 128
+TIMESTAMP_DTYPE = 'int64'
+
+
+def _header(dtype, rows):
+    """.npy (version 1.0) header of a 1-D array, padded to HEADER_SIZE bytes."""
+    text = repr({'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)), 'fortran_order': False,
+                 'shape': (rows,)})
+    magic = np.lib.format.magic(1, 0)
+    text = text.ljust(HEADER_SIZE - len(magic) - 3) + '\n'
+    return magic + struct.pack('<H', len(text)) + text.encode('latin1')
+
+
+def store_path(file_path, cache_dir=None):
+    """Directory of the column store of a station file."""
+    return data_cache.cache_path(file_path, cache_dir)[:-len(data_cache.CACHE_SUFFIX)] + STORE_SUFFIX
+
+
+def build_store(file_path, path=None, chunksize=eda_utils.DEFAULT_CHUNKSIZE):
+    """Write the column store of a station file and return its directory.
+
+    The file is read in chunks; each sensor column is appended to its own
+    float32 .npy file and the timestamps to an int64 one (nanoseconds since
+    the epoch, NaT as the int64 minimum). The headers are written with a
+    provisional row count and rewritten at the end, so nothing is held in
+    memory beyond one chunk. The directory is built under a temporary name
+    and renamed once complete; if another process has published the store
+    in the meantime, its store is kept and this build is discarded.
+    """
+    path = path or store_path(file_path)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(temp_path, exist_ok=True)
+    files = {}
+    rows = 0
+    start = end = None
+    try:
+        for chunk in eda_utils.load_data(file_path, chunksize=chunksize, comments='drop'):
+            if not files:
+                columns = {col: eda_utils.SENSOR_DTYPE for col in chunk.columns if col in eda_utils.SENSOR_COLUMNS}
+                if eda_utils.TIMESTAMP_COLUMN in chunk.columns:
+                    columns[eda_utils.TIMESTAMP_COLUMN] = TIMESTAMP_DTYPE
+                for col, dtype in columns.items():
+                    files[col] = open(os.path.join(temp_path, f'{col}.npy'), 'wb')
+                    files[col].write(_header(dtype, 0))
+            for col, file in files.items():
+                if col == eda_utils.TIMESTAMP_COLUMN:
+                    times = pd.DatetimeIndex(chunk[col]).as_unit('ns')
+                    values = times.asi8
+                    if times.notna().any():
+                        start = times.min() if start is None else min(start, times.min())
+                        end = times.max() if end is None else max(end, times.max())
+                else:
+                    values = chunk[col].to_numpy(dtype=columns[col])
+                file.write(values.tobytes())
+            rows += len(chunk)
+        for col, file in files.items():
+            file.seek(0)
+            file.write(_header(columns[col], rows))
+            file.close()
+        manifest = {
+            'version': STORE_VERSION,
+            'source': os.path.abspath(os.fspath(file_path)),
+            'rows': rows,
+            'columns': columns if files else {},
+            'timestamp_unit': 'ns',
+            'start': None if start is None else start.isoformat(),
+            'end': None if end is None else end.isoformat(),
+        }
+        with open(os.path.join(temp_path, MANIFEST), 'w') as file:
+            json.dump(manifest, file, indent=2)
+        try:
+            os.rename(temp_path, path)
+        except OSError:
+            # Another process published the store first; a complete store is never replaced
+            if not os.path.exists(os.path.join(path, MANIFEST)):
+                raise
+    finally:
+        for file in files.values():
+            file.close()
+        if os.path.exists(temp_path):
+            shutil.rmtree(temp_path)
+    return path
+
+
+def _prune(path):
+    """Remove stores left behind by older versions of the same file."""
+    prefix = path[:-len(STORE_SUFFIX)].rsplit('-', 1)[0]
+    for stale in glob.glob(f"{glob.escape(prefix)}-*{STORE_SUFFIX}"):
+        if stale != path:
+            shutil.rmtree(stale, ignore_errors=True)
+
+
+class ColumnStore:
+    """Read-only, memory-mapped columns of one station.
+
+    Each column is opened with np.load(mmap_mode='r') on first use, so
+    opening a store reads only its manifest, column access returns views
+    without copying, and processes opening the same store share its pages
+    through the OS file cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST)) as file:
+            self.manifest = json.load(file)
+        if self.manifest.get('version') != STORE_VERSION:
+            raise ValueError(f"Column store {path} has version {self.manifest.get('version')}, "
+                             f"expected {STORE_VERSION}.")
+        self._arrays = {}
+
+    @property
+    def rows(self):
+        return self.manifest['rows']
+
+    @property
+    def columns(self):
+        """Sensor columns in the store (the timestamps are not included)."""
+        return [col for col in self.manifest['columns'] if col != eda_utils.TIMESTAMP_COLUMN]
+
+    def column(self, name):
+        """Memory-mapped array of a column; 'Timestamp' gives the int64 epoch nanoseconds."""
+        if name not in self._arrays:
+            if name not in self.manifest['columns']:
+                raise KeyError(f"Column '{name}' is not in the column store.")
+            self._arrays[name] = np.load(os.path.join(self.path, f'{name}.npy'), mmap_mode='r')
+        return self._arrays[name]
+
+    def __getitem__(self, name):
+        return self.column(name)
+
+    def timestamps(self):
+        """Timestamps as a datetime64[ns] view of the int64 column."""
+        return self.column(eda_utils.TIMESTAMP_COLUMN).view('datetime64[ns]')
+
+    def to_frame(self, columns=None, rows=slice(None)):
+        """DataFrame of some columns (default: all) and rows, in the load_data layout.
+
+        Only the requested columns and rows are read from disk.
+        """
+        columns = self.columns if columns is None else list(columns)
+        frame = {}
+        if eda_utils.TIMESTAMP_COLUMN in self.manifest['columns']:
+            frame[eda_utils.TIMESTAMP_COLUMN] = np.asarray(self.timestamps()[rows])
+        for col in columns:
+            frame[col] = np.asarray(self.column(col)[rows])
+        return pd.DataFrame(frame)
+
+
+def open_store(file_path, cache_dir=None):
+    """ColumnStore of a station file, built on first use.
+
+    The store lives next to the Arrow cache (see src.data_cache) and is
+    rebuilt when the file changes.
+    """
+    path = store_path(file_path, cache_dir)
+    if not os.path.exists(os.path.join(path, MANIFEST)):
+        build_store(file_path, path)
+        _prune(path)
+    return ColumnStore(path)
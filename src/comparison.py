@@ -0,0 +1,195 @@
+import os
+from dataclasses import dataclass
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from src import eda_utils, export
+from src.profiling import timed
+
+# Categorical column naming the station of each row of the long-format table
+STATION_COLUMN = 'Station'
+# Statistics of every column per station
+STATISTICS = ['count', 'mean', 'median', 'std', 'skew', 'min', 'max']
+# Columns of the per-station correlation matrices
+CORRELATION_COLUMNS = ['GHI', 'DNI', 'DHI', 'TModA', 'TModB']
+
+
+def load_stations(paths, columns=None):
+    """Load several station files into one long-format table.
+
+    `paths` is a list of files, named after their file names (e.g.
+    'togo-dapaong_qc'), or a dict of station name -> file. The rows of all
+    stations are stacked with a categorical 'Station' column in front, and
+    `columns` (plus 'Timestamp') limits the columns read from each file.
+    """
+    if isinstance(paths, dict):
+        names, paths = list(paths), list(paths.values())
+    else:
+        names = [os.path.splitext(os.path.basename(os.fspath(path)))[0] for path in paths]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Station names must be unique, got {names}.")
+    if columns is not None:
+        columns = [eda_utils.TIMESTAMP_COLUMN] + [col for col in columns if col != eda_utils.TIMESTAMP_COLUMN]
+    frames = [eda_utils.load_data(path, columns=columns, comments='drop') for path in paths]
+    data = pd.concat(frames, ignore_index=True)
+    codes = np.repeat(np.arange(len(names)), [len(frame) for frame in frames])
+    data.insert(0, STATION_COLUMN, pd.Categorical.from_codes(codes, categories=names))
+    return data
+
+
+def _numeric_columns(data, columns=None):
+    numeric = data.select_dtypes(include='number').columns
+    return [col for col in (columns or numeric) if col in numeric]
+
+
+def station_statistics(data, columns=None):
+    """STATISTICS of every numeric column per station, one row per (station, column)."""
+    columns = _numeric_columns(data, columns)
+    table = data.groupby(STATION_COLUMN, observed=True)[columns].agg(STATISTICS)
+    return table.stack(level=0)
+
+
+def station_quality(data, columns=None):
+    """Missing and negative values of every numeric column per station, as percentages of its rows."""
+    columns = _numeric_columns(data, columns)
+    values = data[columns]
+    flags = pd.concat({'missing_pct': values.isna(), 'negative_pct': values < 0}, axis=1)
+    rates = flags.groupby(data[STATION_COLUMN], observed=True).mean() * 100
+    return rates.stack(level=1)
+
+
+def monthly_totals(data, columns=eda_utils.SOLAR_COLUMNS):
+    """Monthly irradiation (kWh/m²) of the irradiance columns per station.
+
+    Every reading counts for the station's median sampling interval, and
+    negative (night-time offset) readings count as zero. Returns one row per
+    (station, month) and one column per irradiance column.
+    """
+    columns = [col for col in columns if col in data.columns]
+    station = data[STATION_COLUMN]
+    timestamps = data[eda_utils.TIMESTAMP_COLUMN]
+    steps = timestamps.groupby(station, observed=True).diff()
+    hours = steps[steps > pd.Timedelta(0)].groupby(station, observed=True).median() / pd.Timedelta(hours=1)
+    month = pd.Series(timestamps.to_numpy().astype('datetime64[M]'), index=data.index, name='month')
+    values = data[columns].astype(np.float64).clip(lower=0)
+    sums = values.groupby([station, month], observed=True).sum()
+    hours = hours.reindex(sums.index.get_level_values(0)).fillna(1 / 60).to_numpy()
+    return sums.mul(hours, axis=0) / 1000
+
+
+def station_correlations(data, columns=CORRELATION_COLUMNS):
+    """Correlation matrix of `columns` per station, stacked as (station, column) rows.
+
+    All stations come from one groupby sum of the centred values and their
+    pairwise products, over the rows where every column is present.
+    """
+    columns = [col for col in columns if col in data.columns]
+    complete = data[columns].notna().all(axis=1).to_numpy()
+    values = data[columns].to_numpy(dtype=np.float64)[complete]
+    # Centre on the overall means so the sums of products do not lose precision
+    values = values - values.mean(axis=0) if len(values) else values
+    pairs = [(i, j) for i in range(len(columns)) for j in range(i, len(columns))]
+    products = values[:, [i for i, _ in pairs]] * values[:, [j for _, j in pairs]]
+    stations = data[STATION_COLUMN].array[complete]
+    grouped = pd.DataFrame(np.hstack([np.ones((len(values), 1)), values, products])).groupby(
+        stations, observed=True).sum()
+    sums = grouped.to_numpy()
+    count, totals, cross = sums[:, :1], sums[:, 1:len(columns) + 1], sums[:, len(columns) + 1:]
+    covariance = np.empty((len(sums), len(columns), len(columns)))
+    for k, (i, j) in enumerate(pairs):
+        covariance[:, i, j] = covariance[:, j, i] = cross[:, k] / count[:, 0] - (
+            totals[:, i] * totals[:, j] / count[:, 0] ** 2)
+    scale = np.sqrt(np.einsum('sii->si', covariance))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        correlation = covariance / (scale[:, :, None] * scale[:, None, :])
+    index = pd.MultiIndex.from_product([grouped.index, columns], names=[STATION_COLUMN, None])
+    return pd.DataFrame(correlation.reshape(-1, len(columns)), index=index, columns=columns)
+
+
+@dataclass
+class StationComparison:
+    """Tables comparing several stations, each with one row per station and column or month.
+
+    `statistics` holds STATISTICS, `quality` the missing and negative
+    percentages, `monthly` the monthly irradiation in kWh/m² and
+    `correlations` the stacked correlation matrices.
+    """
+    statistics: pd.DataFrame
+    quality: pd.DataFrame
+    monthly: pd.DataFrame
+    correlations: pd.DataFrame
+
+    @property
+    def stations(self):
+        return list(self.statistics.index.get_level_values(0).unique())
+
+
+@timed
+def compare_stations(data, columns=None):
+    """Compute every comparison table from a load_stations table.
+
+    Each table is one grouped operation over all stations, so the cost
+    grows with the number of rows, not with a loop over stations.
+    """
+    return StationComparison(
+        statistics=station_statistics(data, columns),
+        quality=station_quality(data, columns),
+        monthly=monthly_totals(data),
+        correlations=station_correlations(data),
+    )
+
+
+@timed
+def plot_comparison(comparison, columns=eda_utils.SOLAR_COLUMNS):
+    """Side-by-side mean irradiance, monthly GHI irradiation and missing values per station."""
+    fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+    means = comparison.statistics['mean'].unstack(level=1).reindex(columns=columns)
+    means.plot.bar(ax=axes[0], rot=0)
+    axes[0].set_title('Mean Irradiance')
+    axes[0].set_ylabel('W/m²')
+    if 'GHI' in comparison.monthly.columns:
+        monthly = comparison.monthly['GHI'].unstack(level=0)
+        monthly.plot(ax=axes[1], marker='o')
+        axes[1].set_title('Monthly GHI Irradiation')
+        axes[1].set_ylabel('kWh/m²')
+    else:
+        axes[1].set_visible(False)
+    missing = comparison.quality['missing_pct'].unstack(level=1).reindex(columns=columns)
+    missing.plot.bar(ax=axes[2], rot=0)
+    axes[2].set_title('Missing Values')
+    axes[2].set_ylabel('% of rows')
+    for ax in axes:
+        ax.set_xlabel('')
+        ax.grid(True, linestyle='--', alpha=0.5)
+    fig.tight_layout()
+    return fig
+
+
+@timed
+def plot_correlations(comparison):
+    """Correlation heatmaps of the stations side by side, on a shared color scale."""
+    stations = comparison.stations
+    fig, axes = plt.subplots(1, len(stations), figsize=(6 * len(stations), 5), squeeze=False)
+    for i, (station, ax) in enumerate(zip(stations, axes[0])):
+        sns.heatmap(comparison.correlations.loc[station], annot=True, cmap='coolwarm', fmt='.2f',
+                    vmin=-1, vmax=1, cbar=i == len(stations) - 1, ax=ax)
+        ax.set_title(station)
+    fig.tight_layout()
+    return fig
+
+
+def write_comparison(paths, output_dir, formats=('png',)):
+    """Compare station files and write the tables as CSV and the plots as figures to `output_dir`.
+
+    Returns the StationComparison.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    comparison = compare_stations(load_stations(paths))
+    comparison.statistics.to_csv(os.path.join(output_dir, 'station_statistics.csv'))
+    comparison.quality.to_csv(os.path.join(output_dir, 'station_quality.csv'))
+    comparison.monthly.to_csv(os.path.join(output_dir, 'monthly_irradiation.csv'))
+    comparison.correlations.to_csv(os.path.join(output_dir, 'station_correlations.csv'))
+    export.save_figure(plot_comparison(comparison), os.path.join(output_dir, 'plot_comparison'), formats)
+    export.save_figure(plot_correlations(comparison), os.path.join(output_dir, 'plot_correlations'), formats)
+    return comparison
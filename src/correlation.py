@@ -0,0 +1,98 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from src.stats import CoMomentAccumulator
+
+
+def _chunks(data):
+    """Treat a single DataFrame as one chunk."""
+    return [data] if isinstance(data, pd.DataFrame) else data
+
+
+def _columns(chunk, columns):
+    """Requested columns, or every numeric column of the chunk."""
+    if columns is None:
+        return list(chunk.select_dtypes(include='number').columns)
+    return list(columns)
+
+
+def accumulate(data, columns=None):
+    """Accumulate co-moments over a DataFrame or an iterable of chunks.
+
+    The result can be merged with accumulators from other chunks, stations or
+    processes (CoMomentAccumulator.merge) before calling .correlation().
+    """
+    accumulator = None
+    for chunk in _chunks(data):
+        if accumulator is None:
+            accumulator = CoMomentAccumulator(_columns(chunk, columns))
+        accumulator.update(chunk)
+    return accumulator if accumulator is not None else CoMomentAccumulator(columns or [])
+
+
+def correlation_matrix(data, columns=None):
+    """Pairwise correlation matrix of `columns` (default: all numeric) without loading all rows."""
+    return accumulate(data, columns).correlation()
+
+
+def _window_starts(timestamps, freq):
+    """Start of the calendar window ('D', 'W', 'MS', ...) of each timestamp."""
+    period = {'MS': 'M', 'ME': 'M', 'YS': 'Y', 'YE': 'Y'}.get(freq, freq)
+    return timestamps.to_period(period).start_time
+
+
+def window_accumulators(data, columns=None, freq='MS', timestamp_column='Timestamp'):
+    """Co-moment accumulators per calendar window (e.g. 'D', 'W', 'MS').
+
+    Returns a dict ordered by window start. Windows split across chunks are
+    merged, so the chunks do not need to align with the windows.
+    """
+    windows = {}
+    for chunk in _chunks(data):
+        chunk_columns = _columns(chunk, columns)
+        starts = _window_starts(pd.DatetimeIndex(pd.to_datetime(chunk[timestamp_column])), freq)
+        values = chunk[chunk_columns].to_numpy(dtype=np.float64)
+        # Rows of each window are contiguous after a stable sort on the window start
+        order = np.argsort(starts.asi8, kind='stable')
+        _, first = np.unique(starts.asi8[order], return_index=True)
+        for rows in np.split(order, first[1:]):
+            window = starts[rows[0]]
+            if window not in windows:
+                windows[window] = CoMomentAccumulator(chunk_columns)
+            windows[window].update(values[rows])
+    return dict(sorted(windows.items()))
+
+
+def windowed_correlations(data, columns=None, freq='MS', timestamp_column='Timestamp'):
+    """Correlation matrix per calendar window, stacked as (window, column) rows."""
+    windows = window_accumulators(data, columns, freq, timestamp_column)
+    return pd.concat({window: accumulator.correlation() for window, accumulator in windows.items()},
+                     names=['window', 'column'])
+
+
+def rolling_correlations(data, columns=None, window=7, freq='D', timestamp_column='Timestamp'):
+    """Correlation over a rolling span of `window` consecutive `freq` periods.
+
+    Each result is labelled with the start of its last period and merges the
+    per-period accumulators, so the rows are only read once.
+    """
+    periods = list(window_accumulators(data, columns, freq, timestamp_column).items())
+    results = {}
+    for i in range(window - 1, len(periods)):
+        merged = CoMomentAccumulator(periods[i][1].columns)
+        for _, accumulator in periods[i - window + 1:i + 1]:
+            merged.merge(accumulator)
+        results[periods[i][0]] = merged.correlation()
+    if not results:
+        return pd.DataFrame()
+    return pd.concat(results, names=['window', 'column'])
+
+
+def plot_correlation_heatmap(matrix, title='Correlation Heatmap', ax=None):
+    """Draw a correlation matrix as an annotated heatmap."""
+    if ax is None:
+        _, ax = plt.subplots(figsize=(10, 8))
+    sns.heatmap(matrix, annot=True, cmap='coolwarm', fmt=".2f", linewidths=0.5, vmin=-1, vmax=1, ax=ax)
+    ax.set_title(title)
+    return ax
@@ -0,0 +1,144 @@
+import glob
+import hashlib
+import os
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.ipc as ipc
+except ImportError:  # pragma: no cover - the cache is optional
+    pa = None
+
+# Cache files go to $EDA_CACHE_DIR, or to a .eda_cache folder next to the CSV
+CACHE_DIR_ENV = 'EDA_CACHE_DIR'
+CACHE_DIR_NAME = '.eda_cache'
+CACHE_SUFFIX = '.arrow'
+
+
+def is_available():
+    """Return True when pyarrow is installed and the cache can be used."""
+    return pa is not None
+
+
+def is_cacheable(file_path):
+    """Only files on disk can be cached (not uploaded buffers)."""
+    return isinstance(file_path, (str, os.PathLike)) and os.path.isfile(file_path)
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode()).hexdigest()[:10]
+
+
+def default_cache_dir(file_path):
+    """Cache directory of a data file: $EDA_CACHE_DIR, else a .eda_cache folder next to it."""
+    source = os.path.abspath(os.fspath(file_path))
+    return os.environ.get(CACHE_DIR_ENV) or os.path.join(os.path.dirname(source), CACHE_DIR_NAME)
+
+
+def cache_path(file_path, cache_dir=None):
+    """Return the cache file of a CSV, keyed by its path, size and mtime."""
+    source = os.path.abspath(os.fspath(file_path))
+    info = os.stat(source)
+    if cache_dir is None:
+        cache_dir = default_cache_dir(source)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    version = _digest(f"{info.st_size}|{info.st_mtime_ns}")
+    return os.path.join(cache_dir, f"{stem}-{_digest(source)}-{version}{CACHE_SUFFIX}")
+
+
+def _arrow_type(dtype):
+    """Arrow type of a declared pandas dtype ('string' or a NumPy dtype such as 'float32')."""
+    if dtype == 'string':
+        return pa.string()
+    return pa.from_numpy_dtype(np.dtype(dtype))
+
+
+def _arrow_schema(table, dtypes=None):
+    """Schema of the cache file: the declared `dtypes`, else the first chunk's types.
+
+    Undeclared text columns are widened to plain strings, since categorical
+    and all-null columns would otherwise get a type that later chunks cannot
+    be cast to.
+    """
+    dtypes = dtypes or {}
+    fields = []
+    for field in table.schema:
+        if field.name in dtypes:
+            field = field.with_type(_arrow_type(dtypes[field.name]))
+        elif pa.types.is_null(field.type) or pa.types.is_dictionary(field.type) \
+                or pa.types.is_large_string(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field)
+    return pa.schema(fields)
+
+
+def write_cache(path, chunks, dtypes=None):
+    """Stream DataFrame chunks into an uncompressed Arrow IPC (Feather v2) file.
+
+    Columns listed in `dtypes` (column -> pandas dtype) get that type in
+    every chunk, whatever pandas inferred for the chunk. The file is written
+    under a temporary name and renamed once complete. Returns False if the
+    chunks cannot be stored with a single schema.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = _arrow_schema(table, dtypes)
+                writer = ipc.new_file(temp_path, schema)
+            writer.write_table(table.cast(schema))
+        if writer is None:
+            return False
+        writer.close()
+        writer = None
+        os.replace(temp_path, path)
+        return True
+    except (pa.ArrowException, ValueError, TypeError):
+        return False
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _prune(path):
+    """Remove cache files left behind by older versions of the same CSV."""
+    prefix = path[:-len(CACHE_SUFFIX)].rsplit('-', 1)[0]
+    for stale in glob.glob(f"{glob.escape(prefix)}-*{CACHE_SUFFIX}"):
+        if stale != path:
+            os.remove(stale)
+
+
+def cached_file(file_path, read_chunks, cache_dir=None, dtypes=None):
+    """Return the cache file for `file_path`, building it from `read_chunks()` if needed.
+
+    `dtypes` declares column types of the cache (see write_cache). Returns None if the cache is unavailable or could not be written.
+    """
+    if not is_available() or not is_cacheable(file_path):
+        return None
+    path = cache_path(file_path, cache_dir)
+    if os.path.exists(path):
+        return path
+    try:
+        if not write_cache(path, read_chunks(), dtypes):
+            return None
+    except OSError:
+        return None
+    _prune(path)
+    return path
+
+
+def read_cache(path, columns=None, chunksize=None):
+    """Read a cache file through a memory map, optionally only some columns.
+
+    With `chunksize`, a generator of DataFrames is returned.
+    """
+    table = feather.read_table(path, columns=columns, memory_map=True)
+    if chunksize is None:
+        return table.to_pandas()
+    return (batch.to_pandas() for batch in table.to_batches(max_chunksize=chunksize))
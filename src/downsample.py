@@ -0,0 +1,93 @@
+import numpy as np
+
+# Default number of points drawn per series, about the pixel width of a figure
+DEFAULT_MAX_POINTS = 2000
+METHODS = ('minmax', 'lttb')
+
+
+def _as_numeric(x):
+    """View x as float64 so distances can be computed (datetimes become nanoseconds)."""
+    x = np.asarray(x)
+    if x.dtype.kind in 'mM':
+        return x.astype('int64').astype(np.float64)
+    return x.astype(np.float64)
+
+
+def minmax_downsample(x, y, max_points=DEFAULT_MAX_POINTS):
+    """Keep the minimum and maximum of y in each of max_points / 2 equal-size buckets.
+
+    Every peak and trough survives, so the drawn envelope matches the full
+    series. Returns the selected x and y in their original order.
+    """
+    x, y = np.asarray(x), np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= max_points:
+        return x, y
+    buckets = max(max_points // 2, 1)
+    size = -(-n // buckets)
+    # Pad to a full (buckets, size) grid; NaNs never win argmin/argmax
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    grid = padded.reshape(buckets, size)
+    missing = np.isnan(grid)
+    offsets = np.arange(buckets) * size
+    lows = np.where(missing, np.inf, grid).argmin(axis=1) + offsets
+    highs = np.where(missing, -np.inf, grid).argmax(axis=1) + offsets
+    # Drop buckets that only hold NaNs
+    valid = ~missing.all(axis=1)
+    index = np.unique(np.concatenate([lows[valid], highs[valid]]))
+    return x[index], y[index]
+
+
+def lttb_downsample(x, y, max_points=DEFAULT_MAX_POINTS):
+    """Largest-Triangle-Three-Buckets downsampling to at most max_points points.
+
+    Picks, in each bucket, the point forming the largest triangle with the
+    previously selected point and the average of the next bucket. NaNs are
+    dropped first.
+    """
+    x, y = np.asarray(x), np.asarray(y, dtype=np.float64)
+    valid = ~np.isnan(y)
+    if not valid.all():
+        x, y = x[valid], y[valid]
+    n = len(y)
+    if n <= max_points or max_points < 3:
+        return x, y
+    xs = _as_numeric(x)
+    # Bucket boundaries for the points between the first and the last one
+    bounds = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(max_points - 2):
+        start, end = bounds[i], max(bounds[i + 1], bounds[i] + 1)
+        next_start = end
+        next_end = bounds[i + 2] if i + 2 < len(bounds) else n
+        next_end = max(next_end, next_start + 1)
+        avg_x = xs[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs((xs[previous] - avg_x) * (y[start:end] - y[previous])
+                      - (xs[previous] - xs[start:end]) * (avg_y - y[previous]))
+        previous = start + int(area.argmax())
+        selected[i + 1] = previous
+    return x[selected], y[selected]
+
+
+def downsample(x, y, max_points=DEFAULT_MAX_POINTS, method='minmax'):
+    """Reduce a series to about max_points points with the given method.
+
+    method is 'minmax', 'lttb' or None (keep every point).
+    """
+    if method is None:
+        return np.asarray(x), np.asarray(y)
+    if method == 'minmax':
+        return minmax_downsample(x, y, max_points)
+    if method == 'lttb':
+        return lttb_downsample(x, y, max_points)
+    raise ValueError(f"Unknown downsampling method {method!r}; use one of {METHODS} or None.")
+
+
+def plot_series(ax, x, y, max_points=DEFAULT_MAX_POINTS, method='minmax', **kwargs):
+    """Draw y against x with plain matplotlib after downsampling it."""
+    x, y = downsample(x, y, max_points, method)
+    return ax.plot(x, y, **kwargs)
@@ -1,87 +1,361 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
-def load_data(file_path):
-    """Load data from a CSV file."""
-    return pd.read_csv(file_path)
+from src import backends, correlation, data_cache, stats
+from src.downsample import DEFAULT_MAX_POINTS, plot_series
+from src.profiling import timed
 
-def basic_info(data):
-    """Print basic information about the DataFrame."""
-    print("Basic Information:")
-    print(data.info())
+# Column schema of the station CSV files
+TIMESTAMP_COLUMN = 'Timestamp'
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M'
+COMMENTS_COLUMN = 'Comments'
+SENSOR_COLUMNS = ['GHI', 'DNI', 'DHI', 'ModA', 'ModB', 'Tamb', 'RH', 'WS', 'WSgust',
+                  'WSstdev', 'WD', 'WDstdev', 'BP', 'Cleaning', 'Precipitation',
+                  'TModA', 'TModB']
+SOLAR_COLUMNS = ['GHI', 'DNI', 'DHI']
+SENSOR_DTYPE = 'float32'
+# Logger error tokens read as missing values, on top of pandas' defaults ('NA', 'NaN', 'null', ...)
+NA_VALUES = ['Error', 'ERROR', 'error', '#VALUE!', '-', '--']
+# Physically plausible (min, max) range of each sensor
+SENSOR_LIMITS = {
+    'GHI': (0, 1500), 'DNI': (0, 1400), 'DHI': (0, 1000),
+    'ModA': (0, 1500), 'ModB': (0, 1500),
+    'Tamb': (-40, 60), 'RH': (0, 100),
+    'WS': (0, 60), 'WSgust': (0, 80), 'WSstdev': (0, 20),
+    'WD': (0, 360), 'WDstdev': (0, 180),
+    'BP': (800, 1100), 'Cleaning': (0, 1), 'Precipitation': (0, 10),
+    'TModA': (-40, 100), 'TModB': (-40, 100),
+}
+DEFAULT_CHUNKSIZE = 100_000
+# Columns aggregated by resample_data and the named resampling frequencies
+AGGREGATE_COLUMNS = ['GHI', 'DNI', 'DHI', 'Tamb', 'WS', 'WSgust', 'WSstdev', 'WD', 'WDstdev']
+FREQUENCIES = {'hourly': 'h', 'daily': 'D', 'monthly': 'MS'}
+AGGREGATE_CACHE_SIZE = 32
+# Column types of the Arrow cache, declared so that every chunk is stored alike
+CACHE_DTYPES = {**{col: SENSOR_DTYPE for col in SENSOR_COLUMNS},
+                TIMESTAMP_COLUMN: 'datetime64[us]', COMMENTS_COLUMN: 'string'}
 
-def basic_desc(data):
-    """Print basic information about the DataFrame."""
-    print("Basic Description:")
-    print(data.describe())
 
+def parse_timestamps(values):
+    """Parse timestamp strings using the station format, falling back to inference.
+
+    Values that are already datetime64 are returned as they are, so data
+    parsed by load_data is never parsed again.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    try:
+        return pd.to_datetime(values, format=TIMESTAMP_FORMAT)
+    except (ValueError, TypeError):
+        return pd.to_datetime(values)
+
+
+def _prepare_chunk(chunk):
+    """Convert the timestamp column of a freshly read chunk to datetime64."""
+    if TIMESTAMP_COLUMN in chunk.columns:
+        chunk[TIMESTAMP_COLUMN] = parse_timestamps(chunk[TIMESTAMP_COLUMN])
+    return chunk
+
+
+def _read_options(file_path, columns=None, comments='category'):
+    """Build the usecols/dtype arguments of pd.read_csv for a station file."""
+    if comments not in ('category', 'drop', 'keep'):
+        raise ValueError(f"comments must be 'category', 'drop' or 'keep', got {comments!r}")
+    header = pd.read_csv(file_path, nrows=0).columns
+    if hasattr(file_path, 'seek'):
+        # Rewind uploaded buffers after reading the header
+        file_path.seek(0)
+    usecols = [col for col in header if columns is None or col in columns]
+    if comments == 'drop':
+        usecols = [col for col in usecols if col != COMMENTS_COLUMN]
+    dtype = {col: SENSOR_DTYPE for col in SENSOR_COLUMNS if col in usecols}
+    if comments == 'category' and COMMENTS_COLUMN in usecols:
+        dtype[COMMENTS_COLUMN] = 'category'
+    elif comments == 'keep' and COMMENTS_COLUMN in usecols:
+        # Without a dtype, chunks without any comment would be read as float64
+        dtype[COMMENTS_COLUMN] = 'str'
+    return usecols, dtype
+
+
+def _rewind(file_path):
+    if hasattr(file_path, 'seek'):
+        file_path.seek(0)
+
+
+def _na_values(dtype):
+    """NA_VALUES for the sensor columns only, so comments such as '-' are kept."""
+    return {col: NA_VALUES for col, value in dtype.items() if value == SENSOR_DTYPE}
+
+
+def _text_dtype(dtype):
+    """The read_csv dtypes with the sensor columns read as text, to be coerced by _coerce."""
+    return {col: 'str' if value == SENSOR_DTYPE else value for col, value in dtype.items()}
+
+
+def _coerce(chunk, dtype):
+    """Convert sensor columns read as text to SENSOR_DTYPE, with unparseable values as NaN."""
+    for col, value in dtype.items():
+        if value == SENSOR_DTYPE:
+            chunk[col] = pd.to_numeric(chunk[col], errors='coerce').astype(SENSOR_DTYPE)
+    return chunk
+
+
+def _read_csv(file_path, usecols, dtype):
+    """Read a whole station file, coercing sensor columns that hold other tokens than NA_VALUES."""
+    try:
+        return pd.read_csv(file_path, usecols=usecols, dtype=dtype, na_values=_na_values(dtype))
+    except ValueError:
+        _rewind(file_path)
+        return _coerce(pd.read_csv(file_path, usecols=usecols, dtype=_text_dtype(dtype), na_values=_na_values(dtype)),
+                       dtype)
+
+
+def _iter_chunks(file_path, usecols, dtype, chunksize):
+    """Yield parsed chunks of a station file, like _read_csv.
+
+    After a chunk fails to convert, the file is read again as text from the
+    start and the rows already yielded are skipped.
+    """
+    rows = 0
+    with pd.read_csv(file_path, usecols=usecols, dtype=dtype, na_values=_na_values(dtype), chunksize=chunksize) as reader:
+        while True:
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                return
+            except ValueError:
+                break
+            rows += len(chunk)
+            yield _prepare_chunk(chunk)
+    _rewind(file_path)
+    with pd.read_csv(file_path, usecols=usecols, dtype=_text_dtype(dtype), na_values=_na_values(dtype),
+                     chunksize=chunksize) as reader:
+        for chunk in reader:
+            skip = min(rows, len(chunk))
+            rows -= skip
+            if skip < len(chunk):
+                yield _prepare_chunk(_coerce(chunk.iloc[skip:], dtype))
+
+
+def _from_cache(path, usecols, comments, chunksize):
+    """Read a station file from its Arrow cache, restoring the Comments dtype."""
+    def restore(frame):
+        if comments == 'category' and COMMENTS_COLUMN in frame.columns:
+            frame[COMMENTS_COLUMN] = frame[COMMENTS_COLUMN].astype('category')
+        return frame
+
+    data = data_cache.read_cache(path, usecols, chunksize)
+    if chunksize is None:
+        return restore(data)
+    return (restore(chunk) for chunk in data)
+
+
+@timed
+def load_data(file_path, chunksize=None, columns=None, comments='category', cache=True, backend='pandas'):
+    """Load data from a CSV file.
+
+    Sensor columns are read as float32 and 'Timestamp' is parsed to datetime64.
+    Logger tokens such as 'NA' or 'Error' (see NA_VALUES), and any other text
+    in a sensor column, are read as NaN.
+    'Comments' is stored as a category, or skipped with comments='drop'
+    (comments='keep' leaves it as strings). Pass `columns` to read only a
+    subset of the file. With `chunksize`, a generator of DataFrames of at most
+    that many rows is returned instead, so large files load in bounded memory.
+
+    When pyarrow is installed, the parsed file is cached once as an Arrow file
+    (see src.data_cache) and later loads memory-map only the requested columns.
+    Pass cache=False to always parse the CSV.
+
+    backend='polars' returns a lazy Polars scan of a CSV or Parquet file
+    instead (see src.backends); remove_negative_rows, missing_values,
+    count_negative_values, calculate_summary_stats, correlation_analysis and
+    resample_data accept it and run as streaming query plans.
+    """
+    if backend == 'polars':
+        return backends.scan(file_path, columns, comments)
+    if backend != 'pandas':
+        raise ValueError(f"Unknown backend '{backend}'. Use one of {backends.BACKENDS}.")
+    usecols, dtype = _read_options(file_path, columns, comments)
+    if cache:
+        path = data_cache.cached_file(
+            file_path,
+            lambda: load_data(file_path, chunksize=DEFAULT_CHUNKSIZE, comments='keep', cache=False),
+            dtypes=CACHE_DTYPES)
+        if path is not None:
+            return _from_cache(path, usecols, comments, chunksize)
+    if chunksize is None:
+        return _prepare_chunk(_read_csv(file_path, usecols, dtype))
+    return _iter_chunks(file_path, usecols, dtype, chunksize)
+
+@dataclass
+class DataProfile:
+    """Shape, per-column counts and numeric description of a DataFrame.
+
+    `columns` has one row per column with its dtype and its non-null,
+    missing and negative counts (negative is NA for non-numeric columns);
+    `description` is DataFrame.describe() of the data, or None when the
+    profile was computed without it.
+    """
+    rows: int
+    memory_bytes: int
+    columns: pd.DataFrame
+    description: pd.DataFrame = None
+
+@timed
+def profile_data(data, describe=True):
+    """Compute what basic_info, basic_desc, missing_values and count_negative_values report.
+
+    Every column is visited once, so callers that need several of these
+    tables compute the profile once and pass it on with `profile=`. The
+    quantiles of DataFrame.describe() cost far more than the counts, so
+    describe=False leaves `description` out.
+    """
+    numeric = set(_numeric_columns(data))
+    missing, negative = {}, {}
+    for col in data.columns:
+        values = data[col]
+        missing[col] = int(values.isna().sum())
+        negative[col] = int(np.count_nonzero(values.to_numpy() < 0)) if col in numeric else pd.NA
+    missing = pd.Series(missing, index=data.columns, dtype='int64')
+    columns = pd.DataFrame({
+        'dtype': data.dtypes.astype(str),
+        'non_null': len(data) - missing,
+        'missing': missing,
+        'missing_pct': missing / len(data) * 100 if len(data) else 0.0,
+        'negative': pd.Series(negative, index=data.columns, dtype='Int64'),
+    })
+    return DataProfile(len(data), int(data.memory_usage().sum()), columns, data.describe() if describe else None)
+
+@timed
+def basic_info(data, verbose=True, profile=None):
+    """Column dtypes and non-null counts of the DataFrame, printed unless verbose=False."""
+    profile = profile or profile_data(data, describe=False)
+    info = profile.columns[['dtype', 'non_null']]
+    if verbose:
+        print("Basic Information:")
+        print(f"DataFrame: {profile.rows} rows x {len(info)} columns, {profile.memory_bytes / 2 ** 20:.1f} MB")
+        print(info)
+    return info
+
+@timed
+def basic_desc(data, verbose=True, profile=None):
+    """DataFrame.describe() of the data, printed unless verbose=False."""
+    description = profile.description if profile is not None else None
+    if description is None:
+        description = data.describe()
+    if verbose:
+        print("Basic Description:")
+        print(description)
+    return description
+
+@timed
 def calculate_summary_stats(data):
-    """Calculate summary statistics for each numeric column."""
+    """Calculate summary statistics for each numeric column.
+
+    `data` can be a DataFrame or an iterable of chunks from load_data; the
+    statistics are accumulated in a single pass (see src.stats).
+    """
     print("Summary Statistics:")
-    
-    # Exclude non-numeric columns
-    numeric_data = data.select_dtypes(include='number')
-    
-    # Reset index to exclude it from summary statistics
-    numeric_data.reset_index(drop=True, inplace=True)
-    
-    # Calculate summary statistics
-    summary_stats = numeric_data.describe()
-    
-    # Calculate median
-    median = numeric_data.median()
-    
-    # Calculate standard deviation
-    std = numeric_data.std()
-    
-    # Calculate skewness
-    skew = numeric_data.skew()
-    
-    # Calculate kurtosis
-    kurtosis = numeric_data.kurt()
-    
-    # Create a list of summary statistics with descriptions
-    summary_stats_list = [
-        ('count', 'Number of non-null observations', summary_stats.loc['count']),
-        ('mean', 'Mean of the values', summary_stats.loc['mean']),
-        ('median', 'Median (50th percentile) of the values', median),
-        ('standard deviation', 'Standard deviation of the values', std),
-        ('skewness', 'Skewness of the distribution', skew),
-        ('kurtosis', 'Kurtosis of the distribution', kurtosis)
-    ]
-    
+
+    # Accumulate moments and quantile sketches over the numeric columns
+    if backends.is_lazy(data):
+        summary_stats_list = backends.summary_stats(data)
+    else:
+        summary_stats_list = stats.summarize(data).to_list()
+
     # Display the list
     for stat, description, value in summary_stats_list:
         print(f"{description}:")
         print(value)
     return summary_stats_list
  # 1. Missing Values
-def missing_values(data):
-    missing_values = data.isnull().sum()
-    print("Missing Values:")
-    print(missing_values)
+@timed
+def missing_values(data, verbose=True, profile=None):
+    """Missing values per column, printed unless verbose=False."""
+    if backends.is_lazy(data):
+        missing_values = backends.missing_values(data)
+    else:
+        missing_values = (profile or profile_data(data, describe=False)).columns['missing']
+    if verbose:
+        print("Missing Values:")
+        print(missing_values)
+    return missing_values
 # Incorrect Entries (Negative Values)
 
-def count_negative_values(data):
-    # Convert non-numeric values to NaN
-    data_numeric = data.apply(pd.to_numeric, errors='coerce')
-    # Count negative values for each attribute
-    negative_counts = (data_numeric < 0).sum()
-    print("\nCount of Negative Values in each Attribute:")
-    print(negative_counts)
-def remove_negative_rows(df, columns):
-    """Remove rows containing negative values in specified columns from a DataFrame."""
-    # Copy the original DataFrame to avoid modifying it directly
-    cleaned_df = df.copy()
-    
-    # Remove rows with negative values in specified columns
+def _numeric_columns(data):
+    """Names of the numeric (sensor) columns, skipping Timestamp and Comments."""
+    return list(data.select_dtypes(include='number').columns)
+
+@timed
+def count_negative_values(data, verbose=True, profile=None):
+    """Negative values per numeric column, printed unless verbose=False."""
+    if backends.is_lazy(data):
+        negative_counts = backends.count_negative_values(data)
+    else:
+        negative_counts = (profile or profile_data(data, describe=False)).columns['negative'].dropna().astype('int64')
+    if verbose:
+        print("\nCount of Negative Values in each Attribute:")
+        print(negative_counts)
+    return negative_counts
+
+def _keep_mask(data, columns):
+    """Boolean mask of the rows where all `columns` are non-negative (NaN counts as invalid)."""
+    keep = np.ones(len(data), dtype=bool)
     for col in columns:
-        cleaned_df = cleaned_df[cleaned_df[col] >= 0] 
-    return cleaned_df 
-def plot_time_series(cleaned_df):
+        np.logical_and(keep, data[col].to_numpy() >= 0, out=keep)
+    return keep
+
+@timed
+def remove_negative_rows(df, columns):
+    """Remove rows containing negative values in specified columns from a DataFrame.
+
+    A lazy Polars frame gets the filter added to its plan instead.
+    """
+    if backends.is_lazy(df):
+        return backends.remove_negative_rows(df, columns)
+    # Build a single mask over the columns and filter once
+    return df[_keep_mask(df, columns)]
+
+@timed
+def clean_data(data, columns=SOLAR_COLUMNS, limits=SENSOR_LIMITS):
+    """Drop rows with negative values in `columns` and report data issues in the same pass.
+
+    Returns the cleaned DataFrame and a report indexed by numeric column with
+    the number of 'negative', 'missing' and 'out_of_range' values (outside
+    `limits`) in the input.
+    """
+    keep = np.ones(len(data), dtype=bool)
+    report = {}
+    for col in _numeric_columns(data):
+        # Work on the column's NumPy array; no intermediate frames are built
+        values = data[col].to_numpy()
+        not_negative = values >= 0
+        missing = np.isnan(values) if values.dtype.kind == 'f' else np.zeros(len(values), dtype=bool)
+        low, high = limits.get(col, (-np.inf, np.inf))
+        out_of_range = (values < low) | (values > high)
+        report[col] = (np.count_nonzero(~not_negative & ~missing), np.count_nonzero(missing),
+                       np.count_nonzero(out_of_range))
+        if col in columns:
+            np.logical_and(keep, not_negative, out=keep)
+    not_numeric = [col for col in columns if col not in report]
+    if not_numeric:
+        raise KeyError(f"Columns {not_numeric} are not numeric columns of the DataFrame.")
+    report = pd.DataFrame.from_dict(report, orient='index', columns=['negative', 'missing', 'out_of_range'])
+    return data[keep], report
+
+@timed
+def plot_time_series(cleaned_df, max_points=DEFAULT_MAX_POINTS, method='minmax'):
+    """Plot time series for specified columns.
+
+    Each series is reduced to about `max_points` points with the given
+    downsampling method ('minmax', 'lttb' or None for every point, see
+    src.downsample) and drawn with plain matplotlib.
+    """
     print("Plotting time series...")
-    """Plot time series for specified columns."""
     # Check if 'Timestamp' column is present in the DataFrame
     if 'Timestamp' not in cleaned_df.columns:
         print("Error: 'Timestamp' column not found in the DataFrame.")
@@ -96,73 +370,212 @@ def plot_time_series(cleaned_df):
             print(f"Error: Column '{col}' not found in the DataFrame.")
             return
     
-    # Convert 'Timestamp' column to datetime format
-    cleaned_df['Timestamp'] = pd.to_datetime(cleaned_df['Timestamp'])
-
-    # Set 'Timestamp' column as index
-    cleaned_df.set_index('Timestamp', inplace=True)
+    # Timestamps parsed at load are used as they are; the input is not modified
+    timestamps = row_timestamps(cleaned_df)
 
     # Define colors
     colors = sns.color_palette("husl", len(columns_to_plot))
 
     # Plot time series
-    plt.figure(figsize=(12, 6))
+    fig, ax = plt.subplots(figsize=(12, 6))
     for i, col in enumerate(columns_to_plot):  # Specify columns to plot
-        sns.lineplot(data=cleaned_df, x=cleaned_df.index, y=col, label=col, color=colors[i], linewidth=2, alpha=0.8)
-    plt.xlabel('Time', fontsize=12)
-    plt.ylabel('Value', fontsize=12)
-    plt.title('Time Series Analysis for GHI, DNI, DHI', fontsize=16)
-    plt.legend(fontsize=10)
-    plt.grid(True, linestyle='--', alpha=0.5)
-    plt.xticks(fontsize=10)
-    plt.yticks(fontsize=10)
-    plt.tight_layout()
-
-
-def correlation_analysis(data):
-    print("Performing correlation analysis...")
-    """Perform correlation analysis between solar radiation and temperature variables."""
-    # Select relevant columns for correlation analysis
-    relevant_columns = ['GHI', 'DNI', 'DHI']  # Remove 'TModA' and 'TModB'
+        plot_series(ax, timestamps, cleaned_df[col], max_points, method,
+                    label=col, color=colors[i], linewidth=2, alpha=0.8)
+    ax.set_xlabel('Time', fontsize=12)
+    ax.set_ylabel('Value', fontsize=12)
+    ax.set_title('Time Series Analysis for GHI, DNI, DHI', fontsize=16)
+    ax.legend(fontsize=10)
+    ax.grid(True, linestyle='--', alpha=0.5)
+    ax.tick_params(labelsize=10)
+    fig.tight_layout()
+    return fig
 
-    # Check if all relevant columns exist in the DataFrame
-    missing_columns = [col for col in relevant_columns if col not in data.columns]
-    if missing_columns:
-        print(f"Error: Columns {missing_columns} not found in the DataFrame.")
-        return
 
-    relevant_data = data[relevant_columns]
+def row_timestamps(data):
+    """Timestamps of the rows, from the 'Timestamp' column or a 'Timestamp' index.
+
+    Already parsed timestamps are wrapped without conversion; text is parsed
+    with parse_timestamps. `data` is not modified.
+    """
+    if TIMESTAMP_COLUMN in data.columns:
+        return pd.DatetimeIndex(parse_timestamps(data[TIMESTAMP_COLUMN]))
+    return pd.DatetimeIndex(parse_timestamps(data.index))
+
+
+def _sample_hours(timestamps):
+    """Typical sampling interval in hours (1 minute if it cannot be inferred)."""
+    steps = np.diff(timestamps.to_numpy()).astype('timedelta64[ns]').astype(np.int64)
+    steps = steps[steps > 0]
+    if len(steps) == 0:
+        return 1 / 60
+    return float(np.median(steps)) / 3.6e12
+
+
+@timed
+def resample_data(data, freq='daily', columns=None):
+    """Aggregate the data to hourly, daily or monthly buckets.
+
+    `freq` is 'hourly', 'daily', 'monthly' or any pandas offset alias. Returns a
+    DataFrame indexed by bucket start with (column, stat) columns for stat in
+    'mean', 'max', 'sum' and 'count', plus 'energy' (Wh/m², sum times the
+    sampling interval) for the irradiance columns. A lazy Polars frame is
+    aggregated by a grouped query with the same result layout; it accepts
+    the named frequencies and multiples of second, minute, hour, day,
+    month-start, quarter-start and year-start aliases.
+    """
+    if backends.is_lazy(data):
+        return backends.resample_data(data, freq, columns)
+    rule = FREQUENCIES.get(freq, freq)
+    columns = [col for col in (columns or AGGREGATE_COLUMNS) if col in data.columns]
+    timestamps = row_timestamps(data)
+    frame = pd.DataFrame(data[columns].to_numpy(dtype=np.float64), index=timestamps, columns=columns)
+    grouped = frame.resample(rule)
+    sums = grouped.sum()
+    counts = grouped.count()
+    tables = {'mean': sums / counts.where(counts > 0), 'max': grouped.max(), 'sum': sums, 'count': counts}
+    energy_columns = [col for col in columns if col in SOLAR_COLUMNS]
+    if energy_columns:
+        tables['energy'] = sums[energy_columns] * _sample_hours(timestamps)
+    aggregates = pd.concat(tables, axis=1).swaplevel(axis=1)
+    return aggregates[[(col, stat) for col in columns for stat in tables if (col, stat) in aggregates.columns]]
+
+
+_aggregate_cache = OrderedDict()
+
+
+@timed
+def station_aggregates(data, station, freq='daily', columns=None, version=None):
+    """resample_data, memoized per station, frequency, columns and data version.
+
+    `version` is any hashable value the caller changes whenever the station's
+    data changes (e.g. the file's mtime). Without it, the key holds a hash of
+    the timestamps and aggregated columns, so a modified frame is recomputed;
+    hashing costs a fair part of the aggregation itself, so callers that can
+    pass a version should. The least recently used entries are evicted beyond
+    AGGREGATE_CACHE_SIZE.
+    """
+    if version is None:
+        used = [col for col in [TIMESTAMP_COLUMN] + list(columns or AGGREGATE_COLUMNS) if col in data.columns]
+        hashes = pd.util.hash_pandas_object(data[used], index=TIMESTAMP_COLUMN not in data.columns)
+        version = hashlib.sha1(hashes.to_numpy().tobytes()).hexdigest()
+    key = (station, FREQUENCIES.get(freq, freq), tuple(columns) if columns else None, version)
+    if key in _aggregate_cache:
+        _aggregate_cache.move_to_end(key)
+        return _aggregate_cache[key]
+    aggregates = resample_data(data, freq, columns)
+    _aggregate_cache[key] = aggregates
+    while len(_aggregate_cache) > AGGREGATE_CACHE_SIZE:
+        _aggregate_cache.popitem(last=False)
+    return aggregates
+
+
+def clear_aggregate_cache():
+    """Forget all memoized station aggregates."""
+    _aggregate_cache.clear()
+
+
+def aggregate_values(aggregates, stat='mean'):
+    """One statistic of a resample_data table as a flat DataFrame (one column per sensor)."""
+    return aggregates.xs(stat, axis=1, level=1)
+
+
+@timed
+def plot_resampled(data, freq='daily', stat='mean', columns=None, station=None):
+    """Plot an hourly, daily or monthly aggregate of the solar columns.
+
+    With a `station` name the aggregates are memoized (see station_aggregates).
+    """
+    print("Plotting resampled time series...")
+    columns = columns or SOLAR_COLUMNS
+    if station is None:
+        aggregates = resample_data(data, freq, columns)
+    else:
+        aggregates = station_aggregates(data, station, freq, columns)
+    values = aggregate_values(aggregates, stat)
+
+    colors = sns.color_palette("husl", len(values.columns))
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for i, col in enumerate(values.columns):
+        ax.plot(values.index, values[col], label=col, color=colors[i], linewidth=2, alpha=0.8)
+    ax.set_xlabel('Time', fontsize=12)
+    ax.set_ylabel(stat.capitalize(), fontsize=12)
+    ax.set_title(f"{freq.capitalize()} {stat} of {', '.join(values.columns)}", fontsize=16)
+    ax.legend(fontsize=10)
+    ax.grid(True, linestyle='--', alpha=0.5)
+    fig.tight_layout()
+    return fig
+
+
+@timed
+def correlation_analysis(data, columns=SOLAR_COLUMNS):
+    """Perform correlation analysis between solar radiation and temperature variables.
+
+    `data` can be a DataFrame, an iterable of chunks or a lazy Polars frame;
+    the matrix is built from streamed sums and cross-products (see
+    src.correlation) or one Polars query, so any
+    column set works, and columns=None uses every numeric column. The heatmap
+    is drawn from the small matrix, which is returned.
+    """
+    print("Performing correlation analysis...")
+    # Check if all relevant columns exist in the DataFrame
+    if isinstance(data, pd.DataFrame) and columns is not None:
+        missing_columns = [col for col in columns if col not in data.columns]
+        if missing_columns:
+            print(f"Error: Columns {missing_columns} not found in the DataFrame.")
+            return
 
     # Calculate correlation matrix
-    correlation_matrix = relevant_data.corr()
+    if backends.is_lazy(data):
+        correlation_matrix = backends.correlation_matrix(data, columns)
+    else:
+        correlation_matrix = correlation.correlation_matrix(data, columns)
 
     # Plot heatmap
     plt.figure(figsize=(10, 8))
-    sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', fmt=".2f", linewidths=0.5)
-    plt.title('Correlation Heatmap for GHI, DNI, DHI')
+    correlation.plot_correlation_heatmap(
+        correlation_matrix, f"Correlation Heatmap for {', '.join(correlation_matrix.columns)}", ax=plt.gca())
+    return correlation_matrix
+
+
+def draw_boxplots(ax, summaries):
+    """Draw precomputed boxplot statistics (stats.boxplot_summaries) on an axis."""
+    boxes = ax.bxp(summaries, patch_artist=True, flierprops={'marker': 'o', 'markersize': 3, 'alpha': 0.5})
+    for patch, color in zip(boxes['boxes'], sns.color_palette(n_colors=len(summaries))):
+        patch.set_facecolor(color)
+    return ax
 
 
+@timed
+def plot_boxplot_outliers(data, max_outliers=stats.MAX_OUTLIERS):
+    """Plot boxplot with outliers for solar radiation and temperature data.
 
-def plot_boxplot_outliers(data):
+    The box statistics come from one partition pass per column (or a quantile
+    sketch for chunked data) and only up to `max_outliers` representative
+    outliers per column are drawn. Returns the statistics as a table.
+    """
     print("Plotting boxplot with outliers for solar radiation and temperature data...")
-    """Plot boxplot with outliers for solar radiation and temperature data."""
     # Select relevant columns
     solar_columns = ['GHI', 'DNI', 'DHI']
     temp_columns = ['Tamb', 'TModA', 'TModB']
-    
+    solar = stats.boxplot_summaries(data, solar_columns, max_outliers=max_outliers)
+    temp = stats.boxplot_summaries(data, temp_columns, max_outliers=max_outliers)
+
     # Create subplots for solar radiation and temperature
     fig, axes = plt.subplots(nrows=2, ncols=1, figsize=(10, 8))
     
     # Plot box plots for solar radiation
-    sns.boxplot(data=data[solar_columns], ax=axes[0])
+    draw_boxplots(axes[0], solar)
     axes[0].set_title('Solar Radiation (W/m²)')
     axes[0].set_ylabel('Radiation (W/m²)')
     
     # Plot box plots for temperature
-    sns.boxplot(data=data[temp_columns], ax=axes[1])
+    draw_boxplots(axes[1], temp)
     axes[1].set_title('Temperature (°C)')
     axes[1].set_ylabel('Temperature (°C)')
     
     # Adjust layout
-    plt.tight_layout()
+    fig.tight_layout()
+    table = pd.DataFrame(solar + temp).set_index('label').drop(columns='fliers')
+    table.index.name = None
+    return table.rename(columns={'med': 'median'})
 
@@ -0,0 +1,131 @@
+import contextlib
+import io
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+import matplotlib.pyplot as plt
+import pandas as pd
+from src import data_cache, profiling
+
+# File formats figures can be exported to
+FORMATS = ('png', 'svg')
+# Resolution of raster exports
+DPI = 100
+
+# Base name of the file the station data is handed to the workers in
+SHARED_NAME = 'station'
+
+# Data of the share_data file a worker read last, as (path, data)
+_shared = (None, None)
+
+
+def use_headless_backend():
+    """Switch matplotlib to the non-interactive Agg backend."""
+    matplotlib.use('Agg')
+
+
+def new_figures(plot, *args, **kwargs):
+    """Call a plot function and return (its result, the figures it opened)."""
+    before = set(plt.get_fignums())
+    result = plot(*args, **kwargs)
+    return result, [plt.figure(number) for number in plt.get_fignums() if number not in before]
+
+
+def save_figure(fig, path, formats=('png',)):
+    """Save a figure as <path>.<format> for each format, close it and return the file paths."""
+    paths = []
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported figure format '{fmt}'. Use one of {FORMATS}.")
+        paths.append(f"{path}.{fmt}")
+        fig.savefig(paths[-1], format=fmt, dpi=DPI)
+    plt.close(fig)
+    return paths
+
+
+def export_plot(plot, data, output_dir, formats=('png',)):
+    """Render one plot function and save its figures as <output_dir>/<name>[_i].<format>.
+
+    Every figure is closed once written, so at most one plot's figures are
+    in memory at a time.
+    """
+    _, figures = new_figures(plot, data)
+    paths = []
+    for i, fig in enumerate(figures, 1):
+        suffix = f"_{i}" if len(figures) > 1 else ""
+        paths += save_figure(fig, os.path.join(output_dir, f"{plot.__name__}{suffix}"), formats)
+    return paths
+
+
+def share_data(data, directory):
+    """Write a DataFrame once for the worker processes and return the file path.
+
+    It is an Arrow file when pyarrow is installed, which every worker reads
+    through a memory map, else a pickle.
+    """
+    if data_cache.is_available():
+        path = os.path.join(directory, SHARED_NAME + data_cache.CACHE_SUFFIX)
+        if data_cache.write_cache(path, [data]):
+            return path
+    path = os.path.join(directory, SHARED_NAME + '.pkl')
+    data.to_pickle(path)
+    return path
+
+
+def shared_data(path):
+    """The DataFrame written by share_data, read once per worker."""
+    global _shared
+    if _shared[0] != path:
+        if path.endswith(data_cache.CACHE_SUFFIX):
+            data = data_cache.read_cache(path)
+        else:
+            data = pd.read_pickle(path)
+        _shared = (path, data)
+    # Plot functions never modify their input, so every plot shares the same frame
+    return _shared[1]
+
+
+def _render(data, plot, output_dir, formats, profile_options=None):
+    """Worker task: render one plot of a station, given its data or a share_data file.
+
+    Returns (file paths, printed output, profiler) where the profiler is set
+    when `profile_options` (memory, cprofile_stage) are given.
+    """
+    output = io.StringIO()
+    profiler = profiling.profile(*profile_options) if profile_options else contextlib.nullcontext()
+    with contextlib.redirect_stdout(output), profiler as profiler:
+        if isinstance(data, str):
+            data = shared_data(data)
+        paths = export_plot(plot, data, output_dir, formats)
+    return paths, output.getvalue(), profiler
+
+
+def export_plots(data, plots, output_dir, formats=('png',), workers=None):
+    """Render the plot functions for a station's cleaned data headless, in a pool of worker processes.
+
+    The data is written once to a temporary file (see share_data) that each
+    worker reads once, and each worker keeps only one plot's figures open.
+    With workers=1 the plots are rendered in this process. The printed output
+    of the plots is echoed in plot order, and under an active profiler the
+    workers' stages are added to it. Returns the written file paths.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    active = profiling.active()
+    if workers == 1:
+        use_headless_backend()
+        results = [_render(data, plot, output_dir, tuple(formats)) for plot in plots]
+    else:
+        options = (active.memory, active.cprofile_stage) if active is not None else None
+        with tempfile.TemporaryDirectory(prefix='eda-') as directory, \
+                ProcessPoolExecutor(max_workers=workers, initializer=use_headless_backend) as executor:
+            path = share_data(data, directory)
+            results = list(executor.map(_render, [path] * len(plots), plots, [output_dir] * len(plots),
+                                        [tuple(formats)] * len(plots), [options] * len(plots)))
+    paths = []
+    for plot_paths, output, profiler in results:
+        print(output, end='')
+        paths += plot_paths
+        if profiler is not None:
+            active.extend(profiler)
+    return paths
@@ -0,0 +1,158 @@
+import contextlib
+import contextvars
+import cProfile
+import functools
+import io
+import json
+import pstats
+import time
+import tracemalloc
+import pandas as pd
+
+# Profiler that stage() and @timed report to; None when profiling is off
+_active = contextvars.ContextVar('profiler', default=None)
+# Functions listed in a cProfile report
+CPROFILE_LINES = 30
+
+
+class Profiler:
+    """Wall time, CPU time, peak memory and row count of each profiled stage.
+
+    Stages may nest; each record keeps its depth, and the peak memory of a
+    stage includes the peaks of the stages inside it. Memory is traced with
+    tracemalloc, which slows Python-heavy code down, so memory=False turns
+    it off. With `cprofile_stage`, the first stage of that name is also run
+    under cProfile and its report kept in `cprofile_output`.
+    """
+
+    def __init__(self, memory=True, cprofile_stage=None):
+        self.memory = memory
+        self.cprofile_stage = cprofile_stage
+        self.cprofile_output = None
+        self.records = []
+        self._stack = []
+
+    @contextlib.contextmanager
+    def stage(self, name, rows=None):
+        """Record the enclosed block as a stage."""
+        record = {'stage': name, 'depth': len(self._stack), 'rows': rows}
+        self.records.append(record)
+        frame = {'peak': 0, 'start_memory': 0}
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            frame['start_memory'] = current
+            tracemalloc.reset_peak()
+        self._stack.append(frame)
+        profile = None
+        if name == self.cprofile_stage and self.cprofile_output is None:
+            profile = cProfile.Profile()
+            profile.enable()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_s'] = time.perf_counter() - wall
+            record['cpu_s'] = time.process_time() - cpu
+            if profile is not None:
+                profile.disable()
+                output = io.StringIO()
+                pstats.Stats(profile, stream=output).sort_stats('cumulative').print_stats(CPROFILE_LINES)
+                self.cprofile_output = output.getvalue()
+            self._stack.pop()
+            if self.memory and tracemalloc.is_tracing():
+                peak = max(tracemalloc.get_traced_memory()[1], frame['peak'])
+                record['peak_mb'] = (peak - frame['start_memory']) / 2 ** 20
+                if self._stack:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+
+    def extend(self, other):
+        """Add the records of another profiler (e.g. from a worker process) under the current stage."""
+        for record in other.records:
+            self.records.append({**record, 'depth': record['depth'] + len(self._stack)})
+        if self.cprofile_output is None:
+            self.cprofile_output = other.cprofile_output
+
+    def report(self):
+        """Records as a DataFrame, with stage names indented by depth."""
+        table = pd.DataFrame(self.records, columns=['stage', 'depth', 'rows', 'wall_s', 'cpu_s', 'peak_mb'])
+        table['stage'] = ['  ' * depth + stage for stage, depth in zip(table['stage'], table['depth'])]
+        table['rows'] = table['rows'].astype('Int64')
+        return table.drop(columns='depth')
+
+    def to_json(self, path):
+        """Write the records (and any cProfile report) as JSON."""
+        with open(path, 'w') as file:
+            json.dump({'stages': self.records, 'cprofile': self.cprofile_output}, file, indent=2)
+
+    @classmethod
+    def from_json(cls, path):
+        """Read a profiler written by to_json."""
+        with open(path) as file:
+            saved = json.load(file)
+        profiler = cls()
+        profiler.records, profiler.cprofile_output = saved['stages'], saved['cprofile']
+        return profiler
+
+    def print_report(self):
+        """Print the records as a console table."""
+        print(self.report().to_string(index=False, na_rep='', float_format='{:.3f}'.format))
+
+
+@contextlib.contextmanager
+def profile(memory=True, cprofile_stage=None):
+    """Profile every stage() and @timed call in the enclosed block; yields the Profiler."""
+    profiler = Profiler(memory, cprofile_stage)
+    token = _active.set(profiler)
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield profiler
+    finally:
+        if started:
+            tracemalloc.stop()
+        _active.reset(token)
+
+
+def active():
+    """The Profiler of the enclosing profile() block, or None."""
+    return _active.get()
+
+
+@contextlib.contextmanager
+def stage(name, rows=None):
+    """Record the enclosed block as a stage of the active profiler, if any."""
+    profiler = _active.get()
+    if profiler is None:
+        yield None
+        return
+    with profiler.stage(name, rows) as record:
+        yield record
+
+
+def _rows(args, result):
+    """Row count of the first DataFrame argument, else of a DataFrame result."""
+    for value in args:
+        if isinstance(value, pd.DataFrame):
+            return len(value)
+    return len(result) if isinstance(result, pd.DataFrame) else None
+
+
+def timed(function):
+    """Decorator recording each call of `function` as a stage of the active profiler.
+
+    Costs one context-variable lookup per call when profiling is off.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        profiler = _active.get()
+        if profiler is None:
+            return function(*args, **kwargs)
+        with profiler.stage(function.__name__, _rows(args, None)) as record:
+            result = function(*args, **kwargs)
+            if record['rows'] is None:
+                record['rows'] = _rows((), result)
+            return result
+    return wrapper
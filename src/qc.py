@@ -0,0 +1,232 @@
+import enum
+import numpy as np
+import pandas as pd
+from src.eda_utils import DEFAULT_CHUNKSIZE, SENSOR_LIMITS, SOLAR_COLUMNS
+
+
+class Flag(enum.IntFlag):
+    """Quality-control rules; a row's flags are the OR of the rules it fails."""
+    RANGE = 1           # a value outside its physical limits
+    CLOSURE = 2         # GHI disagrees with DNI * cos(zenith) + DHI
+    STUCK = 4           # a sensor repeated the same value for too long
+    SPIKE = 8           # an implausible change from the previous reading
+    NIGHT = 16          # irradiance while the sun is below the horizon
+    CLEANING = 32       # a panel cleaning event
+    MODULE_JUMP = 64    # ModA/ModB jumped while GHI did not, outside a cleaning event
+
+
+# Lowest physically possible irradiance (W/m²); sensors read slightly negative at night
+IRRADIANCE_MIN = -4
+# Limits of the RANGE rule: the cleaning limits, except that small negative night-time
+# offsets of the irradiance sensors are not errors
+QC_LIMITS = {**SENSOR_LIMITS, **{col: (IRRADIANCE_MIN, SENSOR_LIMITS[col][1])
+                                 for col in ('GHI', 'DNI', 'DHI', 'ModA', 'ModB')}}
+# Consecutive identical readings (1 minute apart) after which a sensor counts as stuck
+STUCK_ROWS = 60
+# Columns checked for stuck values; zero and negative readings (night, calm) are not checked
+STUCK_COLUMNS = ['GHI', 'DNI', 'DHI', 'ModA', 'ModB', 'Tamb', 'RH', 'WS', 'TModA', 'TModB']
+# Largest plausible change between consecutive readings
+SPIKE_STEPS = {
+    'GHI': 800, 'DNI': 900, 'DHI': 500, 'ModA': 800, 'ModB': 800,
+    'Tamb': 5, 'RH': 20, 'BP': 5, 'WS': 20, 'TModA': 10, 'TModB': 10,
+}
+# Closure test: compared only above this GHI, with these ratio tolerances below/above 75 degrees zenith
+CLOSURE_MIN_GHI = 50
+CLOSURE_TOLERANCES = ((75, 0.08), (93, 0.15))
+# Irradiance above this is flagged at night (zenith >= 90 degrees)
+NIGHT_THRESHOLD = 10
+# Module irradiance change counted as a jump when GHI changes by less than half of it
+MODULE_JUMP_STEP = 200
+
+
+class QualityControl:
+    """Vectorized QC rules evaluated over a station, one chunk at a time.
+
+    `update` returns a compact uint8 flag array for the rows of a chunk (see
+    Flag) instead of a filtered copy, and keeps the last reading and run
+    lengths of every column, so stuck runs and spikes spanning chunk
+    boundaries are flagged as if the file were read in one piece (the rows
+    of a stuck run in earlier chunks are flagged by `fill_stuck`). The
+    zenith-based rules (CLOSURE, NIGHT) run only when a solar zenith angle in
+    degrees is given per row. Counts of flagged rows per rule, and per column
+    for the column rules, are accumulated in `row_counts` and `column_counts`.
+    """
+
+    def __init__(self, limits=QC_LIMITS, stuck_rows=STUCK_ROWS, spike_steps=SPIKE_STEPS):
+        self.limits = limits
+        self.stuck_rows = stuck_rows
+        self.spike_steps = spike_steps
+        self.rows = 0
+        self.row_counts = pd.Series(0, index=[flag.name for flag in Flag], dtype='int64')
+        self.column_counts = {}
+        self._last = {}
+        self._run = {}
+        self._start = {}
+        self._pending = []
+
+    def _count(self, flag, col, mask):
+        counts = self.column_counts.setdefault(flag.name, {})
+        counts[col] = counts.get(col, 0) + int(np.count_nonzero(mask))
+
+    def _previous(self, col, values):
+        """Each reading's predecessor, continuing from the last reading of the previous chunk."""
+        previous = np.empty_like(values)
+        previous[0] = self._last.get(col, np.nan)
+        previous[1:] = values[:-1]
+        return previous
+
+    def _stuck(self, col, values, previous):
+        """Rows in runs of at least `stuck_rows` identical positive readings.
+
+        A run carried over from the previous chunk that reaches `stuck_rows`
+        in this one has its earlier rows queued for fill_stuck.
+        """
+        same = (values == previous) & (values > 0)
+        # Repeats in a row up to each reading, carried over from the previous chunk
+        index = np.arange(len(values))
+        run = index - np.maximum.accumulate(np.where(same, 0, index))
+        first_break = np.argmin(same) if not same.all() else len(values)
+        run[:first_break] = index[:first_break] + 1 + self._run.get(col, 0)
+        # Every run is flagged whole once its length (repeats + 1) reaches the threshold
+        starts = np.flatnonzero(~same)
+        if same[0]:
+            starts = np.r_[0, starts]
+        lengths = run[np.r_[starts[1:], len(values)] - 1] + 1
+        stuck = lengths >= self.stuck_rows
+        if same[0] and stuck[0] and self._run[col] + 1 < self.stuck_rows:
+            self._pending.append((self._start[col], self.rows))
+            counts = self.column_counts.setdefault(Flag.STUCK.name, {})
+            counts[col] = counts.get(col, 0) + self.rows - self._start[col]
+        # First row of the last run, the next chunk may continue it
+        if not (same[0] and len(starts) == 1):
+            self._start[col] = self.rows + int(starts[-1])
+        self._run[col] = int(run[-1])
+        return np.repeat(stuck, np.diff(np.r_[starts, len(values)]))
+
+    def fill_stuck(self, flags):
+        """Flag the rows of earlier chunks that belong to stuck runs found since.
+
+        `flags` holds the flags of every row evaluated so far; it is updated
+        in place and returned.
+        """
+        for start, stop in self._pending:
+            mask = (flags[start:stop] & Flag.STUCK) == 0
+            self.row_counts[Flag.STUCK.name] += int(np.count_nonzero(mask))
+            flags[start:stop] |= np.uint8(Flag.STUCK)
+        self._pending = []
+        return flags
+
+    def update(self, data, zenith=None):
+        """Evaluate the rules on a chunk and return its flags.
+
+        `zenith` is an array of solar zenith angles aligned with the rows, or
+        None to use a 'zenith' column of the chunk if there is one.
+        """
+        flags = np.zeros(len(data), dtype=np.uint8)
+        if len(data) == 0:
+            return flags
+        columns = {col: data[col].to_numpy(dtype=np.float64) for col in data.columns
+                   if col in self.limits or col in self.spike_steps or col == 'Cleaning'}
+        steps = {}
+        for col, values in columns.items():
+            previous = self._previous(col, values)
+            with np.errstate(invalid='ignore'):
+                steps[col] = np.abs(values - previous)
+                if col in self.limits:
+                    low, high = self.limits[col]
+                    mask = (values < low) | (values > high)
+                    flags[mask] |= np.uint8(Flag.RANGE)
+                    self._count(Flag.RANGE, col, mask)
+                if col in STUCK_COLUMNS:
+                    mask = self._stuck(col, values, previous)
+                    flags[mask] |= np.uint8(Flag.STUCK)
+                    self._count(Flag.STUCK, col, mask)
+                if col in self.spike_steps:
+                    mask = steps[col] > self.spike_steps[col]
+                    flags[mask] |= np.uint8(Flag.SPIKE)
+                    self._count(Flag.SPIKE, col, mask)
+            # A trailing NaN is kept too, so the next chunk's first step is NaN as in one pass
+            self._last[col] = values[-1]
+
+        if zenith is None and 'zenith' in data.columns:
+            zenith = data['zenith']
+        if zenith is not None:
+            flags |= self._zenith_flags(columns, np.asarray(zenith, dtype=np.float64))
+
+        if 'Cleaning' in columns:
+            cleaning = columns['Cleaning'] > 0
+            flags[cleaning] |= np.uint8(Flag.CLEANING)
+            if 'GHI' in steps:
+                for col in ('ModA', 'ModB'):
+                    if col in steps:
+                        with np.errstate(invalid='ignore'):
+                            mask = (steps[col] > MODULE_JUMP_STEP) & (steps['GHI'] < MODULE_JUMP_STEP / 2) & ~cleaning
+                        flags[mask] |= np.uint8(Flag.MODULE_JUMP)
+                        self._count(Flag.MODULE_JUMP, col, mask)
+
+        self.rows += len(flags)
+        for flag in Flag:
+            self.row_counts[flag.name] += int(np.count_nonzero(flags & flag))
+        return flags
+
+    def _zenith_flags(self, columns, zenith):
+        """CLOSURE and NIGHT flags from the solar zenith angle in degrees."""
+        flags = np.zeros(len(zenith), dtype=np.uint8)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if all(col in columns for col in SOLAR_COLUMNS):
+                ghi, dni, dhi = (columns[col] for col in SOLAR_COLUMNS)
+                expected = dni * np.cos(np.radians(zenith)) + dhi
+                error = np.abs(ghi / expected - 1)
+                tolerance = np.select([zenith < limit for limit, _ in CLOSURE_TOLERANCES],
+                                      [tol for _, tol in CLOSURE_TOLERANCES], np.inf)
+                mask = (expected > CLOSURE_MIN_GHI) & (error > tolerance)
+                flags[mask] |= np.uint8(Flag.CLOSURE)
+            night = zenith >= 90
+            for col in SOLAR_COLUMNS:
+                if col in columns:
+                    mask = night & (columns[col] > NIGHT_THRESHOLD)
+                    flags[mask] |= np.uint8(Flag.NIGHT)
+                    self._count(Flag.NIGHT, col, mask)
+        return flags
+
+    def report(self):
+        """Flagged rows per rule, with the counts per column for the column rules."""
+        table = pd.DataFrame(self.column_counts).T.reindex(self.row_counts.index).fillna(0).astype('int64')
+        table.insert(0, 'rows', self.row_counts)
+        table.insert(1, 'pct', self.row_counts / max(self.rows, 1) * 100)
+        return table
+
+
+def _chunks(data, chunksize):
+    if isinstance(data, pd.DataFrame):
+        return (data.iloc[start:start + chunksize] for start in range(0, len(data), chunksize))
+    return data
+
+
+def quality_flags(data, zenith=None, chunksize=DEFAULT_CHUNKSIZE, **options):
+    """QC flags of every row of a DataFrame or an iterable of chunks.
+
+    Returns (flags, QualityControl): a uint8 array with one bitfield per row
+    and the engine holding the counts. `zenith` (degrees, aligned with the
+    rows of a DataFrame) enables the CLOSURE and NIGHT rules; `options` are
+    passed on to QualityControl.
+    """
+    engine = QualityControl(**options)
+    parts = []
+    offset = 0
+    for chunk in _chunks(data, chunksize):
+        chunk_zenith = None if zenith is None else np.asarray(zenith)[offset:offset + len(chunk)]
+        parts.append(engine.update(chunk, chunk_zenith))
+        offset += len(chunk)
+    flags = np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint8)
+    return engine.fill_stuck(flags), engine
+
+
+def keep_mask(flags, exclude=Flag.RANGE | Flag.STUCK | Flag.SPIKE | Flag.NIGHT):
+    """Rows that pass every rule in `exclude`, for boolean indexing."""
+    return (np.asarray(flags) & exclude) == 0
+
+
+def flag_names(value):
+    """Names of the rules set in one flag value, e.g. 'RANGE|SPIKE'."""
+    return '|'.join(flag.name for flag in Flag if value & flag) or 'OK'
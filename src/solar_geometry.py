@@ -0,0 +1,117 @@
+import os
+import numpy as np
+import pandas as pd
+from src.data_cache import CACHE_DIR_ENV, CACHE_DIR_NAME
+
+# Approximate station coordinates; timestamps are local standard time (UTC + utc_offset hours)
+STATIONS = {
+    'benin-malanville': {'latitude': 11.87, 'longitude': 3.39, 'utc_offset': 1},
+    'togo-dapaong': {'latitude': 10.86, 'longitude': 0.21, 'utc_offset': 0},
+    'sierraleone-bumbuna': {'latitude': 9.05, 'longitude': -11.74, 'utc_offset': 0},
+}
+# Zenith angle (degrees) above which the sun counts as down
+NIGHT_ZENITH = 90
+# Bump when the algorithm changes, to invalidate cached grids
+GEOMETRY_VERSION = 1
+
+
+def find_station(name):
+    """STATIONS key of a station or file name (e.g. 'togo-dapaong_qc'), or None."""
+    for station in STATIONS:
+        if name == station or name.startswith(station):
+            return station
+    return None
+
+
+def solar_position(timestamps, latitude, longitude, utc_offset=0):
+    """Solar zenith and azimuth angles (degrees) at local timestamps.
+
+    Vectorized NOAA solar-position equations (geometric, without refraction),
+    accurate to well under a degree. Returns (zenith, azimuth) float64 arrays;
+    NaT timestamps give NaN.
+    """
+    times = pd.DatetimeIndex(timestamps)
+    minutes = (times.as_unit('s').asi8 / 60.0) - utc_offset * 60
+    minutes[times.isna()] = np.nan
+    century = (minutes / 1440 + 2440587.5 - 2451545) / 36525
+    mean_long = np.radians((280.46646 + century * (36000.76983 + century * 0.0003032)) % 360)
+    mean_anom = np.radians(357.52911 + century * (35999.05029 - 0.0001537 * century))
+    eccentricity = 0.016708634 - century * (0.000042037 + 0.0000001267 * century)
+    center = (np.sin(mean_anom) * (1.914602 - century * (0.004817 + 0.000014 * century))
+              + np.sin(2 * mean_anom) * (0.019993 - 0.000101 * century)
+              + np.sin(3 * mean_anom) * 0.000289)
+    omega = np.radians(125.04 - 1934.136 * century)
+    apparent_long = np.radians(np.degrees(mean_long) + center - 0.00569 - 0.00478 * np.sin(omega))
+    obliquity = np.radians(23 + (26 + (21.448 - century * (46.815 + century * (0.00059 - century * 0.001813))) / 60) / 60
+                           + 0.00256 * np.cos(omega))
+    declination = np.arcsin(np.sin(obliquity) * np.sin(apparent_long))
+    y = np.tan(obliquity / 2) ** 2
+    equation_of_time = 4 * np.degrees(
+        y * np.sin(2 * mean_long) - 2 * eccentricity * np.sin(mean_anom)
+        + 4 * eccentricity * y * np.sin(mean_anom) * np.cos(2 * mean_long)
+        - 0.5 * y * y * np.sin(4 * mean_long) - 1.25 * eccentricity ** 2 * np.sin(2 * mean_anom))
+    true_solar_time = (minutes % 1440 + equation_of_time + 4 * longitude) % 1440
+    hour_angle = np.radians(true_solar_time / 4 - 180)
+    lat = np.radians(latitude)
+    cos_zenith = np.sin(lat) * np.sin(declination) + np.cos(lat) * np.cos(declination) * np.cos(hour_angle)
+    zenith = np.arccos(np.clip(cos_zenith, -1, 1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cos_azimuth = (np.sin(lat) * np.cos(zenith) - np.sin(declination)) / (np.cos(lat) * np.sin(zenith))
+    azimuth = np.degrees(np.arccos(np.clip(cos_azimuth, -1, 1)))
+    azimuth = np.where(hour_angle > 0, (azimuth + 180) % 360, (540 - azimuth) % 360)
+    return np.degrees(zenith), azimuth
+
+
+def _cache_dir(cache_dir=None):
+    """Folder of the year grids under `cache_dir`, else under $EDA_CACHE_DIR or ./.eda_cache."""
+    return os.path.join(cache_dir or os.environ.get(CACHE_DIR_ENV) or CACHE_DIR_NAME, 'solar')
+
+
+def year_grid(station, year, cache_dir=None):
+    """Zenith and azimuth of every minute of a station's (local) year, as a (2, minutes) float32 array.
+
+    The grid is computed once and cached on disk, then memory-mapped.
+    """
+    site = STATIONS[station]
+    key = f"{site['latitude']}_{site['longitude']}_{site['utc_offset']}_v{GEOMETRY_VERSION}"
+    path = os.path.join(_cache_dir(cache_dir), f"{station}-{year}-{key}.npy")
+    if os.path.exists(path):
+        return np.load(path, mmap_mode='r')
+    minutes = pd.date_range(f'{year}-01-01', f'{year + 1}-01-01', freq='min', inclusive='left')
+    grid = np.vstack(solar_position(minutes, **site)).astype(np.float32)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(temp_path, grid)
+    os.replace(temp_path, path)
+    return grid
+
+
+def station_position(timestamps, station, cache_dir=None):
+    """Zenith and azimuth (degrees) of a station at each local timestamp, from the cached year grids.
+
+    Timestamps are floored to the minute. Returns two float32 arrays aligned
+    with `timestamps`. Pass data_cache.default_cache_dir(file_path) as
+    `cache_dir` to keep the grids next to the station file.
+    """
+    times = pd.DatetimeIndex(timestamps)
+    zenith = np.full(len(times), np.nan, dtype=np.float32)
+    azimuth = np.full(len(times), np.nan, dtype=np.float32)
+    years = times.year
+    for year in np.unique(years[~times.isna()]):
+        rows = np.flatnonzero(years == year)
+        grid = year_grid(station, int(year), cache_dir)
+        minute = (times[rows] - pd.Timestamp(int(year), 1, 1)) // pd.Timedelta(minutes=1)
+        zenith[rows] = grid[0][minute]
+        azimuth[rows] = grid[1][minute]
+    return zenith, azimuth
+
+
+def daytime_mask(timestamps, station, max_zenith=NIGHT_ZENITH, cache_dir=None):
+    """True where the sun is above the horizon (zenith below `max_zenith`)."""
+    zenith, _ = station_position(timestamps, station, cache_dir)
+    return zenith < max_zenith
+
+
+def daytime(data, station, max_zenith=NIGHT_ZENITH, cache_dir=None):
+    """Rows of `data` taken while the sun was up, by their 'Timestamp' column."""
+    return data[daytime_mask(data['Timestamp'], station, max_zenith, cache_dir)]
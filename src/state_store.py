@@ -0,0 +1,145 @@
+import argparse
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from src import eda_utils, stats
+
+# Default directory of the per-station state files
+DEFAULT_STORE_DIR = 'state'
+# Frequencies of the aggregates kept up to date in each state
+STATE_FREQUENCIES = ('hourly', 'daily', 'monthly')
+
+
+def _combine_aggregates(old, new):
+    """Merge two resample_data tables of the same frequency bucket by bucket."""
+    if old is None:
+        return new
+    index = old.index.union(new.index)
+    old = old.reindex(index=index)
+    new = new.reindex(index=index, columns=old.columns)
+    combined = old.copy()
+    stats_of = old.columns.get_level_values(1)
+    for stat in ('sum', 'count', 'energy'):
+        columns = old.columns[stats_of == stat]
+        combined[columns] = old[columns].fillna(0) + new[columns].fillna(0)
+    columns = old.columns[stats_of == 'max']
+    combined[columns] = np.fmax(old[columns], new[columns])
+    for col in old.columns.get_level_values(0).unique():
+        counts = combined[(col, 'count')]
+        combined[(col, 'mean')] = combined[(col, 'sum')] / counts.where(counts > 0)
+    return combined
+
+
+class StationState:
+    """Running statistics of one station, updated one slice of new rows at a time.
+
+    Holds the summary-statistic moments and quantile sketches, missing and
+    negative counts, the co-moments behind the correlation matrix and the
+    hourly/daily/monthly aggregates. Updating costs time proportional to the
+    new rows only, and gives the same numbers as a recompute over the full
+    history (quantiles stay approximate).
+    """
+
+    def __init__(self, station):
+        self.station = station
+        self.rows = 0
+        self.last_timestamp = None
+        self.summary = stats.SummaryStatistics()
+        self.comoments = None
+        self.missing = pd.Series(dtype='int64')
+        self.negative = pd.Series(dtype='int64')
+        self.aggregates = {freq: None for freq in STATE_FREQUENCIES}
+
+    def update(self, data):
+        """Add a DataFrame of new rows.
+
+        Rows at or before the last timestamp already seen are skipped, so
+        delivering the same slice twice does not count it twice.
+        """
+        if self.last_timestamp is not None and eda_utils.TIMESTAMP_COLUMN in data.columns:
+            data = data[data[eda_utils.TIMESTAMP_COLUMN] > self.last_timestamp]
+        if len(data) == 0:
+            return self
+        self.summary.update(data)
+        if self.comoments is None:
+            self.comoments = stats.CoMomentAccumulator(self.summary.columns)
+        self.comoments.update(data)
+        self.missing = self.missing.add(data.isnull().sum(), fill_value=0).astype('int64')
+        numeric = data[self.summary.columns]
+        self.negative = self.negative.add((numeric < 0).sum(), fill_value=0).astype('int64')
+        if eda_utils.TIMESTAMP_COLUMN in data.columns:
+            for freq in STATE_FREQUENCIES:
+                self.aggregates[freq] = _combine_aggregates(self.aggregates[freq],
+                                                            eda_utils.resample_data(data, freq))
+            self.last_timestamp = data[eda_utils.TIMESTAMP_COLUMN].max()
+        self.rows += len(data)
+        return self
+
+    def append_file(self, file_path, chunksize=eda_utils.DEFAULT_CHUNKSIZE):
+        """Stream a CSV slice of new rows into the state."""
+        for chunk in eda_utils.load_data(file_path, chunksize=chunksize, cache=False):
+            self.update(chunk)
+        return self
+
+    def summary_stats(self):
+        """Summary statistics as (stat, description, value) tuples."""
+        return self.summary.to_list()
+
+    def correlation(self, columns=None):
+        """Correlation matrix of all numeric columns, or of `columns`."""
+        matrix = self.comoments.correlation()
+        return matrix if columns is None else matrix.loc[columns, columns]
+
+    def resampled(self, freq='daily'):
+        """Hourly, daily or monthly aggregates in the resample_data layout."""
+        return self.aggregates[freq]
+
+
+class StateStore:
+    """Directory of pickled StationState files, one per station."""
+
+    def __init__(self, directory=DEFAULT_STORE_DIR):
+        self.directory = directory
+
+    def path(self, station):
+        return os.path.join(self.directory, f"{station}.pkl")
+
+    def load(self, station):
+        """Load the state of a station, or start an empty one."""
+        if not os.path.exists(self.path(station)):
+            return StationState(station)
+        with open(self.path(station), 'rb') as file:
+            return pickle.load(file)
+
+    def save(self, state):
+        """Write a state atomically."""
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self.path(state.station)}.tmp"
+        with open(temp_path, 'wb') as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.path(state.station))
+
+    def append(self, station, file_path):
+        """Update a station's stored state with a new CSV slice and save it."""
+        state = self.load(station).append_file(file_path)
+        self.save(state)
+        return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Append new station data to its incremental state.")
+    parser.add_argument('station', help="station name, e.g. benin-malanville")
+    parser.add_argument('files', nargs='+', help="CSV slices with the new rows, in time order")
+    parser.add_argument('--store', default=DEFAULT_STORE_DIR, help=f"state directory (default: {DEFAULT_STORE_DIR})")
+    args = parser.parse_args(argv)
+
+    store = StateStore(args.store)
+    for file_path in args.files:
+        state = store.append(args.station, file_path)
+    print(f"{state.station}: {state.rows} rows up to {state.last_timestamp}")
+    print(pd.DataFrame({stat: value for stat, _, value in state.summary_stats()}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+import numpy as np
+import pandas as pd
+
+# Number of items kept per level of a quantile sketch
+DEFAULT_SKETCH_SIZE = 512
+# Rows per slice when summarize reads a whole DataFrame (as eda_utils.DEFAULT_CHUNKSIZE)
+SUMMARY_CHUNKSIZE = 100_000
+# Most outlier markers drawn per box
+MAX_OUTLIERS = 100
+# Statistics reported by SummaryStatistics.to_list, with their descriptions
+SUMMARY_DESCRIPTIONS = {
+    'count': 'Number of non-null observations',
+    'mean': 'Mean of the values',
+    'median': 'Median (50th percentile) of the values',
+    'standard deviation': 'Standard deviation of the values',
+    'skewness': 'Skewness of the distribution',
+    'kurtosis': 'Kurtosis of the distribution',
+}
+
+
+class MomentAccumulator:
+    """Mergeable count, mean and central moments (up to 4th order) per column.
+
+    Each update is a single vectorized pass over a chunk; partial results from
+    different chunks or processes are combined with `merge`.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.count = np.zeros(size)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.m3 = np.zeros(size)
+        self.m4 = np.zeros(size)
+
+    def update(self, data):
+        """Add the rows of a DataFrame (or 2-D array) to the accumulator."""
+        values = np.asarray(data[self.columns] if isinstance(data, pd.DataFrame) else data,
+                            dtype=np.float64)
+        present = ~np.isnan(values)
+        count = present.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, np.nansum(values, axis=0) / count, 0.0)
+        delta = np.where(present, values - mean, 0.0)
+        delta2 = delta * delta
+        m2 = delta2.sum(axis=0)
+        m3 = (delta2 * delta).sum(axis=0)
+        m4 = (delta2 * delta2).sum(axis=0)
+        self._combine(count, mean, m2, m3, m4)
+        return self
+
+    def merge(self, other):
+        """Combine the moments of another accumulator over the same columns."""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge accumulators over different columns.")
+        self._combine(other.count, other.mean, other.m2, other.m3, other.m4)
+        return self
+
+    def _combine(self, count_b, mean_b, m2_b, m3_b, m4_b):
+        """Merge partial moments using the pairwise update formulas of Chan and Pebay."""
+        count_a, mean_a, m2_a, m3_a = self.count, self.mean, self.m2, self.m3
+        count = count_a + count_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = np.where(count > 0, mean_b - mean_a, 0.0)
+            ratio_a = np.where(count > 0, count_a / count, 0.0)
+            ratio_b = np.where(count > 0, count_b / count, 0.0)
+        cross = count_a * count_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cross_n = np.where(count > 0, cross / count, 0.0)
+        self.m4 = (self.m4 + m4_b
+                   + delta ** 4 * cross_n * (count_a ** 2 - cross + count_b ** 2) / np.where(count > 0, count ** 2, 1)
+                   + 6 * delta ** 2 * (ratio_b ** 2 * m2_a + ratio_a ** 2 * m2_b)
+                   + 4 * delta * (ratio_a * m3_b - ratio_b * m3_a))
+        self.m3 = (m3_a + m3_b
+                   + delta ** 3 * cross_n * (count_a - count_b) / np.where(count > 0, count, 1)
+                   + 3 * delta * (ratio_a * m2_b - ratio_b * m2_a))
+        self.m2 = m2_a + m2_b + delta ** 2 * cross_n
+        self.mean = mean_a + delta * ratio_b
+        self.count = count
+
+    def _series(self, values):
+        return pd.Series(values, index=self.columns, dtype=np.float64)
+
+    def means(self):
+        """Mean of each column (NaN for empty columns)."""
+        return self._series(np.where(self.count > 0, self.mean, np.nan))
+
+    def variances(self, ddof=1):
+        """Sample variance of each column."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._series(np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan))
+
+    def stds(self, ddof=1):
+        """Sample standard deviation of each column."""
+        return np.sqrt(self.variances(ddof))
+
+    def skewness(self):
+        """Adjusted Fisher-Pearson skewness, matching DataFrame.skew."""
+        n = self.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            g1 = np.sqrt(n) * self.m3 / self.m2 ** 1.5
+            result = np.sqrt(n * (n - 1)) / (n - 2) * g1
+        result = np.where(self.m2 == 0, 0.0, result)
+        return self._series(np.where(n < 3, np.nan, result))
+
+    def kurtosis(self):
+        """Excess kurtosis with bias correction, matching DataFrame.kurt."""
+        n = self.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            adjust = 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+            result = n * (n + 1) * (n - 1) * self.m4 / ((n - 2) * (n - 3) * self.m2 ** 2) - adjust
+        result = np.where(self.m2 == 0, 0.0, result)
+        return self._series(np.where(n < 4, np.nan, result))
+
+
+class QuantileSketch:
+    """Mergeable approximate quantile sketch for a single column.
+
+    Values are kept in levels of sorted buffers where an item at level i stands
+    for 2**i observations. When a level grows beyond `size` items it is
+    compacted by keeping every other item and promoting them one level up, so
+    memory stays around size * log2(n / size). Quantiles are exact while no
+    compaction has happened.
+    """
+
+    def __init__(self, size=DEFAULT_SKETCH_SIZE):
+        self.size = size
+        self.count = 0
+        self.levels = []
+        self._compactions = 0
+
+    def update(self, values):
+        """Add an array of values, ignoring NaNs."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.count += values.size
+            self._add(0, values)
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """Combine another sketch into this one."""
+        self.count += other.count
+        self._compactions += other._compactions
+        for level, items in enumerate(other.levels):
+            self._add(level, items)
+        self._compress()
+        return self
+
+    def _add(self, level, items):
+        while len(self.levels) <= level:
+            self.levels.append(np.empty(0))
+        self.levels[level] = np.concatenate([self.levels[level], items])
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.size > self.size:
+                items = np.sort(items)
+                # An odd item out stays at this level
+                keep = items[-1:] if items.size % 2 else items[:0]
+                pairs = items[:items.size - keep.size]
+                # Alternate the kept half to avoid a systematic bias
+                offset = self._compactions % 2
+                self._compactions += 1
+                self.levels[level] = keep
+                self._add(level + 1, pairs[offset::2])
+            level += 1
+
+    def weighted_items(self):
+        """Sorted retained items and the number of observations each stands for."""
+        items = np.concatenate(self.levels) if self.levels else np.empty(0)
+        weights = np.concatenate([np.full(level.size, 2.0 ** i) for i, level in enumerate(self.levels)]) \
+            if self.levels else np.empty(0)
+        order = np.argsort(items)
+        return items[order], weights[order]
+
+    def quantile(self, q):
+        """Approximate q-quantile(s) of the values seen so far."""
+        scalar = np.ndim(q) == 0
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if self.count == 0:
+            result = np.full(q.shape, np.nan)
+        elif self._compactions == 0:
+            # Nothing has been discarded, so the quantiles are exact
+            result = np.quantile(self.levels[0], q)
+        else:
+            items, weights = self.weighted_items()
+            # Position of each item at the centre of the weight it represents
+            positions = (np.cumsum(weights) - weights / 2) / weights.sum()
+            result = np.interp(q, positions, items)
+        return result[0] if scalar else result
+
+
+class CoMomentAccumulator:
+    """Mergeable pairwise counts, sums and cross-products for correlation matrices.
+
+    Like DataFrame.corr(), each pair of columns uses the rows where both are
+    present. Values are shifted by a per-column reference (the mean of the
+    first chunk) to keep the sums numerically stable.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.shift = None
+        self.count = np.zeros((size, size))
+        # sums[i, j] and squares[i, j] sum x_i and x_i**2 over the rows where i and j are present
+        self.sums = np.zeros((size, size))
+        self.squares = np.zeros((size, size))
+        self.products = np.zeros((size, size))
+
+    def update(self, data):
+        """Add the rows of a DataFrame (or 2-D array) to the accumulator."""
+        values = np.asarray(data[self.columns] if isinstance(data, pd.DataFrame) else data,
+                            dtype=np.float64)
+        present = ~np.isnan(values)
+        if self.shift is None:
+            count = present.sum(axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                self.shift = np.where(count > 0, np.where(present, values, 0.0).sum(axis=0) / count, 0.0)
+        centered = np.where(present, values - self.shift, 0.0)
+        weights = present.astype(np.float64)
+        self.count += weights.T @ weights
+        self.sums += centered.T @ weights
+        self.squares += (centered * centered).T @ weights
+        self.products += centered.T @ centered
+        return self
+
+    def merge(self, other):
+        """Combine the co-moments of another accumulator over the same columns."""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge accumulators over different columns.")
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.shift = other.shift.copy()
+        # Re-express the other sums around this accumulator's shift
+        d = (self.shift - other.shift)[:, None]
+        sums = other.sums - d * other.count
+        self.squares += other.squares - 2 * d * other.sums + d * d * other.count
+        self.products += (other.products - other.sums * d.T - other.sums.T * d
+                          + d * d.T * other.count)
+        self.sums += sums
+        self.count += other.count
+        return self
+
+    def covariance(self, ddof=1):
+        """Pairwise covariance matrix as a DataFrame."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = (self.products - self.sums * self.sums.T / self.count) / (self.count - ddof)
+        result = np.where(self.count > ddof, result, np.nan)
+        return pd.DataFrame(result, index=self.columns, columns=self.columns)
+
+    def correlation(self):
+        """Pairwise Pearson correlation matrix as a DataFrame, matching DataFrame.corr()."""
+        n = self.count
+        covariance = n * self.products - self.sums * self.sums.T
+        variance = n * self.squares - self.sums ** 2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = covariance / np.sqrt(variance * variance.T)
+        result = np.clip(result, -1.0, 1.0)
+        result = np.where((variance > 0) & (variance.T > 0), result, np.nan)
+        diagonal = np.diag(variance) > 0
+        np.fill_diagonal(result, np.where(diagonal, 1.0, np.nan))
+        return pd.DataFrame(result, index=self.columns, columns=self.columns)
+
+
+class SummaryStatistics:
+    """Streaming summary statistics for the numeric columns of station data.
+
+    Moments are accumulated exactly and quantiles come from one QuantileSketch
+    per column. Feed it chunks with `update` and combine partial results from
+    other chunks or processes with `merge`.
+    """
+
+    def __init__(self, columns=None, sketch_size=DEFAULT_SKETCH_SIZE):
+        self.columns = None if columns is None else list(columns)
+        self.sketch_size = sketch_size
+        self.moments = None
+        self.sketches = None
+        if self.columns is not None:
+            self._initialize(self.columns)
+
+    def _initialize(self, columns):
+        self.columns = list(columns)
+        self.moments = MomentAccumulator(self.columns)
+        self.sketches = [QuantileSketch(self.sketch_size) for _ in self.columns]
+
+    def update(self, data):
+        """Add a chunk of data; numeric columns are selected from the first chunk."""
+        if self.columns is None:
+            self._initialize(data.select_dtypes(include='number').columns)
+        values = data[self.columns].to_numpy(dtype=np.float64)
+        self.moments.update(values)
+        for i, sketch in enumerate(self.sketches):
+            sketch.update(values[:, i])
+        return self
+
+    def merge(self, other):
+        """Combine the statistics of another SummaryStatistics instance."""
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self._initialize(other.columns)
+        self.moments.merge(other.moments)
+        for sketch, other_sketch in zip(self.sketches, other.sketches):
+            sketch.merge(other_sketch)
+        return self
+
+    def quantiles(self, q):
+        """Approximate q-quantile of each column."""
+        return pd.Series([sketch.quantile(q) for sketch in self.sketches],
+                         index=self.columns, dtype=np.float64)
+
+    def to_list(self):
+        """Return the statistics as (stat, description, value) tuples."""
+        if self.columns is None:
+            self._initialize([])
+        values = {
+            'count': pd.Series(self.moments.count, index=self.columns, dtype=np.float64),
+            'mean': self.moments.means(),
+            'median': self.quantiles(0.5),
+            'standard deviation': self.moments.stds(),
+            'skewness': self.moments.skewness(),
+            'kurtosis': self.moments.kurtosis(),
+        }
+        return [(stat, description, values[stat]) for stat, description in SUMMARY_DESCRIPTIONS.items()]
+
+
+def summarize(chunks, columns=None, sketch_size=DEFAULT_SKETCH_SIZE, chunksize=SUMMARY_CHUNKSIZE):
+    """Accumulate SummaryStatistics over a DataFrame or an iterable of chunks.
+
+    A DataFrame is read in slices of `chunksize` rows, so the float64 copies
+    made by each update stay bounded whatever the size of the frame.
+    """
+    if isinstance(chunks, pd.DataFrame):
+        data = chunks
+        chunks = (data.iloc[start:start + chunksize] for start in range(0, max(len(data), 1), chunksize))
+    summary = SummaryStatistics(columns, sketch_size)
+    for chunk in chunks:
+        summary.update(chunk)
+    return summary
+
+
+def _pick_fliers(outliers, max_outliers):
+    """Up to max_outliers of the sorted outliers, evenly spread by rank and keeping both extremes."""
+    if len(outliers) <= max_outliers:
+        return outliers
+    if max_outliers <= 0:
+        return outliers[:0]
+    return outliers[np.unique(np.linspace(0, len(outliers) - 1, max_outliers).round().astype(np.int64))]
+
+
+def _box(label, count, quartiles, values, weights, whis, max_outliers):
+    """Boxplot statistics from (weighted) values and their quartiles."""
+    q1, median, q3 = quartiles
+    low, high = q1 - whis * (q3 - q1), q3 + whis * (q3 - q1)
+    inside = (values >= low) & (values <= high)
+    outliers = np.sort(values[~inside])
+    return {
+        'label': label,
+        'count': count,
+        'q1': q1,
+        'med': median,
+        'q3': q3,
+        'whislo': values[inside].min() if inside.any() else q1,
+        'whishi': values[inside].max() if inside.any() else q3,
+        'outliers': int(round(weights[~inside].sum())) if weights is not None else len(outliers),
+        'fliers': _pick_fliers(outliers, max_outliers),
+    }
+
+
+def boxplot_summaries(data, columns, whis=1.5, max_outliers=MAX_OUTLIERS):
+    """Boxplot statistics per column, as dicts ready for matplotlib's Axes.bxp.
+
+    For a DataFrame the quartiles come from one partition pass per column
+    (np.quantile) and are exact. For an iterable of chunks they come from a
+    QuantileSketch, so whiskers and outlier counts are approximate. Only up
+    to `max_outliers` representative outliers are kept as 'fliers'; the
+    'outliers' entry holds their total count.
+    """
+    if isinstance(data, pd.DataFrame):
+        summaries = []
+        for col in columns:
+            values = data[col].to_numpy(dtype=np.float64)
+            values = values[~np.isnan(values)]
+            if values.size == 0:
+                values = np.array([np.nan])
+            quartiles = np.quantile(values, [0.25, 0.5, 0.75])
+            summaries.append(_box(col, int(np.count_nonzero(~np.isnan(values))), quartiles,
+                                  values, None, whis, max_outliers))
+        return summaries
+    sketches = {col: QuantileSketch() for col in columns}
+    for chunk in data:
+        for col, sketch in sketches.items():
+            sketch.update(chunk[col].to_numpy(dtype=np.float64))
+    summaries = []
+    for col, sketch in sketches.items():
+        items, weights = sketch.weighted_items()
+        if items.size == 0:
+            items, weights = np.array([np.nan]), np.zeros(1)
+        summaries.append(_box(col, sketch.count, sketch.quantile([0.25, 0.5, 0.75]),
+                              items, weights, whis, max_outliers))
+    return summaries
+
+
+def boxplot_stats(data, columns, whis=1.5):
+    """Boxplot statistics (quartiles, whiskers, outlier count) per column as a table."""
+    summaries = boxplot_summaries(data, columns, whis, max_outliers=0)
+    table = pd.DataFrame(summaries).set_index('label').drop(columns='fliers')
+    table.index.name = None
+    return table.rename(columns={'med': 'median'})
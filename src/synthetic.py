@@ -0,0 +1,78 @@
+import argparse
+import numpy as np
+import pandas as pd
+from src.eda_utils import COMMENTS_COLUMN, SENSOR_COLUMNS, TIMESTAMP_COLUMN, TIMESTAMP_FORMAT
+
+# Default first timestamp of a synthetic station, like the real files
+DEFAULT_START = '2021-08-09 00:01'
+# Rows generated and written at a time
+WRITE_CHUNKSIZE = 1_000_000
+
+
+def generate_station(rows, start=DEFAULT_START, seed=0):
+    """Synthetic station data at 1-minute cadence with the real column set.
+
+    Irradiance follows a daily solar curve dimmed by random cloud cover and
+    reads slightly negative at night, temperatures, humidity and wind follow
+    the irradiance, and a small share of the values is missing, so the data
+    exercises the same code paths as the real station files.
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range(start, periods=rows, freq='min')
+    hours = (timestamps.hour + timestamps.minute / 60).to_numpy()
+    days = (timestamps.dayofyear).to_numpy()
+    # Sun elevation proxy between 06:00 and 18:00, with a seasonal swing
+    sun = np.clip(np.sin(np.pi * (hours - 6) / 12), 0, None) * (0.9 + 0.1 * np.cos(2 * np.pi * (days - 172) / 365))
+    clouds = np.clip(rng.normal(0.75, 0.2, rows), 0.05, 1)
+    night = rng.normal(-1.0, 0.5, rows)
+
+    data = pd.DataFrame({TIMESTAMP_COLUMN: timestamps})
+    data['GHI'] = np.where(sun > 0, 1050 * sun * clouds, night)
+    data['DNI'] = np.where(sun > 0, 900 * sun * clouds ** 2, night)
+    data['DHI'] = np.where(sun > 0, 120 * sun * (1.5 - clouds), night)
+    data['ModA'] = np.clip(data['GHI'] * 0.97 + rng.normal(0, 5, rows), 0, None)
+    data['ModB'] = np.clip(data['GHI'] * 0.95 + rng.normal(0, 5, rows), 0, None)
+    data['Tamb'] = 24 + 8 * np.sin(np.pi * (hours - 9) / 12) + rng.normal(0, 0.5, rows)
+    data['RH'] = np.clip(90 - 2.2 * (data['Tamb'] - 20) + rng.normal(0, 3, rows), 5, 100)
+    data['WS'] = rng.gamma(2.0, 1.0, rows)
+    data['WSgust'] = data['WS'] * rng.uniform(1.1, 1.6, rows)
+    data['WSstdev'] = data['WS'] * rng.uniform(0.1, 0.3, rows)
+    data['WD'] = rng.uniform(0, 360, rows)
+    data['WDstdev'] = rng.uniform(0, 30, rows)
+    data['BP'] = 995 + 2 * np.sin(2 * np.pi * hours / 12) + rng.normal(0, 0.5, rows)
+    data['Cleaning'] = (rng.random(rows) < 0.0005).astype(float)
+    data['Precipitation'] = np.where(rng.random(rows) < 0.01, rng.exponential(1.0, rows), 0.0)
+    data['TModA'] = data['Tamb'] + 0.03 * np.clip(data['GHI'], 0, None) + rng.normal(0, 0.5, rows)
+    data['TModB'] = data['Tamb'] + 0.025 * np.clip(data['GHI'], 0, None) + rng.normal(0, 0.5, rows)
+    # Sensor dropouts
+    for col in SENSOR_COLUMNS:
+        data.loc[rng.random(rows) < 0.001, col] = np.nan
+    data[COMMENTS_COLUMN] = np.nan
+    return data
+
+
+def write_station(path, rows, start=DEFAULT_START, seed=0, chunksize=WRITE_CHUNKSIZE):
+    """Write a synthetic station CSV of `rows` rows, generated `chunksize` rows at a time.
+
+    Memory stays bounded by the chunk size, so files of tens of millions of
+    rows can be produced. Returns the path.
+    """
+    for i, first in enumerate(range(0, rows, chunksize)):
+        chunk_start = pd.Timestamp(start) + pd.Timedelta(minutes=first)
+        chunk = generate_station(min(chunksize, rows - first), chunk_start, seed + i)
+        chunk.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False,
+                     date_format=TIMESTAMP_FORMAT, float_format='%.1f')
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic solar station CSV.")
+    parser.add_argument('path', help="output CSV file")
+    parser.add_argument('rows', type=int, help="number of 1-minute rows, e.g. 525600 for a year")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args(argv)
+    write_station(args.path, args.rows, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+from src import column_store, eda_utils
+
+# Rows per block of min/max statistics (one week of 1-minute readings)
+BLOCK_ROWS = 7 * 24 * 60
+# int64 value of NaT
+_NAT = np.iinfo(np.int64).min
+
+
+def _epoch_ns(timestamps):
+    """Timestamps as int64 nanoseconds since the epoch, without copying when they already are."""
+    if isinstance(timestamps, np.ndarray) and timestamps.dtype == np.int64:
+        return timestamps
+    if isinstance(timestamps, np.ndarray) and timestamps.dtype == 'datetime64[ns]':
+        return timestamps.view(np.int64)
+    return pd.DatetimeIndex(timestamps).as_unit('ns').asi8
+
+
+def _bound(value, default):
+    """A query bound as epoch nanoseconds; None means open-ended."""
+    if value is None:
+        return default
+    return pd.Timestamp(value).as_unit('ns').value
+
+
+class TimeIndex:
+    """Timestamp index of a station with min/max statistics per block of rows.
+
+    Sorted timestamps (the usual case) are queried by binary search, so a
+    window costs two lookups whatever the length of the file. Otherwise, or
+    when there are NaT values, only the blocks whose [min, max] range
+    overlaps the window are scanned.
+    """
+
+    def __init__(self, timestamps, block_rows=BLOCK_ROWS):
+        self.values = _epoch_ns(timestamps)
+        self.block_rows = block_rows
+        starts = np.arange(0, len(self.values), block_rows)
+        valid = self.values != _NAT
+        if len(self.values):
+            self.block_min = np.minimum.reduceat(np.where(valid, self.values, np.iinfo(np.int64).max), starts)
+            self.block_max = np.maximum.reduceat(self.values, starts)
+        else:
+            self.block_min = self.block_max = np.zeros(0, dtype=np.int64)
+        self.is_sorted = bool(valid.all() and np.all(self.values[1:] >= self.values[:-1]))
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def start(self):
+        """First timestamp, or NaT for an empty index."""
+        valid = self.block_min[self.block_min != np.iinfo(np.int64).max]
+        return pd.Timestamp(valid.min()) if len(valid) else pd.NaT
+
+    @property
+    def end(self):
+        """Last timestamp, or NaT for an empty index."""
+        valid = self.block_max[self.block_max != _NAT]
+        return pd.Timestamp(valid.max()) if len(valid) else pd.NaT
+
+    def blocks(self, start=None, end=None):
+        """Numbers of the blocks that may hold rows between `start` and `end`."""
+        low, high = _bound(start, _NAT + 1), _bound(end, np.iinfo(np.int64).max)
+        return np.flatnonzero((self.block_max >= low) & (self.block_min <= high))
+
+    def rows(self, start=None, end=None):
+        """Rows with timestamps between `start` and `end` (both inclusive).
+
+        Returns a slice for sorted timestamps, else an array of row numbers in
+        file order.
+        """
+        low, high = _bound(start, _NAT + 1), _bound(end, np.iinfo(np.int64).max)
+        if self.is_sorted:
+            return slice(int(np.searchsorted(self.values, low, 'left')),
+                         int(np.searchsorted(self.values, high, 'right')))
+        blocks = self.blocks(start, end)
+        if len(blocks) == 0:
+            return np.zeros(0, dtype=np.int64)
+        first = blocks * self.block_rows
+        lengths = np.minimum(first + self.block_rows, len(self.values)) - first
+        # Row numbers of the candidate blocks, then the ones inside the window
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        candidates = np.repeat(first, lengths) + offsets
+        values = self.values[candidates]
+        return candidates[(values >= low) & (values <= high)]
+
+
+def build_index(source, block_rows=BLOCK_ROWS):
+    """TimeIndex of a ColumnStore or a DataFrame with a 'Timestamp' column."""
+    if isinstance(source, column_store.ColumnStore):
+        return TimeIndex(source.column(eda_utils.TIMESTAMP_COLUMN), block_rows)
+    return TimeIndex(source[eda_utils.TIMESTAMP_COLUMN], block_rows)
+
+
+def query(source, start=None, end=None, columns=None, index=None):
+    """Rows of a ColumnStore or DataFrame between `start` and `end` (inclusive).
+
+    Returns a DataFrame with 'Timestamp' and `columns` (default: all). Only
+    the rows of the window are read from a column store. Pass a prebuilt
+    `index` to query the same source repeatedly.
+    """
+    index = index if index is not None else build_index(source)
+    rows = index.rows(start, end)
+    if isinstance(source, column_store.ColumnStore):
+        return source.to_frame(columns, rows)
+    if columns is not None:
+        source = source[[eda_utils.TIMESTAMP_COLUMN] + [col for col in columns if col != eda_utils.TIMESTAMP_COLUMN]]
+    return source.iloc[rows]
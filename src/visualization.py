@@ -2,9 +2,28 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
+from src import binning, eda_utils
+from src.downsample import DEFAULT_MAX_POINTS, plot_series
+from src.profiling import timed
+
+
+def _plot_lines(data, columns, max_points, method):
+    """Draw downsampled lines of columns -> label against the timestamps on a new figure."""
+    fig, ax = plt.subplots(figsize=(12, 6))
+    timestamps = eda_utils.row_timestamps(data)
+    for col, label in columns.items():
+        plot_series(ax, timestamps, data[col], max_points, method, label=label)
+    return fig, ax
+
+
 # Step 10: Visualization - Wind Analysis
-def wind_analysis(data):
-    """Explore wind speed and wind direction data."""
+@timed
+def wind_analysis(data, max_points=DEFAULT_MAX_POINTS, method='minmax'):
+    """Explore wind speed and wind direction data.
+
+    Line plots are downsampled to about `max_points` points per series
+    (see src.downsample). Returns the speed and direction figures.
+    """
     print("Wind Analysis:")
     # Basic statistics
     print("\nBasic Statistics:")
@@ -12,63 +31,87 @@ def wind_analysis(data):
     
     # Wind Speed Analysis
     print("\nWind Speed Analysis")
-    plt.figure(figsize=(12, 6))
-    sns.lineplot(data=data, x='Timestamp', y='WS', label='Wind Speed (m/s)')
-    sns.lineplot(data=data, x='Timestamp', y='WSgust', label='Wind Gust Speed (m/s)')
-    sns.lineplot(data=data, x='Timestamp', y='WSstdev', label='Wind Speed Std Dev (m/s)')
-    plt.xlabel('Timestamp')
-    plt.ylabel('Wind Speed (m/s)')
-    plt.title('Wind Speed Analysis')
-    plt.legend()
+    speed_fig, ax = _plot_lines(data, {'WS': 'Wind Speed (m/s)', 'WSgust': 'Wind Gust Speed (m/s)',
+                                       'WSstdev': 'Wind Speed Std Dev (m/s)'}, max_points, method)
+    ax.set_xlabel('Timestamp')
+    ax.set_ylabel('Wind Speed (m/s)')
+    ax.set_title('Wind Speed Analysis')
+    ax.legend()
 
     # Wind Direction Analysis
     print("\nWind Direction Analysis")
-    plt.figure(figsize=(12, 6))
-    sns.lineplot(data=data, x='Timestamp', y='WD', label='Wind Direction (°)')
-    sns.lineplot(data=data, x='Timestamp', y='WDstdev', label='Wind Direction Std Dev (°)')
-    plt.xlabel('Timestamp')
-    plt.ylabel('Wind Direction (°)')
-    plt.title('Wind Direction Analysis')
-    plt.legend()
-def temperature_analysis(data):
+    direction_fig, ax = _plot_lines(data, {'WD': 'Wind Direction (°)', 'WDstdev': 'Wind Direction Std Dev (°)'},
+                                    max_points, method)
+    ax.set_xlabel('Timestamp')
+    ax.set_ylabel('Wind Direction (°)')
+    ax.set_title('Wind Direction Analysis')
+    ax.legend()
+    return speed_fig, direction_fig
+@timed
+def temperature_analysis(data, max_points=DEFAULT_MAX_POINTS, method='minmax'):
     """Compare module temperatures (TModA, TModB) with ambient temperature (Tamb)."""
     print("Temperature Analysis:")
-    plt.figure(figsize=(12, 6))
-    sns.lineplot(data=data, x='Timestamp', y='Tamb', label='Ambient Temperature (°C)')
-    sns.lineplot(data=data, x='Timestamp', y='TModA', label='Module Temperature A (°C)')
-    sns.lineplot(data=data, x='Timestamp', y='TModB', label='Module Temperature B (°C)')
-    plt.xlabel('Timestamp')
-    plt.ylabel('Temperature (°C)')
-    plt.title('Temperature Analysis')
-    plt.legend()
-def plot_histograms(data):
+    fig, ax = _plot_lines(data, {'Tamb': 'Ambient Temperature (°C)', 'TModA': 'Module Temperature A (°C)',
+                                 'TModB': 'Module Temperature B (°C)'}, max_points, method)
+    ax.set_xlabel('Timestamp')
+    ax.set_ylabel('Temperature (°C)')
+    ax.set_title('Temperature Analysis')
+    ax.legend()
+    return fig
+@timed
+def plot_histograms(data, bins=30):
+    """Create histograms for specified variables.
+
+    Counts and KDE curves are precomputed with fixed-edge binning (see
+    src.binning), so `data` may also be an iterable of chunks.
+    """
     print("Plotting histograms...")
-    """Create histograms for specified variables."""
     # Select variables for histograms
     variables = ['GHI', 'DNI', 'DHI', 'WS', 'Tamb', 'TModA', 'TModB']
+    histograms = binning.histograms(data, variables, bins)
     
     # Plot histograms
-    plt.figure(figsize=(14, 10))
-    for i, var in enumerate(variables, 1):
-        plt.subplot(3, 3, i)
-        sns.histplot(data[var], kde=True, color='skyblue', bins=30)
-        plt.title(f'{var} Histogram')
-        plt.xlabel(var)
-        plt.ylabel('Frequency')
-    plt.tight_layout()
-def plot_scatter_plots(data):
+    fig, axes = plt.subplots(3, 3, figsize=(14, 10))
+    for ax, var in zip(axes.flat, variables):
+        binning.plot_histogram(histograms, var, ax=ax, color='skyblue')
+        ax.set_title(f'{var} Histogram')
+        ax.set_xlabel(var)
+        ax.set_ylabel('Frequency')
+    for ax in axes.flat[len(variables):]:
+        ax.set_visible(False)
+    fig.tight_layout()
+    return fig
+@timed
+def plot_scatter_plots(data, mode='density', bins=100, sample_size=2000):
+    """Generate scatter plots to explore relationships between pairs of variables.
+
+    In 'density' mode (the default) each panel shows 2-D binned counts with a
+    stratified sample of points on top (see src.binning), which takes the
+    same time whatever the number of rows; sample_size=0 drops the overlay.
+    `data` may also be an iterable of chunks, read once for all the pairs.
+    mode='scatter' draws every row of a DataFrame as a point.
+    """
     print("Plotting scatter plots...")
-    """Generate scatter plots to explore relationships between pairs of variables."""
     # Define pairs of variables for scatter plots
     variable_pairs = [('GHI', 'Tamb'), ('WS', 'WSgust'), ('TModA', 'TModB')]
     
+    if mode == 'density':
+        grids = binning.pair_densities(data, variable_pairs, bins, sample_size)
+    elif not isinstance(data, pd.DataFrame):
+        raise TypeError("mode='scatter' needs a DataFrame.")
+
     # Plot scatter plots
-    plt.figure(figsize=(12, 8))
-    for i, pair in enumerate(variable_pairs, 1):
-        plt.subplot(2, 2, i)
-        sns.scatterplot(data=data, x=pair[0], y=pair[1])
-        plt.title(f'{pair[0]} vs {pair[1]}')
-        plt.xlabel(pair[0])
-        plt.ylabel(pair[1])
-    plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    fig, axes = plt.subplots(2, 2, figsize=(12, 8))
+    for ax, pair in zip(axes.flat, variable_pairs):
+        if mode == 'density':
+            grid, sample = grids[pair]
+            binning.plot_density(grid, ax=ax, sample=sample)
+        else:
+            sns.scatterplot(data=data, x=pair[0], y=pair[1], ax=ax)
+        ax.set_title(f'{pair[0]} vs {pair[1]}')
+        ax.set_xlabel(pair[0])
+        ax.set_ylabel(pair[1])
+    for ax in axes.flat[len(variable_pairs):]:
+        ax.set_visible(False)
+    fig.tight_layout()
+    return fig
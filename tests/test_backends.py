@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src import backends, eda_utils, synthetic
+
+# A module-level marker rather than importorskip, so unittest discovery can import this file
+pytestmark = pytest.mark.skipif(not backends.is_available(), reason="polars is not installed")
+
+
+@pytest.fixture
+def station_file(tmp_path):
+    return synthetic.write_station(tmp_path / "station.csv", 3000)
+
+# The same eda_utils calls give the same answers on a lazy Polars scan
+def test_polars_backend(station_file):
+    data = eda_utils.load_data(station_file, cache=False)
+    lazy = eda_utils.load_data(station_file, backend='polars')
+
+    assert backends.is_lazy(lazy)
+    pd.testing.assert_series_equal(eda_utils.missing_values(lazy, verbose=False),
+                                   eda_utils.missing_values(data, verbose=False), check_names=False)
+    pd.testing.assert_series_equal(eda_utils.count_negative_values(lazy, verbose=False),
+                                   eda_utils.count_negative_values(data, verbose=False), check_names=False)
+    filtered = eda_utils.remove_negative_rows(lazy, eda_utils.SOLAR_COLUMNS)
+    assert backends.collect(filtered).height == len(eda_utils.remove_negative_rows(data, eda_utils.SOLAR_COLUMNS))
+    for (stat, _, expected), (_, _, value) in zip(eda_utils.calculate_summary_stats(data),
+                                                  eda_utils.calculate_summary_stats(lazy)):
+        if stat != 'median':  # exact in Polars, sketched in pandas
+            assert np.allclose(value, expected, rtol=1e-5)
+
+# Correlations and resampled aggregates keep the pandas layout
+def test_polars_aggregates(station_file):
+    data = eda_utils.load_data(station_file, cache=False)
+    lazy = eda_utils.load_data(station_file, backend='polars')
+
+    pd.testing.assert_frame_equal(backends.correlation_matrix(lazy, eda_utils.SOLAR_COLUMNS),
+                                  eda_utils.correlation_analysis(data), atol=1e-6)
+    for freq in ('hourly', 'h', '30min', 'D'):
+        expected = eda_utils.resample_data(data, freq)
+        aggregates = eda_utils.resample_data(lazy, freq)
+        pd.testing.assert_index_equal(aggregates.index, expected.index, check_exact=False)
+        assert list(aggregates.columns) == list(expected.columns)
+        assert np.allclose(aggregates.to_numpy(float), expected.to_numpy(float), rtol=1e-5, equal_nan=True)
+    with pytest.raises(ValueError):
+        eda_utils.resample_data(lazy, 'W')
+
+# Unknown backends are rejected
+def test_unknown_backend(station_file):
+    with pytest.raises(ValueError):
+        eda_utils.load_data(station_file, backend='spark')
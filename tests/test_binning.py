@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+import pandas as pd
+from src import binning
+
+# Chunked histograms match np.histogram and merge across chunks
+def test_histograms_match_numpy():
+    values = np.random.default_rng(0).normal(20, 5, 10_000)
+    sample_data = pd.DataFrame({'Tamb': values})
+    chunks = [sample_data.iloc[start:start + 3000] for start in range(0, len(sample_data), 3000)]
+
+    accumulator = binning.histograms(chunks, ['Tamb'], bins=20, ranges={'Tamb': (0, 40)})
+    other = binning.histograms(chunks[:1], ['Tamb'], bins=20, ranges={'Tamb': (0, 40)})
+
+    counts, edges = accumulator.histogram('Tamb')
+    assert np.array_equal(counts, np.histogram(values, bins=20, range=(0, 40))[0])
+    assert accumulator.below['Tamb'] == (values < 0).sum()
+    assert accumulator.merge(other).histogram('Tamb')[0].sum() == counts.sum() + 3000
+
+# In-memory data is binned over its own range
+def test_histograms_data_range():
+    sample_data = pd.DataFrame({'GHI': [1.0, 2.0, 3.0, None]})
+    counts, edges = binning.histograms(sample_data, ['GHI'], bins=2).histogram('GHI')
+    assert counts.tolist() == [1, 2]
+    assert edges[0] == 1.0 and edges[-1] == 3.0
+
+# Binned KDE integrates to one and follows the Gaussian density
+def test_binned_kde():
+    values = np.random.default_rng(1).normal(0, 1, 200_000)
+    accumulator = binning.histograms(pd.DataFrame({'x': values}), ['x'], bins=40, ranges={'x': (-6, 6)})
+
+    x, density = accumulator.kde('x')
+
+    assert np.isclose(density.sum() * (x[1] - x[0]), 1.0, atol=1e-3)
+    assert np.allclose(density, np.exp(-x ** 2 / 2) / np.sqrt(2 * np.pi), atol=0.01)
+
+# 2-D density counts match np.histogram2d and keep per-cell means
+def test_density_accumulator():
+    rng = np.random.default_rng(2)
+    sample_data = pd.DataFrame({'TModA': rng.uniform(0, 10, 5000), 'TModB': rng.uniform(0, 10, 5000),
+                                'Tamb': rng.normal(25, 2, 5000)})
+    chunks = [sample_data.iloc[:2500], sample_data.iloc[2500:]]
+
+    grid = binning.density(chunks, 'TModA', 'TModB', bins=5,
+                           ranges={'TModA': (0, 10), 'TModB': (0, 10)}, value='Tamb')
+
+    expected, _, _ = np.histogram2d(sample_data['TModA'], sample_data['TModB'], bins=5, range=[(0, 10), (0, 10)])
+    assert np.array_equal(grid.counts, expected)
+    cell = (sample_data['TModA'] < 2) & (sample_data['TModB'] < 2)
+    assert np.isclose(grid.value_means()[0, 0], sample_data.loc[cell, 'Tamb'].mean())
+
+# Stratified sample keeps sparse regions
+def test_stratified_sample():
+    rng = np.random.default_rng(3)
+    dense = pd.DataFrame({'x': rng.normal(0, 0.1, 20_000), 'y': rng.normal(0, 0.1, 20_000)})
+    outliers = pd.DataFrame({'x': [5.0, -5.0], 'y': [5.0, -5.0]})
+    sample_data = pd.concat([dense, outliers], ignore_index=True)
+
+    sample = binning.stratified_sample(sample_data, 'x', 'y', size=500)
+
+    assert len(sample) <= 500
+    assert {20_000, 20_001} <= set(sample.index)
+
+# Chunks are read once for all pairs and sampled per chunk
+def test_pair_densities():
+    rng = np.random.default_rng(4)
+    sample_data = pd.DataFrame({'GHI': rng.uniform(0, 1000, 6000), 'Tamb': rng.uniform(10, 40, 6000),
+                                'WS': rng.uniform(0, 10, 6000)})
+    chunks = (sample_data.iloc[start:start + 2000] for start in range(0, 6000, 2000))
+    pairs = [('GHI', 'Tamb'), ('WS', 'Tamb')]
+
+    grids = binning.pair_densities(chunks, pairs, bins=10, sample_size=300)
+
+    for pair in pairs:
+        grid, sample = grids[pair]
+        assert grid.counts.sum() == 6000
+        assert 0 < len(sample) < 1000
+        assert set(sample.index) <= set(sample_data.index)
+    with pytest.raises(TypeError):
+        binning.stratified_sample(iter([sample_data]), 'GHI', 'Tamb')
@@ -0,0 +1,54 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from src import column_store, eda_utils, synthetic
+
+
+@pytest.fixture
+def station_file(tmp_path):
+    return synthetic.write_station(tmp_path / "station.csv", 2500)
+
+# Every column round-trips through the store as a memory-mapped array
+def test_open_store(station_file, tmp_path):
+    store = column_store.open_store(station_file, cache_dir=tmp_path / 'cache')
+    data = eda_utils.load_data(station_file, cache=False)
+
+    assert store.rows == len(data)
+    assert store.columns == [col for col in data.columns if col in eda_utils.SENSOR_COLUMNS]
+    assert isinstance(store['GHI'], np.memmap)
+    assert np.array_equal(store['GHI'], data['GHI'].to_numpy(), equal_nan=True)
+    assert np.array_equal(store.timestamps(), data['Timestamp'].to_numpy().astype('datetime64[ns]'))
+    frame = store.to_frame(['GHI', 'Tamb'], rows=slice(10, 20))
+    assert list(frame.columns) == ['Timestamp', 'GHI', 'Tamb']
+    pd.testing.assert_series_equal(frame['Tamb'], data['Tamb'].iloc[10:20].reset_index(drop=True))
+    with pytest.raises(KeyError):
+        store['Comments']
+
+# The manifest describes the store, and reopening does not rebuild it
+def test_manifest(station_file, tmp_path):
+    store = column_store.open_store(station_file, cache_dir=tmp_path / 'cache')
+    with open(os.path.join(store.path, column_store.MANIFEST)) as file:
+        manifest = json.load(file)
+
+    assert manifest['rows'] == 2500 and manifest['columns']['GHI'] == 'float32'
+    assert manifest['start'] == '2021-08-09T00:01:00'
+    modified = os.path.getmtime(os.path.join(store.path, 'GHI.npy'))
+    assert column_store.open_store(station_file, cache_dir=tmp_path / 'cache').path == store.path
+    assert os.path.getmtime(os.path.join(store.path, 'GHI.npy')) == modified
+
+
+def _open_rows(file_path, cache_dir):
+    store = column_store.open_store(file_path, cache_dir=cache_dir)
+    return store.rows, float(np.nansum(store['GHI']))
+
+# Processes opening a new store at the same time all get the same complete store
+def test_open_store_from_processes(station_file, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    with ProcessPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(_open_rows, [str(station_file)] * 6, [cache_dir] * 6))
+
+    assert len(set(results)) == 1 and results[0][0] == 2500
+    assert [name for name in os.listdir(cache_dir) if name.endswith('.tmp')] == []
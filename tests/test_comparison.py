@@ -0,0 +1,47 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from src import comparison, synthetic
+
+
+@pytest.fixture
+def stations(tmp_path):
+    return {f'station-{seed}': synthetic.write_station(tmp_path / f'station-{seed}.csv', 3000 + 500 * seed, seed=seed)
+            for seed in range(3)}
+
+# Every station's rows are stacked under a categorical key
+def test_load_stations(stations):
+    data = comparison.load_stations(stations, columns=['GHI', 'Tamb'])
+
+    assert list(data.columns) == ['Station', 'Timestamp', 'GHI', 'Tamb']
+    assert isinstance(data['Station'].dtype, pd.CategoricalDtype)
+    assert data['Station'].value_counts(sort=False).tolist() == [3000, 3500, 4000]
+    with pytest.raises(ValueError):
+        comparison.load_stations([stations['station-0'], stations['station-0']])
+
+# The grouped tables match a per-station computation
+def test_compare_stations(stations):
+    data = comparison.load_stations(stations)
+    result = comparison.compare_stations(data)
+
+    for station, rows in data.groupby('Station', observed=True):
+        assert np.isclose(result.statistics.loc[(station, 'GHI'), 'mean'], rows['GHI'].mean())
+        assert np.isclose(result.quality.loc[(station, 'Tamb'), 'missing_pct'], rows['Tamb'].isna().mean() * 100)
+        expected = rows[comparison.CORRELATION_COLUMNS].dropna().corr()
+        assert np.allclose(result.correlations.loc[station], expected, atol=1e-9)
+    # One-minute readings: the monthly totals are the sums of positive GHI over 60 000
+    ghi = data['GHI'].clip(lower=0).groupby(data['Station'], observed=True).sum() / 60_000
+    assert np.allclose(result.monthly['GHI'].groupby(level=0, observed=True).sum(), ghi)
+
+# Comparison tables and side-by-side figures are written
+def test_write_comparison(stations, tmp_path):
+    output_dir = tmp_path / 'comparison'
+    open_figures = plt.get_fignums()
+    result = comparison.write_comparison(list(stations.values()), output_dir)
+
+    assert result.stations == list(stations)
+    assert sorted(path.name for path in output_dir.iterdir()) == [
+        'monthly_irradiation.csv', 'plot_comparison.png', 'plot_correlations.png',
+        'station_correlations.csv', 'station_quality.csv', 'station_statistics.csv']
+    assert plt.get_fignums() == open_figures
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+from src import correlation
+
+
+def make_station(rows=24 * 60 * 3):
+    rng = np.random.default_rng(0)
+    ghi = rng.gamma(2.0, 100.0, rows)
+    sample_data = pd.DataFrame({'Timestamp': pd.date_range('2022-01-30', periods=rows, freq='min'),
+                                'GHI': ghi, 'DNI': ghi * 1.3 + rng.normal(0, 50, rows),
+                                'Tamb': rng.normal(25, 3, rows), 'Comments': None})
+    sample_data.loc[::13, 'DNI'] = np.nan
+    return sample_data
+
+# Chunked correlation matches DataFrame.corr() on every numeric column
+def test_correlation_matrix_chunks():
+    sample_data = make_station()
+    chunks = [sample_data.iloc[start:start + 1000] for start in range(0, len(sample_data), 1000)]
+
+    matrix = correlation.correlation_matrix(chunks)
+
+    expected = sample_data[['GHI', 'DNI', 'Tamb']].corr()
+    pd.testing.assert_frame_equal(matrix, expected, atol=1e-10)
+
+# Accumulators of separate stations or processes merge
+def test_accumulate_merge():
+    sample_data = make_station()
+    first = correlation.accumulate(sample_data.iloc[:2000], ['GHI', 'DNI'])
+    second = correlation.accumulate(sample_data.iloc[2000:], ['GHI', 'DNI'])
+
+    merged = first.merge(second).correlation()
+
+    assert np.allclose(merged, sample_data[['GHI', 'DNI']].corr())
+
+# Per-day windows and rolling spans over chunks
+def test_windowed_and_rolling_correlations():
+    sample_data = make_station()
+    chunks = [sample_data.iloc[start:start + 500] for start in range(0, len(sample_data), 500)]
+
+    daily = correlation.windowed_correlations(chunks, ['GHI', 'DNI'], freq='D')
+    monthly = correlation.windowed_correlations(sample_data, ['GHI', 'DNI'], freq='MS')
+    rolling = correlation.rolling_correlations(chunks, ['GHI', 'DNI'], window=2, freq='D')
+
+    day = sample_data[sample_data['Timestamp'].dt.day == 31]
+    assert np.isclose(daily.loc[(pd.Timestamp('2022-01-31'), 'GHI'), 'DNI'], day['GHI'].corr(day['DNI']))
+    assert list(monthly.index.get_level_values('window').unique()) == [pd.Timestamp('2022-01-01'),
+                                                                        pd.Timestamp('2022-02-01')]
+    two_days = sample_data[sample_data['Timestamp'] >= '2022-01-31']
+    assert np.isclose(rolling.loc[(pd.Timestamp('2022-02-01'), 'GHI'), 'DNI'],
+                      two_days['GHI'].corr(two_days['DNI']))
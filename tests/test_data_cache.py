@@ -0,0 +1,70 @@
+import os
+from unittest.mock import patch
+import pandas as pd
+import pytest
+from src import data_cache, eda_utils
+
+pytest.importorskip('pyarrow')
+
+
+def write_station(csv_file, rows=5):
+    sample_data = pd.DataFrame({'Timestamp': pd.date_range('2021-08-09', periods=rows, freq='min')
+                                .strftime('%Y-%m-%d %H:%M'),
+                                'GHI': range(rows), 'Tamb': 25.0,
+                                'Comments': [None] * (rows - 1) + ['cleaned']})
+    sample_data.to_csv(csv_file, index=False)
+    return sample_data
+
+# Cache is built on first load and reused afterwards
+def test_load_data_uses_cache(tmp_path):
+    csv_file = tmp_path / "station.csv"
+    write_station(csv_file)
+
+    first = eda_utils.load_data(csv_file)
+    assert os.path.exists(data_cache.cache_path(csv_file))
+
+    # The second load must not parse the CSV body again
+    with patch.object(eda_utils.pd, 'read_csv', wraps=pd.read_csv) as read_csv:
+        second = eda_utils.load_data(csv_file)
+    assert all(call.kwargs.get('nrows') == 0 for call in read_csv.call_args_list)
+
+    pd.testing.assert_frame_equal(first, second)
+    uncached = eda_utils.load_data(csv_file, cache=False)
+    pd.testing.assert_frame_equal(second, uncached)
+
+# Only requested columns are read from the cache
+def test_load_data_cache_columns_and_chunks(tmp_path):
+    csv_file = tmp_path / "station.csv"
+    write_station(csv_file, rows=7)
+    eda_utils.load_data(csv_file)
+
+    loaded_data = eda_utils.load_data(csv_file, columns=['Timestamp', 'GHI'])
+    assert list(loaded_data.columns) == ['Timestamp', 'GHI']
+
+    chunks = list(eda_utils.load_data(csv_file, chunksize=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert isinstance(chunks[-1]['Comments'].dtype, pd.CategoricalDtype)
+
+# Changing the CSV invalidates its cache entry
+def test_cache_invalidated_on_change(tmp_path):
+    csv_file = tmp_path / "station.csv"
+    write_station(csv_file, rows=3)
+    old_path = data_cache.cached_file(csv_file, lambda: eda_utils.load_data(csv_file, chunksize=2, cache=False))
+
+    write_station(csv_file, rows=6)
+    os.utime(csv_file, ns=(0, os.stat(csv_file).st_mtime_ns + 10**9))
+
+    assert len(eda_utils.load_data(csv_file)) == 6
+    assert not os.path.exists(old_path)
+
+# Comment text that first appears after the first chunk is still cached
+def test_cache_comment_after_first_chunk(tmp_path):
+    csv_file = tmp_path / "station.csv"
+    write_station(csv_file, rows=8)
+
+    with patch.object(eda_utils, 'DEFAULT_CHUNKSIZE', 3):
+        loaded_data = eda_utils.load_data(csv_file)
+
+    assert os.path.exists(data_cache.cache_path(csv_file))
+    assert loaded_data['Comments'].tolist()[-1] == 'cleaned'
+    pd.testing.assert_frame_equal(loaded_data, eda_utils.load_data(csv_file, cache=False))
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from src import downsample, eda_utils
+
+# Min/max downsampling keeps every extreme within the point budget
+def test_minmax_downsample_keeps_peaks():
+    x = np.arange(100_000)
+    y = np.sin(x / 500.0)
+    y[12_345] = 5.0
+    y[54_321] = -5.0
+    y[:10] = np.nan
+
+    x_small, y_small = downsample.minmax_downsample(x, y, max_points=1000)
+
+    assert len(y_small) <= 1000
+    assert y_small.max() == 5.0 and y_small.min() == -5.0
+    assert np.all(np.diff(x_small) > 0)
+
+# LTTB keeps the end points and the budget
+def test_lttb_downsample():
+    x = pd.date_range('2022-01-01', periods=10_000, freq='min').to_numpy()
+    y = np.random.default_rng(0).normal(size=10_000)
+
+    x_small, y_small = downsample.lttb_downsample(x, y, max_points=500)
+
+    assert len(y_small) == 500
+    assert x_small[0] == x[0] and x_small[-1] == x[-1]
+    assert np.all(np.diff(x_small.astype('int64')) > 0)
+
+# Short series are left untouched
+def test_downsample_short_series():
+    x, y = downsample.downsample([1, 2, 3], [4, 5, 6], max_points=10, method='lttb')
+    assert list(y) == [4, 5, 6]
+
+# Time series plots draw at most max_points per line
+def test_plot_time_series_downsampled():
+    sample_data = pd.DataFrame({'Timestamp': pd.date_range('2022-01-01', periods=5000, freq='min'),
+                                'GHI': np.arange(5000.0), 'DNI': 1.0, 'DHI': 2.0})
+
+    eda_utils.plot_time_series(sample_data, max_points=200)
+
+    lines = plt.gca().get_lines()
+    assert len(lines) == 3
+    assert all(len(line.get_xdata()) <= 200 for line in lines)
+    plt.close('all')
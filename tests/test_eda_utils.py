@@ -20,6 +20,61 @@ def test_load_data(tmp_path):
     # Assert that loaded_data is equal to sample_data
     pd.testing.assert_frame_equal(loaded_data, sample_data)
 
+# Load data schema test
+def test_load_data_station_schema(tmp_path):
+    # Create a sample station file
+    csv_file = tmp_path / "station.csv"
+    csv_file.write_text("Timestamp,GHI,Tamb,Comments\n"
+                        "2021-08-09 00:01,-1.2,26.2,\n"
+                        "2021-08-09 00:02,3.5,26.1,cleaned\n"
+                        "2021-08-09 00:03,4.0,26.0,\n")
+
+    loaded_data = eda_utils.load_data(csv_file)
+
+    # Sensor columns are float32, Timestamp is parsed and Comments is a category
+    assert loaded_data['GHI'].dtype == 'float32'
+    assert loaded_data['Tamb'].dtype == 'float32'
+    assert pd.api.types.is_datetime64_any_dtype(loaded_data['Timestamp'])
+    assert isinstance(loaded_data['Comments'].dtype, pd.CategoricalDtype)
+
+    # Comments can be dropped at load time
+    loaded_data = eda_utils.load_data(csv_file, comments='drop')
+    assert 'Comments' not in loaded_data.columns
+
+# Chunked load data test
+def test_load_data_chunks(tmp_path):
+    sample_data = pd.DataFrame({'Timestamp': pd.date_range('2021-08-09', periods=10, freq='min'),
+                                'GHI': range(10)})
+    csv_file = tmp_path / "station.csv"
+    sample_data.to_csv(csv_file, index=False)
+
+    # Load the file as a generator of chunks
+    chunks = list(eda_utils.load_data(csv_file, chunksize=4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    combined = pd.concat(chunks, ignore_index=True)
+    assert combined['GHI'].dtype == 'float32'
+    assert combined['Timestamp'].tolist() == sample_data['Timestamp'].tolist()
+
+# Logger error tokens in sensor columns load as missing values
+def test_load_data_bad_tokens(tmp_path):
+    csv_file = tmp_path / "station.csv"
+    csv_file.write_text("Timestamp,GHI,Tamb,Comments\n"
+                        "2021-08-09 00:01,1.5,NA,-\n"
+                        "2021-08-09 00:02,Error,26.1,\n"
+                        "2021-08-09 00:03,4.0,#N/A,\n"
+                        "2021-08-09 00:04,n.a.,26.0,\n")
+
+    for chunksize in (None, 1, 3):
+        loaded_data = eda_utils.load_data(csv_file, chunksize=chunksize, cache=False)
+        if chunksize is not None:
+            loaded_data = pd.concat(loaded_data, ignore_index=True)
+
+        assert loaded_data['GHI'].dtype == 'float32' and loaded_data['Tamb'].dtype == 'float32'
+        assert loaded_data['GHI'].isna().tolist() == [False, True, False, True]
+        assert loaded_data['Tamb'].isna().tolist() == [True, False, True, False]
+        assert loaded_data['Comments'].tolist()[0] == '-'
+
 # Basic info function test
 def test_basic_info(capsys):
     # Create a sample DataFrame
@@ -143,3 +198,77 @@ def test_correlation_analysis(capsys):
     # Assert that the function printed the correct message
     captured = capsys.readouterr()
     assert "Performing correlation analysis..." in captured.out
+
+# Cleaning pipeline test
+def test_clean_data():
+    sample_data = pd.DataFrame({'Timestamp': ['2022-01-01', '2022-01-02', '2022-01-03', '2022-01-04'],
+                                'GHI': [10.0, -2.0, None, 1600.0], 'RH': [50.0, 101.0, -1.0, 20.0],
+                                'Comments': [None, 'x', None, None]})
+
+    cleaned_data, report = eda_utils.clean_data(sample_data, ['GHI'])
+
+    # Rows with negative or missing GHI are dropped, other columns are only reported
+    assert cleaned_data['GHI'].tolist() == [10.0, 1600.0]
+    assert list(report.index) == ['GHI', 'RH']
+    assert report.loc['GHI'].tolist() == [1, 1, 2]  # negative, missing, out of range
+    assert report.loc['RH'].tolist() == [1, 0, 2]
+
+# Resampled aggregates test
+def test_resample_data():
+    sample_data = pd.DataFrame({'Timestamp': pd.date_range('2022-01-01', periods=4 * 60, freq='min'),
+                                'GHI': 60.0, 'Tamb': [20.0, None] * 120})
+
+    aggregates = eda_utils.resample_data(sample_data, 'hourly')
+
+    assert len(aggregates) == 4
+    assert aggregates[('GHI', 'mean')].tolist() == [60.0] * 4
+    assert aggregates[('GHI', 'energy')].tolist() == [60.0] * 4  # 60 W/m² for one hour
+    assert aggregates[('Tamb', 'count')].tolist() == [30] * 4
+    assert ('Tamb', 'energy') not in aggregates.columns
+    assert list(eda_utils.aggregate_values(aggregates, 'max').columns) == ['GHI', 'Tamb']
+
+# Memoized station aggregates test
+def test_station_aggregates_memoized():
+    sample_data = pd.DataFrame({'Timestamp': pd.date_range('2022-01-01', periods=3, freq='D'),
+                                'GHI': [1.0, 2.0, 3.0]})
+    eda_utils.clear_aggregate_cache()
+
+    first = eda_utils.station_aggregates(sample_data, 'benin', 'monthly')
+    second = eda_utils.station_aggregates(sample_data, 'benin', 'monthly')
+    other = eda_utils.station_aggregates(sample_data.iloc[:2], 'benin', 'monthly')
+
+    assert first is second
+    assert other[('GHI', 'sum')].iloc[0] == 3.0
+
+    # A changed value in a frame of the same shape is not served from the memo
+    changed = sample_data.assign(GHI=[1.0, None, 3.0])
+    assert eda_utils.station_aggregates(changed, 'benin', 'monthly')[('GHI', 'count')].iloc[0] == 2
+    # An explicit version replaces the content hash
+    versioned = eda_utils.station_aggregates(sample_data, 'benin', 'monthly', version=1)
+    assert eda_utils.station_aggregates(changed, 'benin', 'monthly', version=1) is versioned
+
+# One profile serves every report, which can skip printing
+def test_profile_data(capsys):
+    sample_data = pd.DataFrame({'A': [1.0, -2.0, None], 'B': [-4, 5, 6], 'C': ['x', None, 'y']})
+
+    profile = eda_utils.profile_data(sample_data)
+
+    assert profile.rows == 3
+    assert profile.columns['missing'].to_dict() == {'A': 1, 'B': 0, 'C': 1}
+    assert eda_utils.count_negative_values(sample_data, verbose=False, profile=profile).to_dict() == {'A': 1, 'B': 1}
+    assert eda_utils.missing_values(sample_data, verbose=False, profile=profile)['C'] == 1
+    assert list(eda_utils.basic_info(sample_data, verbose=False, profile=profile).columns) == ['dtype', 'non_null']
+    assert eda_utils.basic_desc(sample_data, verbose=False, profile=profile).loc['mean', 'B'] == 7 / 3
+    assert capsys.readouterr().out == ""
+
+# The counts alone skip describe(), which basic_desc computes when it is missing
+def test_profile_data_without_description():
+    sample_data = pd.DataFrame({'A': [1.0, -2.0, None], 'B': [-4, 5, 6]})
+
+    profile = eda_utils.profile_data(sample_data, describe=False)
+
+    assert profile.description is None
+    with patch.object(pd.DataFrame, 'describe', side_effect=AssertionError("describe() called")):
+        assert eda_utils.missing_values(sample_data, verbose=False).to_dict() == {'A': 1, 'B': 0}
+        assert eda_utils.count_negative_values(sample_data, verbose=False).to_dict() == {'A': 1, 'B': 1}
+    assert eda_utils.basic_desc(sample_data, verbose=False, profile=profile).loc['mean', 'B'] == 7 / 3
@@ -0,0 +1,57 @@
+import os
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from src import eda_utils, export, visualization
+
+
+def write_station(csv_file, rows=500):
+    rng = np.random.default_rng(0)
+    sample_data = pd.DataFrame({'Timestamp': pd.date_range('2021-08-09', periods=rows, freq='min')
+                                .strftime('%Y-%m-%d %H:%M')})
+    for col in eda_utils.SENSOR_COLUMNS:
+        sample_data[col] = rng.uniform(0, 100, rows)
+    sample_data['Comments'] = None
+    sample_data.to_csv(csv_file, index=False)
+
+# Plot functions return their figures instead of showing them
+def test_new_figures():
+    data = pd.DataFrame({col: np.arange(10.0) for col in eda_utils.SENSOR_COLUMNS})
+
+    fig, figures = export.new_figures(visualization.plot_scatter_plots, data)
+
+    assert figures == [fig]
+    plt.close('all')
+
+# Figures are written in every format and closed, in-process and in worker processes
+def test_export_plots(tmp_path):
+    csv_file = tmp_path / "station.csv"
+    write_station(csv_file)
+    data = eda_utils.load_data(str(csv_file))
+    plots = [visualization.wind_analysis, visualization.plot_histograms]
+
+    for workers in (1, 2):
+        output_dir = tmp_path / f"figures{workers}"
+        paths = export.export_plots(data, plots, str(output_dir), ['png', 'svg'], workers)
+
+        assert sorted(os.listdir(output_dir)) == sorted(os.path.basename(path) for path in paths)
+        assert sorted(os.listdir(output_dir)) == ['plot_histograms.png', 'plot_histograms.svg',
+                                                  'wind_analysis_1.png', 'wind_analysis_1.svg',
+                                                  'wind_analysis_2.png', 'wind_analysis_2.svg']
+        assert plt.get_fignums() == []
+
+# Plots share the station frame, so none of them may modify it
+def test_plots_do_not_modify_data(tmp_path):
+    from run_eda import PLOTS
+    csv_file = tmp_path / "station.csv"
+    write_station(csv_file)
+    path = export.share_data(eda_utils.load_data(str(csv_file), comments='drop'), str(tmp_path))
+    data = export.shared_data(path)
+    expected = data.copy()
+
+    for plot in PLOTS:
+        export.new_figures(plot, data)
+        plt.close('all')
+
+    pd.testing.assert_frame_equal(data, expected)
+    assert export.shared_data(path) is data
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+from src import eda_utils, profiling
+
+# Decorated functions cost nothing and record nothing without a profiler
+def test_timed_inactive():
+    assert profiling.active() is None
+    assert eda_utils.remove_negative_rows(pd.DataFrame({'GHI': [1.0, -1.0]}), ['GHI']).shape == (1, 1)
+
+# Stages nest, and record rows, times and peak memory
+def test_profile_stages(tmp_path):
+    sample_data = pd.DataFrame({'GHI': [1.0, -1.0, 2.0]})
+
+    with profiling.profile(cprofile_stage='remove_negative_rows') as profiler:
+        with profiling.stage('outer'):
+            eda_utils.remove_negative_rows(sample_data, ['GHI'])
+            values = np.ones(1_000_000)
+
+    report = profiler.report()
+    assert list(report['stage']) == ['outer', '  remove_negative_rows']
+    assert list(report['rows']) == [pd.NA, 3]
+    assert (report[['wall_s', 'cpu_s']] >= 0).all().all()
+    assert report['peak_mb'].iloc[0] >= values.nbytes / 2 ** 20
+    assert 'remove_negative_rows' in profiler.cprofile_output
+
+    profiler.to_json(tmp_path / "profile.json")
+    assert profiling.Profiler.from_json(tmp_path / "profile.json").records == profiler.records
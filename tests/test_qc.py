@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+from src import qc
+
+def sample_station(rows=200):
+    sample_data = pd.DataFrame({'GHI': np.linspace(100, 300, rows), 'DNI': np.linspace(50, 150, rows),
+                                'DHI': np.linspace(40, 60, rows), 'ModA': np.linspace(90, 290, rows),
+                                'Tamb': np.linspace(20, 30, rows), 'Cleaning': np.zeros(rows)})
+    sample_data.loc[5, 'GHI'] = -5.0           # out of range
+    sample_data.loc[20:29, 'Tamb'] = 25.0      # stuck for 10 readings
+    sample_data.loc[50, 'Tamb'] = 45.0         # spike
+    sample_data.loc[80, 'ModA'] = 900.0        # module jump without a cleaning event
+    sample_data.loc[120, 'ModA'] = 900.0       # module jump at a cleaning event
+    sample_data.loc[120, 'Cleaning'] = 1.0
+    return sample_data
+
+# Each rule sets its bit on the rows that fail it
+def test_quality_flags():
+    flags, engine = qc.quality_flags(sample_station(), stuck_rows=5)
+
+    assert flags.dtype == np.uint8
+    assert qc.flag_names(flags[5]) == 'RANGE'
+    assert [i for i in range(200) if flags[i] & qc.Flag.STUCK] == list(range(20, 30))
+    assert flags[50] & qc.Flag.SPIKE and flags[51] & qc.Flag.SPIKE
+    assert flags[80] & qc.Flag.MODULE_JUMP
+    assert not flags[120] & qc.Flag.MODULE_JUMP and flags[120] & qc.Flag.CLEANING
+    assert engine.report().loc['STUCK', 'Tamb'] == 10
+    assert qc.keep_mask(flags).sum() == 200 - 1 - 10 - 2
+
+# Results do not depend on how the rows are chunked
+def test_quality_flags_chunked():
+    sample_data = sample_station()
+    # A chunk (of 7 rows) ending on NaN right after a spike
+    sample_data.loc[12, 'Tamb'] = 40.0
+    sample_data.loc[13, 'Tamb'] = np.nan
+
+    flags, engine = qc.quality_flags(sample_data, stuck_rows=5)
+
+    for chunksize in (3, 7):
+        chunked, chunked_engine = qc.quality_flags(sample_data, stuck_rows=5, chunksize=chunksize)
+        assert (flags == chunked).all()
+        pd.testing.assert_frame_equal(engine.report(), chunked_engine.report())
+
+# The zenith rules catch night-time irradiance and a failed closure test
+def test_zenith_rules():
+    sample_data = pd.DataFrame({'GHI': [20.0, 600.0, 600.0], 'DNI': [0.0, 700.0, 100.0], 'DHI': [0.0, 100.0, 100.0]})
+
+    flags, _ = qc.quality_flags(sample_data, zenith=[100.0, 40.0, 40.0])
+
+    assert [qc.flag_names(value) for value in flags] == ['NIGHT', 'OK', 'CLOSURE']
+
+# Night-time offsets of a few W/m² are not out of range
+def test_range_limits():
+    sample_data = pd.DataFrame({'GHI': [-1.5, -3.9, -4.5], 'Tamb': 25.0})
+
+    flags, _ = qc.quality_flags(sample_data)
+
+    assert [qc.flag_names(value) for value in flags] == ['OK', 'OK', 'RANGE']
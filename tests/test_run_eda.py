@@ -0,0 +1,56 @@
+import os
+import pytest
+import run_eda
+from src import synthetic
+
+# Station names come from the file names
+def test_station_name():
+    assert run_eda.station_name('dataset/benin-malanville.csv') == 'benin-malanville'
+
+# Glob patterns are expanded, sorted and de-duplicated
+def test_expand_paths(tmp_path):
+    for name in ['togo.csv', 'benin.csv', 'notes.txt']:
+        (tmp_path / name).write_text("")
+
+    paths = run_eda.expand_paths([str(tmp_path / '*.csv'), str(tmp_path / 'benin.csv')])
+
+    assert paths == [str(tmp_path / 'benin.csv'), str(tmp_path / 'togo.csv')]
+
+# Stations run in a process pool, each into its own folder, and are compared in one table
+def test_run_stations(tmp_path):
+    paths = [str(synthetic.write_station(tmp_path / f'{name}.csv', 1500, seed=seed))
+             for seed, name in enumerate(['benin', 'togo'])]
+    output_dir = tmp_path / 'reports'
+
+    table = run_eda.run_stations(paths, str(output_dir), workers=2)
+
+    for name in ['benin', 'togo']:
+        files = os.listdir(output_dir / name)
+        assert {'eda.log', 'summary_stats.csv', 'qc_report.csv', 'plot_time_series.png'} <= set(files)
+    assert list(table.index) == ['benin', 'togo']
+    assert {'rows', 'clean_rows', 'qc_flagged_rows', 'GHI_mean'} <= set(table.columns)
+    assert table['rows'].tolist() == [1500, 1500]
+    assert os.path.exists(output_dir / 'comparison.csv')
+
+# Solar year grids of a known station are cached next to its file, not in the working directory
+def test_run_eda_solar_cache(tmp_path, monkeypatch):
+    monkeypatch.delenv('EDA_CACHE_DIR', raising=False)
+    monkeypatch.chdir(tmp_path)
+    data_dir = tmp_path / 'dataset'
+    data_dir.mkdir()
+    path = synthetic.write_station(data_dir / 'benin-malanville.csv', 500)
+
+    run_eda.run_station(str(path), str(tmp_path / 'reports'))
+
+    assert os.listdir(data_dir / '.eda_cache' / 'solar')
+    assert not os.path.exists(tmp_path / '.eda_cache')
+
+# Patterns that match no file stop the run with a clear error
+def test_main_missing_files(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        run_eda.main([str(tmp_path / '*.csv'), '-o', str(tmp_path / 'reports')])
+
+    assert 'no such station file' in capsys.readouterr().err
+    assert not os.path.exists(tmp_path / 'reports')
+    with pytest.raises(ValueError):
+        run_eda.run_stations([], str(tmp_path / 'reports'))
@@ -0,0 +1,30 @@
+import os
+import numpy as np
+import pandas as pd
+from src import solar_geometry
+
+# The sun is overhead at the equator at noon on the equinox, and sets in the west
+def test_solar_position():
+    zenith, azimuth = solar_geometry.solar_position(
+        pd.to_datetime(['2021-03-20 12:07', '2021-03-20 17:30', None]), latitude=0, longitude=0)
+
+    assert zenith[0] < 1
+    assert 75 < zenith[1] < 90 and 260 < azimuth[1] < 280
+    assert np.isnan(zenith[2])
+
+# Station files map to their coordinates
+def test_find_station():
+    assert solar_geometry.find_station('togo-dapaong_qc') == 'togo-dapaong'
+    assert solar_geometry.find_station('unknown') is None
+
+# Cached year grids give the same angles as the direct computation
+def test_station_position(tmp_path):
+    timestamps = pd.Series(pd.date_range('2021-12-31 12:00', periods=2 * 24 * 60, freq='min'))
+
+    zenith, azimuth = solar_geometry.station_position(timestamps, 'benin-malanville', cache_dir=tmp_path)
+    expected, _ = solar_geometry.solar_position(timestamps, **solar_geometry.STATIONS['benin-malanville'])
+
+    assert np.allclose(zenith, expected, atol=1e-3)
+    assert len(os.listdir(tmp_path / 'solar')) == 2
+    daytime = solar_geometry.daytime_mask(timestamps, 'benin-malanville', cache_dir=tmp_path)
+    assert 0.4 < daytime.mean() < 0.6
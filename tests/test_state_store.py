@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from src import eda_utils, state_store
+
+
+def make_station(rows=3000):
+    rng = np.random.default_rng(0)
+    sample_data = pd.DataFrame({'Timestamp': pd.date_range('2022-01-01', periods=rows, freq='min'),
+                                'GHI': rng.normal(200, 150, rows), 'DNI': rng.normal(300, 200, rows),
+                                'Tamb': rng.normal(25, 3, rows)})
+    sample_data.loc[::11, 'Tamb'] = np.nan
+    return sample_data
+
+# Appending slices gives the same numbers as a full recompute
+def test_incremental_matches_full_recompute():
+    sample_data = make_station()
+
+    state = state_store.StationState('benin')
+    for start in range(0, len(sample_data), 700):
+        state.update(sample_data.iloc[start:start + 700])
+
+    values = {stat: value for stat, _, value in state.summary_stats()}
+    numeric = sample_data[['GHI', 'DNI', 'Tamb']]
+    assert np.allclose(values['mean'], numeric.mean())
+    assert np.allclose(values['kurtosis'], numeric.kurt())
+    assert state.missing['Tamb'] == numeric['Tamb'].isnull().sum()
+    assert state.negative['GHI'] == (numeric['GHI'] < 0).sum()
+    assert np.allclose(state.correlation(), numeric.corr())
+    pd.testing.assert_frame_equal(state.resampled('hourly'), eda_utils.resample_data(sample_data, 'hourly'),
+                                  check_dtype=False, check_freq=False)
+
+# Re-delivered rows are not counted twice and the state survives a round trip
+def test_state_store_append(tmp_path):
+    sample_data = make_station(200)
+    first, second = tmp_path / "day1.csv", tmp_path / "day2.csv"
+    sample_data.iloc[:120].to_csv(first, index=False)
+    sample_data.iloc[100:].to_csv(second, index=False)
+
+    store = state_store.StateStore(tmp_path / "state")
+    store.append('togo', first)
+    state = store.append('togo', second)
+
+    assert state.rows == 200
+    assert store.load('togo').rows == 200
+    assert state.resampled('daily')[('GHI', 'count')].iloc[0] == 200
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+from src import stats
+
+# Moments match pandas on a single chunk
+def test_moment_accumulator_matches_pandas():
+    rng = np.random.default_rng(0)
+    sample_data = pd.DataFrame({'A': rng.gamma(2.0, size=1000), 'B': rng.normal(size=1000)})
+    sample_data.loc[::7, 'B'] = np.nan
+
+    moments = stats.MomentAccumulator(['A', 'B']).update(sample_data)
+
+    pd.testing.assert_series_equal(moments.means(), sample_data.mean())
+    pd.testing.assert_series_equal(moments.stds(), sample_data.std())
+    pd.testing.assert_series_equal(moments.skewness(), sample_data.skew())
+    pd.testing.assert_series_equal(moments.kurtosis(), sample_data.kurt())
+
+# Merging chunk results gives the same moments as one pass
+def test_moment_accumulator_merge():
+    rng = np.random.default_rng(1)
+    sample_data = pd.DataFrame({'A': rng.exponential(size=999) + 1000})
+
+    merged = stats.MomentAccumulator(['A'])
+    for start in range(0, len(sample_data), 100):
+        merged.merge(stats.MomentAccumulator(['A']).update(sample_data.iloc[start:start + 100]))
+
+    assert np.allclose(merged.means(), sample_data.mean())
+    assert np.allclose(merged.variances(), sample_data.var())
+    assert np.allclose(merged.skewness(), sample_data.skew())
+    assert np.allclose(merged.kurtosis(), sample_data.kurt())
+
+# Quantile sketch is exact on small inputs and close on large ones
+def test_quantile_sketch():
+    assert stats.QuantileSketch().update([1, 2, 3, 4]).quantile(0.5) == 2.5
+
+    values = np.random.default_rng(2).normal(size=200_000)
+    sketch = stats.QuantileSketch()
+    for chunk in np.array_split(values, 20):
+        sketch.update(chunk)
+
+    estimate = sketch.quantile([0.1, 0.5, 0.9])
+    assert np.allclose(estimate, np.quantile(values, [0.1, 0.5, 0.9]), atol=0.02)
+
+# Summary statistics keep the (stat, description, value) shape
+def test_summarize_chunks():
+    sample_data = pd.DataFrame({'A': [1.0, 2.0, 3.0, 4.0], 'B': [4.0, 5.0, 6.0, 8.0], 'C': list('abcd')})
+
+    summary = stats.summarize([sample_data.iloc[:2], sample_data.iloc[2:]]).to_list()
+
+    assert [stat for stat, _, _ in summary] == ['count', 'mean', 'median', 'standard deviation',
+                                                'skewness', 'kurtosis']
+    values = {stat: value for stat, _, value in summary}
+    assert list(values['mean'].index) == ['A', 'B']
+    assert values['median']['A'] == 2.5
+    assert np.allclose(values['kurtosis'], sample_data[['A', 'B']].kurt())
+
+    # A DataFrame is read in slices, with the same result
+    sliced = {stat: value for stat, _, value in stats.summarize(sample_data, chunksize=3).to_list()}
+    for stat, value in values.items():
+        assert np.allclose(sliced[stat], value)
+
+# Boxplot statistics match matplotlib's and draw only a capped set of outliers
+def test_boxplot_stats():
+    import matplotlib.cbook as cbook
+    values = np.random.default_rng(3).standard_cauchy(10_000)
+    sample_data = pd.DataFrame({'A': values})
+
+    summary, = stats.boxplot_summaries(sample_data, ['A'], max_outliers=50)
+    expected, = cbook.boxplot_stats(values)
+    for key in ('q1', 'med', 'q3', 'whislo', 'whishi'):
+        assert np.isclose(summary[key], expected[key])
+    assert summary['outliers'] == len(expected['fliers'])
+    assert len(summary['fliers']) == 50
+    assert summary['fliers'].min() == values.min() and summary['fliers'].max() == values.max()
+
+    table = stats.boxplot_stats([sample_data.iloc[:5000], sample_data.iloc[5000:]], ['A'])
+    assert list(table.columns) == ['count', 'q1', 'median', 'q3', 'whislo', 'whishi', 'outliers']
+    assert table.loc['A', 'count'] == 10_000
+    assert abs(table.loc['A', 'outliers'] - len(expected['fliers'])) < 200
@@ -0,0 +1,21 @@
+import pandas as pd
+from src import eda_utils, synthetic
+
+# Generated data has the real column set at 1-minute cadence
+def test_generate_station():
+    data = synthetic.generate_station(2880)
+
+    assert list(data.columns) == ['Timestamp'] + eda_utils.SENSOR_COLUMNS + ['Comments']
+    assert (data['Timestamp'].diff().dropna() == pd.Timedelta(minutes=1)).all()
+    assert data['GHI'].max() > 500 and (data['GHI'] < 0).any()
+    assert not (data['WSgust'] < data['WS']).any()
+
+# Files written in chunks load like a single generated frame
+def test_write_station(tmp_path):
+    path = synthetic.write_station(tmp_path / "station.csv", 2500, chunksize=1000)
+
+    data = eda_utils.load_data(path, cache=False)
+
+    assert len(data) == 2500
+    assert data['Timestamp'].is_monotonic_increasing
+    assert data['Timestamp'].iloc[-1] - data['Timestamp'].iloc[0] == pd.Timedelta(minutes=2499)
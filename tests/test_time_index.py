@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+from src import column_store, eda_utils, synthetic, time_index
+
+
+def _frame(rows=5000):
+    return synthetic.generate_station(rows)
+
+# Windows of sorted data are found by binary search
+def test_sorted_query():
+    data = _frame()
+    index = time_index.build_index(data, block_rows=100)
+    window = time_index.query(data, '2021-08-10', '2021-08-10 23:59', ['GHI', 'Tamb'], index=index)
+
+    assert index.is_sorted and isinstance(index.rows('2021-08-10'), slice)
+    assert list(window.columns) == ['Timestamp', 'GHI', 'Tamb']
+    assert len(window) == 24 * 60
+    assert window['Timestamp'].min() == pd.Timestamp('2021-08-10')
+    assert index.start == data['Timestamp'].min() and index.end == data['Timestamp'].max()
+
+# Unsorted data with NaT is answered from the overlapping blocks only
+def test_unsorted_query():
+    data = _frame().sample(frac=1, random_state=0).reset_index(drop=True)
+    data.loc[3, 'Timestamp'] = pd.NaT
+    index = time_index.build_index(data, block_rows=100)
+    start, end = pd.Timestamp('2021-08-10 06:00'), pd.Timestamp('2021-08-10 07:00')
+
+    rows = index.rows(start, end)
+    expected = np.flatnonzero((data['Timestamp'] >= start) & (data['Timestamp'] <= end))
+    assert not index.is_sorted
+    assert np.array_equal(rows, expected)
+    assert len(time_index.query(data, '2030-01-01', index=index)) == 0
+
+# A column store is queried through its memory-mapped timestamps
+def test_store_query(tmp_path):
+    path = synthetic.write_station(tmp_path / "station.csv", 5000)
+    store = column_store.open_store(path, cache_dir=tmp_path / 'cache')
+    data = eda_utils.load_data(path, cache=False)
+
+    window = time_index.query(store, '2021-08-10', '2021-08-11', ['GHI'])
+    expected = time_index.query(data, '2021-08-10', '2021-08-11', ['GHI'])
+    assert np.array_equal(window['GHI'].to_numpy(), expected['GHI'].to_numpy(), equal_nan=True)